@@ -14,11 +14,11 @@ import asyncio
 import time
 import yaml
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 import structlog
-from aiohttp import web
+from aiohttp import ClientSession, ClientTimeout, web
 
 # Configure structured logging
 import logging.config
@@ -49,15 +49,23 @@ class AgentEndpoint:
 class AgentDiscoveryService:
     """Service for dynamic agent registration and health monitoring."""
 
+    # Agents not seen for this long are dropped (seconds)
+    STALE_AGENT_TIMEOUT = 600
+    # Per-probe budget so one slow agent cannot stall the health cycle
+    HEALTH_CHECK_TIMEOUT = ClientTimeout(total=1.0)
+
     def __init__(self, discovery_file: str = "/etc/prometheus/dynamic_agents.yml"):
         self.discovery_file = discovery_file
         self.agents: Dict[str, AgentEndpoint] = {}
         self._running = False
 
-    def update_discovery_file(self) -> None:
+    def update_discovery_file(self, now: Optional[float] = None) -> None:
         """Update the Prometheus service discovery file with current agents."""
+        if now is None:
+            now = time.time()
+
         # Filter to only healthy agents seen within last 5 minutes
-        cutoff_time = time.time() - 300  # 5 minutes
+        cutoff_time = now - 300  # 5 minutes
         active_agents = [
             agent for agent in self.agents.values()
             if agent.last_seen > cutoff_time and agent.health_status == "healthy"
@@ -130,38 +138,47 @@ class AgentDiscoveryService:
         """Periodically check health of registered agents."""
         while self._running:
             try:
-                async with ClientSession() as session:
-                    agents_to_remove = []
+                # Sample the clock once per cycle rather than once per probe
+                now = time.time()
 
-                    for agent_id, agent in self.agents.items():
+                async with ClientSession() as session:
+                    for agent in self.agents.values():
                         try:
-                            # Check agent health
-                            async with session.get(f"http://{agent.host}:{agent.port}/health",
-                                                 timeout=5) as response:
+                            # HEAD skips the body; aiohttp GET routes answer HEAD too
+                            async with session.head(f"http://{agent.host}:{agent.port}/health",
+                                                    timeout=self.HEALTH_CHECK_TIMEOUT) as response:
                                 if response.status == 200:
                                     agent.health_status = "healthy"
-                                    agent.last_seen = time.time()
+                                    agent.last_seen = now
                                 else:
                                     agent.health_status = "unhealthy"
                         except Exception:
                             agent.health_status = "unreachable"
 
-                            # Mark for removal if not seen for 10 minutes
-                            if time.time() - agent.last_seen > 600:
-                                agents_to_remove.append(agent_id)
-
-                    # Remove stale agents
-                    for agent_id in agents_to_remove:
-                        logger.warning("removing_stale_agent", agent_id=agent_id)
-                        del self.agents[agent_id]
-
-                    self.update_discovery_file()
+                    self.evict_stale_agents(now)
+                    self.update_discovery_file(now)
 
             except Exception as e:
                 logger.error("health_check_error", error=str(e))
 
             await asyncio.sleep(60)  # Check every minute
 
+    def evict_stale_agents(self, now: Optional[float] = None) -> int:
+        """Remove agents that have not been seen within STALE_AGENT_TIMEOUT."""
+        if now is None:
+            now = time.time()
+        cutoff_time = now - self.STALE_AGENT_TIMEOUT
+        stale_ids = [
+            agent_id for agent_id, agent in self.agents.items()
+            if agent.last_seen < cutoff_time
+        ]
+
+        for agent_id in stale_ids:
+            logger.warning("removing_stale_agent", agent_id=agent_id)
+            del self.agents[agent_id]
+
+        return len(stale_ids)
+
     async def list_agents(self, request: web.Request) -> web.Response:
         """Return list of currently registered agents."""
         agents_list = [
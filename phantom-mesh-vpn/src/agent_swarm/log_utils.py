@@ -0,0 +1,19 @@
+"""
+PhantomMesh Agent Swarm Logging Helpers
+=======================================
+
+Shared structlog utilities for the agent swarm modules.
+
+Copyright © 2025 Stephen Bilodeau. All rights reserved.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def logger_enabled_for(logger: Any, level: int) -> bool:
+    """Whether the configured structlog wrapper behind ``logger`` would emit ``level`` records."""
+    bound = logger.bind()
+    check = getattr(bound, "is_enabled_for", None) or getattr(bound, "isEnabledFor", None)
+    return check(level) if check is not None else True
@@ -13,7 +13,7 @@ Licensed under GPL-3.0 with proprietary agent clauses.
 
 import asyncio
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -41,6 +41,7 @@ logger = structlog.get_logger(__name__)
 
 class AgentType(Enum):
     """Types of agents in the swarm."""
+    AEGIS = "aegis"
     APEX = "apex"
     CIPHER = "cipher"
     ARCHITECT = "architect"
@@ -80,6 +81,11 @@ class SwarmMetrics:
 class PhantomMetricsExporter:
     """Prometheus metrics exporter for PhantomMesh agent swarm."""
 
+    # Agents whose heartbeat is older than this are evicted (seconds)
+    STALE_AGENT_THRESHOLD = 900.0
+    # Sweep for stale agents every N calls to update_agent_metrics
+    EVICTION_INTERVAL = 100
+
     def __init__(self):
         self.registry = CollectorRegistry()
 
@@ -214,17 +220,29 @@ class PhantomMetricsExporter:
 
         # Agent state tracking
         self.agent_states: Dict[str, AgentMetrics] = {}
+        self._agent_types: Dict[str, str] = {}
+        self._updates_since_eviction = 0
         self.swarm_state = SwarmMetrics()
 
         logger.info("PhantomMetricsExporter initialized")
 
-    def update_agent_metrics(self, agent_id: str, agent_type: AgentType, metrics: AgentMetrics):
-        """Update metrics for a specific agent."""
+    def update_agent_metrics(self, agent_id: str, agent_type: AgentType, metrics: AgentMetrics,
+                             now: Optional[float] = None):
+        """Update metrics for a specific agent.
+
+        ``metrics.tasks_completed``/``tasks_failed`` are the agent's running
+        totals; the counters advance by the change since the previous update.
+        Callers updating many agents in one tick should sample ``now`` once
+        and pass it through instead of letting each call read the clock.
+        """
+        if now is None:
+            now = time.time()
         type_str = agent_type.value
 
         # Update counters
-        self.agent_tasks_completed.labels(agent_type=type_str, agent_id=agent_id).inc_by(metrics.tasks_completed)
-        self.agent_tasks_failed.labels(agent_type=type_str, agent_id=agent_id, failure_reason="unknown").inc_by(metrics.tasks_failed)
+        completed_delta, failed_delta = self._task_deltas(agent_id, metrics)
+        self.agent_tasks_completed.labels(agent_type=type_str, agent_id=agent_id).inc(completed_delta)
+        self.agent_tasks_failed.labels(agent_type=type_str, agent_id=agent_id, failure_reason="unknown").inc(failed_delta)
 
         # Update gauges
         self.agent_memory_usage.labels(agent_type=type_str, agent_id=agent_id).set(metrics.memory_usage)
@@ -232,14 +250,86 @@ class PhantomMetricsExporter:
         self.agent_active.labels(agent_type=type_str, agent_id=agent_id).set(1 if metrics.active_time > 0 else 0)
 
         # Calculate heartbeat age
-        heartbeat_age = time.time() - metrics.last_heartbeat
+        heartbeat_age = now - metrics.last_heartbeat
         self.agent_heartbeat_age.labels(agent_type=type_str, agent_id=agent_id).set(heartbeat_age)
 
         # Store state
         self.agent_states[agent_id] = metrics
+        self._agent_types[agent_id] = type_str
+
+        self._updates_since_eviction += 1
+        if self._updates_since_eviction >= self.EVICTION_INTERVAL:
+            self._updates_since_eviction = 0
+            self.evict_stale_agents(now)
+
+    def _task_deltas(self, agent_id: str, metrics: AgentMetrics) -> Tuple[int, int]:
+        """Task totals gained since the agent's previous update.
+
+        A total lower than last time means the agent's state was reset, so the
+        new total counts in full (the same rule Prometheus applies to counter
+        resets).
+        """
+        previous = self.agent_states.get(agent_id)
+        if previous is None:
+            return metrics.tasks_completed, metrics.tasks_failed
+
+        completed = metrics.tasks_completed - previous.tasks_completed
+        failed = metrics.tasks_failed - previous.tasks_failed
+        return (
+            completed if completed >= 0 else metrics.tasks_completed,
+            failed if failed >= 0 else metrics.tasks_failed,
+        )
+
+    def update_agent_metrics_batch(self, updates: Iterable[Tuple[str, AgentType, AgentMetrics]],
+                                   now: Optional[float] = None):
+        """Update metrics for many agents in one call, reading the clock once."""
+        if now is None:
+            now = time.time()
+        for agent_id, agent_type, metrics in updates:
+            self.update_agent_metrics(agent_id, agent_type, metrics, now)
+
+    def evict_stale_agents(self, now: Optional[float] = None) -> int:
+        """Drop agents with stale heartbeats and their Prometheus series."""
+        if now is None:
+            now = time.time()
+        stale_ids = [
+            agent_id for agent_id, metrics in self.agent_states.items()
+            if now - metrics.last_heartbeat > self.STALE_AGENT_THRESHOLD
+        ]
+
+        for agent_id in stale_ids:
+            del self.agent_states[agent_id]
+            type_str = self._agent_types.pop(agent_id)
+            self._remove_agent_series(type_str, agent_id)
+
+        if stale_ids:
+            logger.info("Evicted stale agents", count=len(stale_ids))
+        return len(stale_ids)
+
+    def _remove_agent_series(self, type_str: str, agent_id: str):
+        """Remove all per-agent label children so their series stop being exported."""
+        for metric in (
+            self.agent_tasks_completed,
+            self.agent_memory_usage,
+            self.agent_memory_limit,
+            self.agent_cpu_usage,
+            self.agent_active,
+            self.agent_heartbeat_age,
+        ):
+            try:
+                metric.remove(type_str, agent_id)
+            except KeyError:
+                pass
+
+        try:
+            self.agent_tasks_failed.remove(type_str, agent_id, "unknown")
+        except KeyError:
+            pass
 
-    def update_swarm_metrics(self, metrics: SwarmMetrics):
+    def update_swarm_metrics(self, metrics: SwarmMetrics, now: Optional[float] = None):
         """Update global swarm metrics."""
+        if now is None:
+            now = time.time()
         self.swarm_total_agents.set(metrics.total_agents)
         self.swarm_active_agents.set(metrics.active_agents)
         self.swarm_tasks_queued.set(metrics.tasks_queued)
@@ -248,7 +338,7 @@ class PhantomMetricsExporter:
         self.swarm_memory_limit.set(metrics.memory_limit)
         self.swarm_efficiency.set(metrics.swarm_efficiency)
 
-        coordination_age = time.time() - metrics.last_coordination
+        coordination_age = now - metrics.last_coordination
         self.swarm_coordination_time.set(coordination_age)
 
         self.swarm_state = metrics
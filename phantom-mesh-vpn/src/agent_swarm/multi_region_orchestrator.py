@@ -12,19 +12,81 @@ Copyright © 2025 Stephen Bilodeau. All rights reserved.
 from __future__ import annotations
 
 import asyncio
-import hashlib
+import itertools
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, UTC, timedelta
 from enum import Enum, auto
-from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import defaultdict, deque
-import json
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+from collections import OrderedDict, defaultdict, deque
+import mmap
+import os
+import pickle
+import logging
+import struct
+import tempfile
+import time
 
+import numpy as np
+import orjson
 import structlog
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional (the "accel" extra)
+    njit = None
+
+from .log_utils import logger_enabled_for
+
 logger = structlog.get_logger(__name__)
 
+# Below this many regions JIT dispatch costs more than the numpy path
+NUMBA_MIN_REGIONS = 32
+
+
+def _capacity_kernel(cpu: np.ndarray, latency: np.ndarray) -> Tuple[np.ndarray, float, float]:
+    """Capacity weights plus weighted latency and utilisation."""
+    n = cpu.shape[0]
+    weights = np.empty(n)
+    total = 0.0
+    for i in range(n):
+        weights[i] = 100.0 - cpu[i]
+        total += weights[i]
+    
+    avg_latency = 0.0
+    utilization = 0.0
+    for i in range(n):
+        weights[i] /= total
+        avg_latency += weights[i] * latency[i]
+        utilization += weights[i] * cpu[i]
+    
+    return weights, avg_latency, utilization / 100.0
+
+
+def _balance_score_kernel(weights: np.ndarray) -> float:
+    """One minus the population variance of the weights, floored at zero."""
+    n = weights.shape[0]
+    mean = 0.0
+    for i in range(n):
+        mean += weights[i]
+    mean /= n
+    
+    variance = 0.0
+    for i in range(n):
+        delta = weights[i] - mean
+        variance += delta * delta
+    variance /= n
+    
+    return max(0.0, 1.0 - variance)
+
+
+if njit is not None:
+    _capacity_nb = njit(cache=True)(_capacity_kernel)
+    _balance_score_nb = njit(cache=True)(_balance_score_kernel)
+else:
+    _capacity_nb = _balance_score_nb = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # MULTI-REGION TYPES
@@ -46,7 +108,7 @@ class ConsistencyLevel(Enum):
     STRONG = auto()          # Sequential consistency
 
 
-@dataclass
+@dataclass(slots=True)
 class RegionConfig:
     """Configuration for a geographic region."""
     region_id: str
@@ -59,7 +121,7 @@ class RegionConfig:
     priority: int = 1  # Higher = more preferred
 
 
-@dataclass
+@dataclass(slots=True)
 class RegionMetrics:
     """Current metrics for a region."""
     region_id: str
@@ -80,19 +142,19 @@ class RegionMetrics:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Workload:
     """Distributed workload to coordinate."""
     workload_id: str
     name: str
     regions: List[str]  # Primary + backup regions
     state: Dict[str, Any]
-    replicas: Dict[str, Dict[str, Any]]  # region_id -> replica_state
+    replicas: Dict[str, Mapping[str, Any]]  # region_id -> read-only replica_state
     consistency_level: ConsistencyLevel
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
 
 
-@dataclass
+@dataclass(slots=True)
 class FailoverPlan:
     """Plan for failing over workloads."""
     failed_region: str
@@ -101,9 +163,10 @@ class FailoverPlan:
     actions: List[str]
     estimated_duration_seconds: float
     risk_level: str  # low, medium, high
+    dependencies: Dict[str, List[str]] = field(default_factory=dict)  # action -> prerequisites
 
 
-@dataclass
+@dataclass(slots=True)
 class CoordinationResult:
     """Result of coordinated workflow execution."""
     workflow_id: str
@@ -116,7 +179,7 @@ class CoordinationResult:
     failover_triggered: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadDistribution:
     """Workload distribution across regions."""
     region_allocations: Dict[str, float]  # region_id -> allocation percentage
@@ -129,7 +192,42 @@ class LoadDistribution:
 # DISTRIBUTED STATE MANAGER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
+class DottedClock:
+    """
+    Dotted version vector used as a bounded causal context.
+    
+    ``base`` records, per region, the highest counter below which every
+    event has been seen; ``dots`` holds events seen out of order. compact()
+    folds contiguous dots back into ``base`` so the clock stays close to
+    O(active writers) instead of growing with history.
+    """
+    base: Dict[str, int] = field(default_factory=dict)
+    dots: Set[Tuple[str, int]] = field(default_factory=set)
+    
+    def add(self, region_id: str, counter: int) -> None:
+        """Record a single event."""
+        if counter > self.base.get(region_id, 0):
+            self.dots.add((region_id, counter))
+    
+    def contains(self, region_id: str, counter: int) -> bool:
+        """Check whether an event is part of this causal context."""
+        return counter <= self.base.get(region_id, 0) or (region_id, counter) in self.dots
+    
+    def compact(self) -> None:
+        """Merge dots that extend ``base`` contiguously."""
+        for region_id, counter in sorted(self.dots):
+            if counter == self.base.get(region_id, 0) + 1:
+                self.base[region_id] = counter
+                self.dots.discard((region_id, counter))
+            elif counter <= self.base.get(region_id, 0):
+                self.dots.discard((region_id, counter))
+    
+    def copy(self) -> DottedClock:
+        return DottedClock(base=dict(self.base), dots=set(self.dots))
+
+
+@dataclass(slots=True)
 class StateChange:
     """Record of a state change for replication."""
     change_id: str
@@ -138,7 +236,345 @@ class StateChange:
     workload_id: str
     old_state: Dict[str, Any]
     new_state: Dict[str, Any]
-    version: int
+    version: int  # Counter of this change's dot (region_id, version)
+    context: DottedClock = field(default_factory=DottedClock)
+    new_keys: Optional[frozenset] = field(default=None, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Cached once so overlap checks are a single isdisjoint call
+        if self.new_keys is None:
+            self.new_keys = frozenset(self.new_state)
+    
+    @property
+    def dot(self) -> Tuple[str, int]:
+        return (self.region_id, self.version)
+    
+    def supersedes(self, other: StateChange) -> bool:
+        """
+        Whether this change should win over ``other``.
+        
+        A change that causally observed the other wins; concurrent changes
+        are ordered deterministically by dot so every region converges on
+        the same winner without relying on wall clocks.
+        """
+        if self.context.contains(*other.dot):
+            return True
+        if other.context.contains(*self.dot):
+            return False
+        return (self.version, self.region_id) > (other.version, other.region_id)
+    
+    def concurrent_with(self, other: StateChange) -> bool:
+        """Whether neither change causally observed the other."""
+        # Exact and O(1) on the dotted contexts, so no probabilistic pre-check pays off
+        return not (
+            self.context.contains(*other.dot) or other.context.contains(*self.dot)
+        )
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class StateChangeLog:
+    """
+    Fixed-capacity ring buffer of state changes in struct-of-arrays layout.
+    
+    Timestamps, versions, region and workload ordinals live in flat numpy
+    arrays rather than one object per change; ids, states and causal
+    contexts are kept in parallel sidecar lists. Once full, the oldest
+    entry is overwritten.
+    """
+    
+    def __init__(self, region_index: Dict[str, int], capacity: int = 100000):
+        self.capacity = capacity
+        self._region_index = region_index
+        self._region_ids = list(region_index)
+        self._workload_index: Dict[str, int] = {}
+        self._workload_ids: List[str] = []
+        
+        self._timestamp_us = np.zeros(capacity, dtype=np.int64)
+        self._version = np.zeros(capacity, dtype=np.int64)
+        self._region_idx = np.zeros(capacity, dtype=np.int16)
+        self._workload_idx = np.zeros(capacity, dtype=np.int32)
+        self._change_ids: List[Optional[str]] = [None] * capacity
+        self._old_states: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._new_states: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._contexts: List[Optional[DottedClock]] = [None] * capacity
+        
+        self._head = 0  # Next slot to write
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, change: StateChange) -> None:
+        """Write a change into the next slot, overwriting the oldest when full."""
+        slot = self._head
+        
+        workload_idx = self._workload_index.get(change.workload_id)
+        if workload_idx is None:
+            workload_idx = len(self._workload_ids)
+            self._workload_index[change.workload_id] = workload_idx
+            self._workload_ids.append(change.workload_id)
+        
+        self._timestamp_us[slot] = (change.timestamp - _EPOCH) // _MICROSECOND
+        self._version[slot] = change.version
+        self._region_idx[slot] = self._region_index[change.region_id]
+        self._workload_idx[slot] = workload_idx
+        self._change_ids[slot] = change.change_id
+        self._old_states[slot] = change.old_state
+        self._new_states[slot] = change.new_state
+        self._contexts[slot] = change.context
+        
+        self._head = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+    
+    def _slot(self, position: int) -> int:
+        """Map a logical position (0 = oldest, negative from newest) to a slot."""
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("state change log index out of range")
+        return (self._head - self._size + position) % self.capacity
+    
+    def _materialize(self, slot: int) -> StateChange:
+        return StateChange(
+            change_id=self._change_ids[slot],
+            timestamp=_EPOCH + int(self._timestamp_us[slot]) * _MICROSECOND,
+            region_id=self._region_ids[self._region_idx[slot]],
+            workload_id=self._workload_ids[self._workload_idx[slot]],
+            old_state=self._old_states[slot],
+            new_state=self._new_states[slot],
+            version=int(self._version[slot]),
+            context=self._contexts[slot]
+        )
+    
+    def __getitem__(self, position: int) -> StateChange:
+        return self._materialize(self._slot(position))
+    
+    def __iter__(self):
+        for position in range(self._size):
+            yield self._materialize(self._slot(position))
+    
+    def last_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the newest change without materializing it."""
+        if not self._size:
+            return None
+        return _EPOCH + int(self._timestamp_us[self._slot(-1)]) * _MICROSECOND
+
+
+class TieredPendingQueue:
+    """
+    Unacknowledged replications for one region with a disk overflow tier.
+    
+    Up to ``in_mem_cap`` changes are kept in memory. On overflow the oldest
+    half is spilled in one sequential write to an append-only file of
+    length-prefixed pickles, so heap usage stays bounded during long
+    partitions. acknowledge() drops a delivered change; the spill file is
+    cleaned up once all of its changes are acknowledged, on drain() and on
+    close(). A file the queue created is deleted; a caller-supplied file
+    that already existed is only truncated back to its original length.
+    Pickling and file IO run in a worker thread, off the event loop.
+    """
+    
+    _LENGTH = struct.Struct("<I")
+    
+    def __init__(self, in_mem_cap: int = 1024, spill_path: Optional[str] = None):
+        self.in_mem_cap = in_mem_cap
+        self.spill_path = spill_path
+        # A temp file is created per spill generation unless a path was given
+        self._owns_spill_path = spill_path is None
+        self._memory: OrderedDict[str, StateChange] = OrderedDict()  # change_id -> change
+        self._spilled_ids: Set[str] = set()  # unacknowledged changes in the spill file
+        self._spill_file_exists = False
+        self._spill_file_created = False  # True if this queue created the file
+        self._spill_offset = 0  # where this queue's records start in the file
+        self._file_lock = asyncio.Lock()  # serializes spill file writes, reads and removal
+    
+    def __len__(self) -> int:
+        return len(self._spilled_ids) + len(self._memory)
+    
+    async def append(self, change: StateChange) -> None:
+        self._memory[change.change_id] = change
+        if len(self._memory) > self.in_mem_cap:
+            await self._spill()
+    
+    async def acknowledge(self, change_id: str) -> None:
+        """Drop a change the region confirmed; delete the spill file once it is all acknowledged."""
+        if self._memory.pop(change_id, None) is not None or change_id not in self._spilled_ids:
+            return
+        
+        self._spilled_ids.remove(change_id)
+        if not self._spilled_ids:
+            async with self._file_lock:
+                if not self._spilled_ids:
+                    await self._remove_spill_file()
+    
+    async def _spill(self) -> None:
+        """Move the oldest half of the in-memory changes to the spill file."""
+        async with self._file_lock:
+            # Another spill may have made room while this one waited
+            if len(self._memory) <= self.in_mem_cap:
+                return
+            
+            # Changes stay in memory (and acknowledgeable) until written
+            batch = list(itertools.islice(self._memory.values(), max(1, self.in_mem_cap // 2)))
+            if not self._spill_file_exists:
+                self.spill_path, self._spill_offset, self._spill_file_created = (
+                    await asyncio.to_thread(self._open_spill_file, self.spill_path)
+                )
+                self._spill_file_exists = True
+            await asyncio.to_thread(self._write_records, self.spill_path, batch)
+            
+            for change in batch:
+                # Acknowledged during the write: its record is skipped on drain
+                if self._memory.pop(change.change_id, None) is not None:
+                    self._spilled_ids.add(change.change_id)
+    
+    async def drain(self) -> List[StateChange]:
+        """Remove and return all pending changes, oldest first."""
+        async with self._file_lock:
+            changes: List[StateChange] = []
+            
+            if self._spill_file_exists:
+                spilled_ids, self._spilled_ids = self._spilled_ids, set()
+                records = await asyncio.to_thread(self._read_records, self.spill_path, self._spill_offset)
+                changes.extend(c for c in records if c.change_id in spilled_ids)
+                await self._remove_spill_file()
+            
+            changes.extend(self._memory.values())
+            self._memory.clear()
+            return changes
+    
+    async def close(self) -> None:
+        """Discard all pending changes and delete the spill file."""
+        async with self._file_lock:
+            self._memory.clear()
+            self._spilled_ids.clear()
+            await self._remove_spill_file()
+    
+    async def _remove_spill_file(self) -> None:
+        """Delete the spill file, or strip this queue's records from a caller's; callers hold _file_lock."""
+        if not self._spill_file_exists:
+            return
+        
+        if self._spill_file_created:
+            await asyncio.to_thread(_remove_file, self.spill_path)
+        else:
+            await asyncio.to_thread(_truncate_file, self.spill_path, self._spill_offset)
+        self._spill_file_exists = False
+        if self._owns_spill_path:
+            self.spill_path = None
+    
+    @staticmethod
+    def _open_spill_file(path: Optional[str]) -> Tuple[str, int, bool]:
+        """Create the spill file (a temp file if no path); returns (path, start offset, created)."""
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="phantom-pending-", suffix=".log")
+            os.close(fd)
+            return path, 0, True
+        
+        try:
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+            return path, 0, True
+        except FileExistsError:
+            # Not ours: records are appended after the existing contents
+            return path, os.path.getsize(path), False
+    
+    @classmethod
+    def _write_records(cls, path: str, changes: List[StateChange]) -> None:
+        """Append changes to the spill file as length-prefixed pickles."""
+        chunks = []
+        for change in changes:
+            record = pickle.dumps(change, protocol=pickle.HIGHEST_PROTOCOL)
+            chunks.append(cls._LENGTH.pack(len(record)))
+            chunks.append(record)
+        
+        with open(path, "ab") as f:
+            f.write(b"".join(chunks))
+    
+    @classmethod
+    def _read_records(cls, path: str, offset: int = 0) -> List[StateChange]:
+        """Every record in the spill file from offset on, oldest first, read through mmap."""
+        changes: List[StateChange] = []
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= offset:
+                return changes
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while offset < len(mm):
+                    (length,) = cls._LENGTH.unpack_from(mm, offset)
+                    offset += cls._LENGTH.size
+                    changes.append(pickle.loads(mm[offset:offset + length]))
+                    offset += length
+        return changes
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _truncate_file(path: str, length: int) -> None:
+    try:
+        os.truncate(path, length)
+    except FileNotFoundError:
+        pass
+
+
+class BatchedReplicator:
+    """
+    Coalesces state changes per region and ships them one message per tick.
+    
+    submit() queues a change in the region's outbox and waits for the next
+    flush; the first submission in a tick schedules a flush after
+    ``flush_interval`` seconds, which sends each region's whole outbox in a
+    single call so concurrent replications share one round trip.
+    """
+    
+    def __init__(
+        self,
+        send_batch: Callable[[RegionConfig, List[StateChange]], Awaitable[bool]],
+        flush_interval: float = 0.002
+    ):
+        self._send_batch = send_batch
+        self.flush_interval = flush_interval
+        self._outbox: Dict[str, List[Tuple[StateChange, asyncio.Future]]] = defaultdict(list)
+        self._regions: Dict[str, RegionConfig] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def submit(self, region: RegionConfig, change: StateChange) -> bool:
+        """Queue a change for the next batch and return whether it was delivered."""
+        future = asyncio.get_running_loop().create_future()
+        self._outbox[region.region_id].append((change, future))
+        self._regions[region.region_id] = region
+        
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+        
+        return await future
+    
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        
+        # Swap the outbox so submissions during the send start a new batch
+        outbox, self._outbox = self._outbox, defaultdict(list)
+        self._flush_task = None
+        
+        batches = list(outbox.items())
+        results = await asyncio.gather(
+            *(
+                self._send_batch(self._regions[region_id], [c for c, _ in entries])
+                for region_id, entries in batches
+            ),
+            return_exceptions=True
+        )
+        
+        for (_, entries), result in zip(batches, results):
+            for _, future in entries:
+                if not future.done():
+                    future.set_result(result is True)
 
 
 class DistributedState:
@@ -147,11 +583,34 @@ class DistributedState:
     Handles conflict resolution and convergence.
     """
     
+    # Encoded state payloads kept for reuse across regions
+    PAYLOAD_CACHE_SIZE = 1024
+    # Workloads whose live changes are kept for online conflict detection
+    MAX_INDEXED_WORKLOADS = 10_000
+    
     def __init__(self, regions: List[RegionConfig]):
         self.regions = regions
-        self._state_log: deque[StateChange] = deque(maxlen=100000)
-        self._region_clocks: Dict[str, int] = {r.region_id: 0 for r in regions}
-        self._pending_replications: Dict[str, List[StateChange]] = defaultdict(list)
+        # Logical clocks live in one int64 array indexed by region ordinal
+        self._region_index: Dict[str, int] = {
+            r.region_id: i for i, r in enumerate(regions)
+        }
+        self._state_log = StateChangeLog(self._region_index, capacity=100000)
+        self._region_clocks = np.zeros(len(regions), dtype=np.int64)
+        self._causal_context = DottedClock()
+        
+        # Online conflict index: live changes per workload, least recently
+        # changed first, and conflicts found as changes arrive
+        self._by_workload: OrderedDict[str, List[StateChange]] = OrderedDict()
+        self._conflicts: deque[Tuple[StateChange, StateChange]] = deque(maxlen=10000)
+        self._pending_replications: Dict[str, TieredPendingQueue] = defaultdict(TieredPendingQueue)
+        self._retrying: Set[str] = set()  # regions whose backlog is being resent
+        self._change_counter = itertools.count()
+        self._replicator = BatchedReplicator(self._replicate_batch_to_region)
+        # id(state) -> (state, encoded); holding the dict keeps its id from being reused
+        self._payload_cache: Dict[int, Tuple[Dict[str, Any], bytes]] = {}
+        
+        # Sampled once so per-change logging skips record building when disabled
+        self._log_info = logger_enabled_for(logger, logging.INFO)
         
         logger.info("distributed_state_initialized", regions=len(regions))
     
@@ -170,65 +629,172 @@ class DistributedState:
         5. Return replication status
         """
         
-        replication_status = {}
+        # Inactive regions keep their False status
+        replication_status = {r.region_id: False for r in self.regions}
+        changes: List[Tuple[RegionConfig, StateChange]] = []
         
-        for region in self.regions:
-            if not region.active:
-                replication_status[region.region_id] = False
-                continue
-            
-            # Increment logical clock for causality
-            self._region_clocks[region.region_id] += 1
-            
+        active_regions = [r for r in self.regions if r.active]
+        
+        # Increment logical clocks for causality in a single vectorized step
+        active_idx = np.fromiter(
+            (self._region_index[r.region_id] for r in active_regions),
+            dtype=np.intp,
+            count=len(active_regions)
+        )
+        self._region_clocks[active_idx] += 1
+        versions = self._region_clocks[active_idx].tolist()
+        
+        # Changes in one batch are concurrent siblings sharing the prior context
+        context = self._causal_context.copy()
+        timestamp = datetime.now(UTC)
+        new_state = state_changes.get("new_state", {})
+        new_keys = frozenset(new_state)
+        
+        for region, version in zip(active_regions, versions):
             # Create state change record
             change = StateChange(
                 change_id=self._generate_change_id(),
-                timestamp=datetime.now(UTC),
+                timestamp=timestamp,
                 region_id=region.region_id,
                 workload_id=state_changes.get("workload_id", ""),
                 old_state=state_changes.get("old_state", {}),
-                new_state=state_changes.get("new_state", {}),
-                version=self._region_clocks[region.region_id]
+                new_state=new_state,
+                new_keys=new_keys,
+                version=version,
+                context=context
             )
             
             # Add to log
             self._state_log.append(change)
-            self._pending_replications[region.region_id].append(change)
-            
-            # Simulate replication
-            success = await self._replicate_to_region(region, change)
+            self._index_change(change)
+            await self._pending_replications[region.region_id].append(change)
+            changes.append((region, change))
+            self._causal_context.add(region.region_id, version)
+        
+        self._causal_context.compact()
+        
+        # Queue for the next batched broadcast to every region
+        results = await asyncio.gather(
+            *(self._replicator.submit(region, change) for region, change in changes),
+            return_exceptions=True
+        )
+        
+        for (region, change), result in zip(changes, results):
+            success = result is True
             replication_status[region.region_id] = success
+            if success:
+                await self._pending_replications[region.region_id].acknowledge(change.change_id)
+            
+            if self._log_info:
+                logger.info(
+                    "state_change_replicated",
+                    region=region.region_id,
+                    success=success,
+                    version=change.version
+                )
+        
+        # A region that is reachable again gets its earlier failures resent
+        recovered = [
+            region for region, _ in changes
+            if replication_status[region.region_id] and self._pending_replications[region.region_id]
+        ]
+        if recovered:
+            await asyncio.gather(*(self._retry_pending(region) for region in recovered))
+        
+        return replication_status
+    
+    async def retry_pending_replications(self) -> Dict[str, int]:
+        """
+        Resend every queued replication to the active regions.
+        
+        Returns the number of changes still pending per region.
+        """
+        active_regions = [r for r in self.regions if r.active]
+        await asyncio.gather(*(self._retry_pending(region) for region in active_regions))
+        return {r.region_id: len(self._pending_replications[r.region_id]) for r in active_regions}
+    
+    async def _retry_pending(self, region: RegionConfig) -> None:
+        """Drain a region's queue and resubmit it in order; failures are queued again."""
+        if region.region_id in self._retrying:
+            return
+        
+        self._retrying.add(region.region_id)
+        try:
+            queue = self._pending_replications[region.region_id]
+            backlog = await queue.drain()
+            if not backlog:
+                return
+            results = await asyncio.gather(
+                *(self._replicator.submit(region, change) for change in backlog),
+                return_exceptions=True
+            )
+            for change, result in zip(backlog, results):
+                if result is not True:
+                    await queue.append(change)
             
             logger.info(
-                "state_change_replicated",
+                "pending_replications_retried",
                 region=region.region_id,
-                success=success,
-                version=change.version
+                resent=len(backlog),
+                still_pending=len(queue)
             )
+        finally:
+            self._retrying.discard(region.region_id)
+    
+    def _index_change(self, change: StateChange) -> None:
+        """Compare a new change against live entries for its workload."""
+        live = []
+        for prev in self._by_workload.pop(change.workload_id, ()):
+            # Entries the new change has observed can no longer conflict
+            if change.context.contains(*prev.dot):
+                continue
+            live.append(prev)
+            if (prev.region_id != change.region_id and
+                    self._detect_overlap(prev, change) and
+                    prev.concurrent_with(change)):
+                self._conflicts.append((prev, change))
         
-        return replication_status
+        live.append(change)
+        self._by_workload[change.workload_id] = live
+        if len(self._by_workload) > self.MAX_INDEXED_WORKLOADS:
+            # Drop the least recently changed workload; a later change to it
+            # starts a fresh entry
+            self._by_workload.popitem(last=False)
     
     async def detect_conflicts(
         self,
-        changes: List[StateChange]
+        changes: Optional[List[StateChange]] = None
     ) -> List[Tuple[StateChange, StateChange]]:
-        """Detect conflicting state changes."""
+        """
+        Detect conflicting state changes.
+        
+        Without arguments, returns (and clears) the conflicts found
+        incrementally as changes were replicated. Given an explicit list,
+        scans it directly.
+        """
+        
+        if changes is None:
+            conflicts = list(self._conflicts)
+            self._conflicts.clear()
+            return conflicts
+        
+        # Conflicts require the same workload, so only compare within buckets
+        buckets: Dict[str, List[StateChange]] = defaultdict(list)
+        for change in changes:
+            buckets[change.workload_id].append(change)
         
         conflicts = []
         
-        for i, change1 in enumerate(changes):
-            for change2 in changes[i+1:]:
-                # Conflict if both modify same workload
-                if (change1.workload_id == change2.workload_id and
-                    change1.region_id != change2.region_id):
-                    
-                    # Check if changes overlap
-                    overlap = self._detect_overlap(
-                        change1.new_state,
-                        change2.new_state
-                    )
-                    
-                    if overlap:
+        for bucket in buckets.values():
+            if len(bucket) < 2:
+                continue
+            
+            for i, change1 in enumerate(bucket):
+                for change2 in bucket[i+1:]:
+                    # Conflict if different regions concurrently modify overlapping keys
+                    if (change1.region_id != change2.region_id and
+                            self._detect_overlap(change1, change2) and
+                            change1.concurrent_with(change2)):
                         conflicts.append((change1, change2))
         
         return conflicts
@@ -237,59 +803,87 @@ class DistributedState:
         self,
         conflicts: List[Tuple[StateChange, StateChange]]
     ) -> Dict[str, Any]:
-        """Resolve conflicts using CRDTs or LWW."""
+        """Resolve conflicts by causal order, breaking ties on dots."""
         
-        resolved = {}
+        winners: Dict[str, StateChange] = {}
         
         for change1, change2 in conflicts:
-            if change1.timestamp > change2.timestamp:
-                # Last-write-wins
-                resolved[change1.workload_id] = change1.new_state
-            else:
-                resolved[change2.workload_id] = change2.new_state
+            winner = change1 if change1.supersedes(change2) else change2
+            current = winners.get(winner.workload_id)
+            if current is None or winner.supersedes(current):
+                winners[winner.workload_id] = winner
         
-        return resolved
+        return {
+            workload_id: change.new_state
+            for workload_id, change in winners.items()
+        }
     
-    async def _replicate_to_region(
+    async def _replicate_batch_to_region(
         self,
         region: RegionConfig,
-        change: StateChange
+        changes: List[StateChange]
     ) -> bool:
-        """Replicate change to specific region."""
+        """Replicate a batch of changes to a specific region in one message."""
         
         try:
-            # Simulate async replication with latency
+            payload = b"[" + b",".join(
+                self._encode_state(change.new_state) for change in changes
+            ) + b"]"
+            
+            # Simulate async replication of the payload with latency
             await asyncio.sleep(0.01)  # 10ms replication latency
             return True
         except Exception as e:
             logger.error("replication_failed", region=region.region_id, error=str(e))
             return False
     
+    def _encode_state(self, state: Dict[str, Any]) -> bytes:
+        """
+        Serialize a state payload, reusing the encoding across regions.
+        
+        Every region receives the same new_state dict for a change, so it is
+        encoded once. State dicts must not be mutated after submission.
+        """
+        cached = self._payload_cache.get(id(state))
+        if cached is not None and cached[0] is state:
+            return cached[1]
+        
+        if len(self._payload_cache) >= self.PAYLOAD_CACHE_SIZE:
+            self._payload_cache.clear()
+        
+        encoded = orjson.dumps(state)
+        self._payload_cache[id(state)] = (state, encoded)
+        return encoded
+    
     def _generate_change_id(self) -> str:
         """Generate unique change ID."""
-        data = f"{datetime.now(UTC).isoformat()}{len(self._state_log)}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        # Uniqueness token only; no need for a cryptographic hash
+        return f"{next(self._change_counter):016x}"
     
     def _detect_overlap(
         self,
-        state1: Dict[str, Any],
-        state2: Dict[str, Any]
+        change1: StateChange,
+        change2: StateChange
     ) -> bool:
-        """Check if two state changes overlap."""
-        keys1 = set(state1.keys())
-        keys2 = set(state2.keys())
-        return bool(keys1 & keys2)  # Intersection
+        """Check if two state changes touch any common keys."""
+        return not change1.new_keys.isdisjoint(change2.new_keys)
+    
+    async def close(self) -> None:
+        """Drop pending replications and delete their spill files."""
+        for queue in self._pending_replications.values():
+            await queue.close()
     
     def get_replication_status(self) -> Dict[str, Any]:
         """Get replication status across regions."""
         
         pending_total = sum(len(v) for v in self._pending_replications.values())
+        last_change = self._state_log.last_timestamp()
         
         return {
             "total_state_changes": len(self._state_log),
             "pending_replications": pending_total,
-            "region_clocks": self._region_clocks.copy(),
-            "last_change": self._state_log[-1].timestamp.isoformat() if self._state_log else None
+            "region_clocks": dict(zip(self._region_index, self._region_clocks.tolist())),
+            "last_change": last_change.isoformat() if last_change else None
         }
 
 
@@ -303,9 +897,23 @@ class FailoverManager:
     def __init__(self, regions: List[RegionConfig]):
         self.regions = {r.region_id: r for r in regions}
         self._failover_history: deque = deque(maxlen=1000)
+        # Per-region view of the same records for O(1) recency queries
+        self._failover_history_by_region: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=100)
+        )
+        self._ranked: Tuple[RegionConfig, ...] = ()
+        self.invalidate()
+        self._log_info = logger_enabled_for(logger, logging.INFO)
         
         logger.info("failover_manager_initialized", regions=len(regions))
     
+    def invalidate(self) -> None:
+        """Recompute the backup ranking after regions or priorities change."""
+        self._ranked = tuple(sorted(
+            self.regions.values(),
+            key=lambda r: (r.priority, r.latency_budget_ms)
+        ))
+    
     async def handle_region_failure(
         self,
         failed_region: str,
@@ -328,12 +936,36 @@ class FailoverManager:
         # Execute failover
         result = await self.execute_failover_plan(plan)
         
+        record = {
+            "region": failed_region,
+            "timestamp": datetime.now(UTC),
+            "affected_workloads": plan.affected_workloads,
+            "target_regions": plan.target_regions,
+            "status": result.status,
+            "execution_time_ms": result.execution_time_ms,
+        }
+        self._failover_history.append(record)
+        self._failover_history_by_region[failed_region].append(record)
+        
         logger.info(
             "failover_completed",
             region=failed_region,
             success=result.status == "success"
         )
     
+    def get_recent_failovers(
+        self,
+        region_id: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Most recent failover records, newest first, optionally for one region."""
+        if region_id is None:
+            history = self._failover_history
+        else:
+            history = self._failover_history_by_region.get(region_id, ())
+        
+        return list(itertools.islice(reversed(history), limit))
+    
     async def _generate_failover_plan(
         self,
         failed_region: str,
@@ -345,19 +977,30 @@ class FailoverManager:
         backup_regions = self._select_backup_regions(failed_region)
         
         # Actions for failover
+        stop = f"stop_workloads_in_{failed_region}"
+        promote = f"promote_replicas_from_{backup_regions[0]}"
         actions = [
-            f"stop_workloads_in_{failed_region}",
-            f"promote_replicas_from_{backup_regions[0]}",
+            stop,
+            promote,
             "update_routing",
             "restart_in_backup",
             "monitor_convergence"
         ]
         
+        # Routing, restart and monitoring only need the promoted replicas
+        dependencies = {
+            promote: [stop],
+            "update_routing": [promote],
+            "restart_in_backup": [promote],
+            "monitor_convergence": [promote],
+        }
+        
         return FailoverPlan(
             failed_region=failed_region,
             affected_workloads=[w.workload_id for w in workloads],
             target_regions=backup_regions,
             actions=actions,
+            dependencies=dependencies,
             estimated_duration_seconds=30.0,
             risk_level="high"
         )
@@ -368,14 +1011,33 @@ class FailoverManager:
     ) -> CoordinationResult:
         """Execute failover plan with state preservation."""
         
-        start_time = datetime.now(UTC)
+        start_ns = time.monotonic_ns()
         
-        # Execute actions in sequence
-        for action in plan.actions:
-            logger.info("executing_failover_action", action=action)
-            await asyncio.sleep(0.1)  # Simulate action execution
+        # Execute actions in dependency waves; independent actions overlap
+        pending = list(plan.actions)
+        completed: Set[str] = set()
         
-        duration_ms = (datetime.now(UTC) - start_time).total_seconds() * 1000
+        while pending:
+            ready = [
+                action for action in pending
+                if all(
+                    dep in completed or dep not in plan.actions
+                    for dep in plan.dependencies.get(action, ())
+                )
+            ]
+            if not ready:
+                raise ValueError(f"Cyclic failover action dependencies: {pending}")
+            
+            if len(ready) == 1:
+                # Run a lone action inline rather than paying for gather
+                await self._execute_action(ready[0])
+            else:
+                await asyncio.gather(*(self._execute_action(a) for a in ready))
+            
+            completed.update(ready)
+            pending = [a for a in pending if a not in completed]
+        
+        duration_ms = (time.monotonic_ns() - start_ns) / 1e6
         
         return CoordinationResult(
             workflow_id="failover",
@@ -388,18 +1050,25 @@ class FailoverManager:
             failover_triggered=True
         )
     
+    async def _execute_action(self, action: str) -> None:
+        """Execute a single failover action."""
+        if self._log_info:
+            logger.info("executing_failover_action", action=action)
+        await asyncio.sleep(0.1)  # Simulate action execution
+    
     def _select_backup_regions(self, failed_region: str) -> List[str]:
         """Select best backup regions for failover."""
         
-        available = [
-            r for r in self.regions.values()
-            if r.region_id != failed_region and r.active
-        ]
-        
-        # Sort by priority and distance
-        available.sort(key=lambda r: (r.priority, r.latency_budget_ms))
+        # Walk the precomputed priority/distance ranking; active is checked
+        # here because it flips far more often than the ranking itself
+        selected = []
+        for r in self._ranked:
+            if r.region_id != failed_region and r.active:
+                selected.append(r.region_id)
+                if len(selected) == 2:
+                    break
         
-        return [r.region_id for r in available[:2]]
+        return selected
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -416,6 +1085,7 @@ class RegionCoordinator:
         
         self._region_metrics: Dict[str, RegionMetrics] = {}
         self._active_workloads: Dict[str, Workload] = {}
+        self._workloads_by_region: Dict[str, Set[str]] = defaultdict(set)
         
         logger.info("region_coordinator_initialized", regions=len(regions))
     
@@ -434,7 +1104,7 @@ class RegionCoordinator:
         4. Latency SLAs are met
         """
         
-        start_time = datetime.now(UTC)
+        start_ns = time.monotonic_ns()
         
         # Determine regions
         target_regions = regions or list(self.regions.keys())
@@ -449,7 +1119,7 @@ class RegionCoordinator:
             consistency_level=ConsistencyLevel.EVENTUAL
         )
         
-        self._active_workloads[workload.workload_id] = workload
+        self._register_workload(workload)
         
         # Execute in parallel
         tasks = [
@@ -459,12 +1129,11 @@ class RegionCoordinator:
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Analyze results
-        succeeded = sum(1 for r in results if isinstance(r, bool) and r)
-        failed_regions = [
-            region for region, result in zip(target_regions, results)
-            if isinstance(result, Exception)
-        ]
+        # Partition regions by outcome in a single pass
+        executed_regions: List[str] = []
+        failed_regions: List[str] = []
+        for region, result in zip(target_regions, results):
+            (failed_regions if isinstance(result, Exception) else executed_regions).append(region)
         
         # Handle partial failures
         if failed_regions:
@@ -473,12 +1142,12 @@ class RegionCoordinator:
                 [workload]
             )
         
-        duration_ms = (datetime.now(UTC) - start_time).total_seconds() * 1000
+        duration_ms = (time.monotonic_ns() - start_ns) / 1e6
         
         return CoordinationResult(
             workflow_id=workload.workload_id,
             status="success" if not failed_regions else "partial",
-            executed_regions=[r for r in target_regions if r not in failed_regions],
+            executed_regions=executed_regions,
             failed_regions=failed_regions,
             execution_time_ms=duration_ms,
             coordination_overhead_ms=duration_ms * 0.1,
@@ -486,6 +1155,25 @@ class RegionCoordinator:
             failover_triggered=len(failed_regions) > 0
         )
     
+    def _register_workload(self, workload: Workload) -> None:
+        """Track a workload and index it by each region it runs in."""
+        self.unregister_workload(workload.workload_id)
+        self._active_workloads[workload.workload_id] = workload
+        for region_id in workload.regions:
+            self._workloads_by_region[region_id].add(workload.workload_id)
+    
+    def unregister_workload(self, workload_id: str) -> None:
+        """Stop tracking a workload and drop it from the region index."""
+        workload = self._active_workloads.pop(workload_id, None)
+        if workload is None:
+            return
+        for region_id in workload.regions:
+            region_workloads = self._workloads_by_region.get(region_id)
+            if region_workloads is not None:
+                region_workloads.discard(workload_id)
+                if not region_workloads:
+                    del self._workloads_by_region[region_id]
+    
     async def _execute_in_region(
         self,
         region_id: str,
@@ -497,8 +1185,8 @@ class RegionCoordinator:
             # Simulate execution
             await asyncio.sleep(0.05)  # 50ms execution
             
-            # Store replica
-            workload.replicas[region_id] = workload.state.copy()
+            # Replicas share the workload state through a read-only view
+            workload.replicas[region_id] = MappingProxyType(workload.state)
             
             return True
         except Exception as e:
@@ -522,14 +1210,18 @@ class RegionCoordinator:
             # Detect failures
             if metric.status == RegionStatus.UNAVAILABLE:
                 affected = [
-                    w for w in self._active_workloads.values()
-                    if region_id in w.regions
+                    self._active_workloads[workload_id]
+                    for workload_id in self._workloads_by_region.get(region_id, ())
                 ]
                 
                 if affected:
                     await self.failover_manager.handle_region_failure(
                         region_id, affected
                     )
+    
+    async def close(self) -> None:
+        """Release replication resources (pending queue spill files)."""
+        await self.state_manager.close()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -559,8 +1251,6 @@ class GlobalLoadBalancer:
         4. Workload affinity
         """
         
-        allocations = {}
-        
         # Filter healthy regions
         healthy = {
             rid: m for rid, m in region_metrics.items()
@@ -577,28 +1267,24 @@ class GlobalLoadBalancer:
                 balanced_score=0.5
             )
         
-        # Compute capacity weights
-        total_capacity = sum(
-            (100 - m.cpu_usage_percent) / 100
-            for m in healthy.values()
-        )
+        # Compute capacity weights over healthy regions in one vectorized pass
+        region_ids = list(healthy)
+        count = len(region_ids)
+        cpu = np.fromiter((m.cpu_usage_percent for m in healthy.values()), dtype=np.float64, count=count)
+        latency = np.fromiter((m.latency_ms for m in healthy.values()), dtype=np.float64, count=count)
         
-        for region_id, metrics in healthy.items():
-            capacity_factor = (100 - metrics.cpu_usage_percent) / (100 * total_capacity)
-            allocations[region_id] = capacity_factor
+        # Unhealthy regions carry zero allocation, so only healthy ones contribute
+        if _capacity_nb is not None and count >= NUMBA_MIN_REGIONS:
+            weights, avg_latency, total_utilization = _capacity_nb(cpu, latency)
+        else:
+            capacity = 100.0 - cpu
+            weights = capacity / capacity.sum()
+            avg_latency = float(weights @ latency)
+            total_utilization = float(weights @ cpu) / 100
         
-        # Compute metrics
-        avg_latency = sum(
-            m.latency_ms * allocations.get(rid, 0)
-            for rid, m in region_metrics.items()
-        )
+        allocations = dict(zip(region_ids, weights.tolist()))
         
-        total_utilization = sum(
-            m.cpu_usage_percent * allocations.get(rid, 0)
-            for rid, m in region_metrics.items()
-        ) / 100
-        
-        balanced_score = self._compute_balance_score(allocations)
+        balanced_score = self._compute_balance_score(weights)
         
         return LoadDistribution(
             region_allocations=allocations,
@@ -607,15 +1293,16 @@ class GlobalLoadBalancer:
             balanced_score=balanced_score
         )
     
-    def _compute_balance_score(self, allocations: Dict[str, float]) -> float:
+    def _compute_balance_score(self, weights: np.ndarray) -> float:
         """Compute how balanced the allocation is (0.0-1.0)."""
         
-        if not allocations:
+        if not weights.size:
             return 0.0
         
-        values = list(allocations.values())
-        mean = sum(values) / len(values)
-        variance = sum((v - mean) ** 2 for v in values) / len(values)
+        if _balance_score_nb is not None and weights.size >= NUMBA_MIN_REGIONS:
+            return float(_balance_score_nb(weights))
+        
+        variance = float(weights.var())
         
         # Lower variance = higher score
         return max(0.0, 1.0 - variance)
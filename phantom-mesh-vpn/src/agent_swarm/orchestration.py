@@ -12,15 +12,33 @@ Copyright © 2025 Stephen Bilodeau. All rights reserved.
 from __future__ import annotations
 
 import asyncio
+import contextvars
+import copy
+import itertools
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, UTC, timedelta
 from enum import Enum, auto
-from typing import Any, Callable, Coroutine, Optional
+import functools
+from types import MappingProxyType
+from typing import Any, Callable, Coroutine, Iterable, Mapping, Optional, Sequence
+import hashlib
 import json
+import logging
+import random
+import time
 
+import numpy as np
 import structlog
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional (the "accel" extra)
+    njit = None
+
+from .log_utils import logger_enabled_for
+
 logger = structlog.get_logger(__name__)
 
 
@@ -61,26 +79,37 @@ class ThreatLevel(Enum):
     CATASTROPHIC = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StateTransition:
     """Immutable state transition record."""
     from_state: Any
     to_state: Any
-    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
+    timestamp_ns: int = field(default_factory=time.time_ns)
     reason: str = ""
-    context: dict[str, Any] = field(default_factory=dict)
+    context: Mapping[str, Any] = field(default_factory=dict)
+    _from_name: str = field(init=False, repr=False, compare=False)
+    _to_name: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Resolve display names once instead of on every serialization
+        object.__setattr__(self, "_from_name", getattr(self.from_state, 'name', None) or str(self.from_state))
+        object.__setattr__(self, "_to_name", getattr(self.to_state, 'name', None) or str(self.to_state))
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, UTC)
     
     def to_dict(self) -> dict[str, Any]:
         return {
-            "from_state": self.from_state.name if hasattr(self.from_state, 'name') else str(self.from_state),
-            "to_state": self.to_state.name if hasattr(self.to_state, 'name') else str(self.to_state),
+            "from_state": self._from_name,
+            "to_state": self._to_name,
             "timestamp": self.timestamp.isoformat(),
             "reason": self.reason,
-            "context": self.context
+            "context": dict(self.context)
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StateGuard:
     """Preconditions for state transitions."""
     condition: Callable[..., bool]
@@ -90,44 +119,183 @@ class StateGuard:
         return self.condition(*args, **kwargs)
 
 
+# Locks whose read side the current task (or the task that spawned it) holds
+_held_read_locks: contextvars.ContextVar[frozenset] = contextvars.ContextVar(
+    "_held_read_locks", default=frozenset()
+)
+
+
+class AsyncRWLock:
+    """
+    Writer-preferring reader/writer lock for asyncio.
+    Readers share access; a waiting writer blocks new readers so transitions
+    are never starved by observers. Reads nested inside a downgraded lock are
+    re-entrant, so they never queue behind a writer that waits on their holder.
+    """
+    
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+        self.read = _RWLockReadHandle(self)
+        self.write = _RWLockWriteHandle(self)
+    
+    async def acquire_read(self) -> None:
+        async with self._cond:
+            if self in _held_read_locks.get():
+                await self._cond.wait_for(lambda: not self._writer)
+            else:
+                await self._cond.wait_for(lambda: not self._writer and not self._waiting_writers)
+            self._readers += 1
+    
+    async def release_read(self, token: Optional[contextvars.Token] = None) -> None:
+        """Release a read; pass the token from downgrade() to end re-entrancy."""
+        if token is not None:
+            _held_read_locks.reset(token)
+        async with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+    
+    async def acquire_write(self) -> None:
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writer and not self._readers)
+            except BaseException:
+                self._waiting_writers -= 1
+                self._cond.notify_all()
+                raise
+            self._waiting_writers -= 1
+            self._writer = True
+    
+    async def release_write(self) -> None:
+        async with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+    
+    async def downgrade(self) -> contextvars.Token:
+        """
+        Atomically turn a held write lock into a read lock.
+        The current task and tasks it starts may re-acquire the read side
+        until the returned token is passed to release_read().
+        """
+        async with self._cond:
+            self._writer = False
+            self._readers += 1
+            self._cond.notify_all()
+        return _held_read_locks.set(_held_read_locks.get() | {self})
+
+
+class _RWLockReadHandle:
+    def __init__(self, lock: AsyncRWLock):
+        self._lock = lock
+    
+    async def __aenter__(self) -> None:
+        await self._lock.acquire_read()
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self._lock.release_read()
+
+
+class _RWLockWriteHandle:
+    def __init__(self, lock: AsyncRWLock):
+        self._lock = lock
+    
+    async def __aenter__(self) -> None:
+        await self._lock.acquire_write()
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self._lock.release_write()
+
+
+_EMPTY_MAPPING: MappingProxyType = MappingProxyType({})
+
+
 class StateMachine:
     """
     Hierarchical state machine with guards, transitions, and callbacks.
     Implements temporal logic for workflow orchestration.
     """
     
-    def __init__(self, initial_state: Any, entity_id: str = ""):
+    # Default number of transitions kept in memory per machine
+    DEFAULT_HISTORY_LIMIT = 10_000
+    # Budget for each transition callback (seconds)
+    CALLBACK_TIMEOUT_SEC = 10.0
+    
+    def __init__(
+        self,
+        initial_state: Any,
+        entity_id: str = "",
+        history_limit: Optional[int] = None,
+        history_sink: Optional[Callable[[StateTransition], None]] = None
+    ):
         self.current_state = initial_state
         self.entity_id = entity_id
-        self._transitions: dict[tuple[Any, Any], list[StateGuard]] = {}
-        self._callbacks: dict[tuple[Any, Any], list[Callable[[StateTransition], Coroutine[Any, Any, Any]]]] = {}
-        self._history: list[StateTransition] = []
-        self._state_lock = asyncio.Lock()
+        # Adjacency rows: from_state -> {to_state: bound guards}; None marks a
+        # fast-path transition with no guards and no callbacks
+        self._transitions: dict[Any, dict[Any, Optional[tuple[tuple[Callable[..., bool], str], ...]]]] = {}
+        # from_state -> {to_state: (sequential callbacks, parallel callbacks)}
+        self._callbacks: dict[Any, dict[Any, tuple[list[Callable[[StateTransition], Coroutine[Any, Any, Any]]], list[Callable[[StateTransition], Coroutine[Any, Any, Any]]]]]] = {}
+        self._transitions_for_current = _EMPTY_MAPPING
+        # Rendered state names, so log calls don't re-stringify states
+        self._current_state_str = str(initial_state)
+        self._state_strs: dict[Any, str] = {initial_state: self._current_state_str}
+        self._log_debug = logger_enabled_for(logger, logging.DEBUG)
+        self._history: deque[StateTransition] = deque(maxlen=history_limit or self.DEFAULT_HISTORY_LIMIT)
+        # Receives records as they are evicted from the bounded history
+        self._history_sink = history_sink
+        self._rwlock = AsyncRWLock()
         
-        logger.info("state_machine_created", entity=entity_id, initial_state=str(initial_state))
+        logger.info("state_machine_created", entity=entity_id, initial_state=self._current_state_str)
     
     def register_transition(
         self,
         from_state: Any,
         to_state: Any,
-        guards: Optional[list[StateGuard]] = None
+        guards: Optional[list[StateGuard]] = None,
+        fastpath: bool = False
     ) -> None:
-        """Register valid state transition with optional guards."""
-        key = (from_state, to_state)
-        self._transitions[key] = guards or []
-        logger.debug("transition_registered", from_state=str(from_state), to_state=str(to_state))
+        """
+        Register valid state transition with optional guards.
+        fastpath marks a transition that never has guards or callbacks.
+        """
+        if fastpath and guards:
+            raise ValueError("Fast-path transitions cannot have guards")
+        
+        bound = tuple((guard.condition, guard.message) for guard in guards or ())
+        has_callbacks = to_state in self._callbacks.get(from_state, _EMPTY_MAPPING)
+        self._transitions.setdefault(from_state, {})[to_state] = (
+            None if fastpath and not has_callbacks else bound
+        )
+        if from_state == self.current_state:
+            self._transitions_for_current = self._transitions[from_state]
+        
+        from_str = self._state_strs.setdefault(from_state, str(from_state))
+        to_str = self._state_strs.setdefault(to_state, str(to_state))
+        if self._log_debug:
+            logger.debug("transition_registered", from_state=from_str, to_state=to_str)
     
     def on_transition(
         self,
         from_state: Any,
         to_state: Any,
-        callback: Callable[[StateTransition], Coroutine[Any, Any, Any]]
+        callback: Callable[[StateTransition], Coroutine[Any, Any, Any]],
+        parallel: bool = True
     ) -> None:
-        """Register callback for transition."""
-        key = (from_state, to_state)
-        if key not in self._callbacks:
-            self._callbacks[key] = []
-        self._callbacks[key].append(callback)
+        """
+        Register callback for transition.
+        Parallel callbacks run concurrently; pass parallel=False for callbacks
+        that must run in registration order, before the parallel ones.
+        """
+        sequential, concurrent = self._callbacks.setdefault(from_state, {}).setdefault(to_state, ([], []))
+        (concurrent if parallel else sequential).append(callback)
+        
+        # A callback disqualifies the transition from the fast path
+        row = self._transitions.get(from_state)
+        if row is not None and to_state in row and row[to_state] is None:
+            row[to_state] = ()
     
     async def transition(
         self,
@@ -139,83 +307,127 @@ class StateMachine:
         Attempt state transition with guard evaluation and callbacks.
         Returns True if successful, False otherwise.
         """
-        async with self._state_lock:
+        await self._rwlock.acquire_write()
+        read_token = None
+        try:
             # Check if transition is valid
-            key = (self.current_state, to_state)
-            if key not in self._transitions:
+            row = self._transitions_for_current
+            if to_state not in row:
                 logger.warning(
                     "invalid_transition",
                     entity=self.entity_id,
-                    from_state=str(self.current_state),
+                    from_state=self._current_state_str,
                     to_state=str(to_state)
                 )
                 return False
             
             # Evaluate guards
-            guards = self._transitions[key]
-            for guard in guards:
-                if not guard.evaluate(context or {}):
-                    logger.warning(
-                        "guard_failed",
-                        entity=self.entity_id,
-                        guard=guard.message,
-                        context=context
-                    )
-                    return False
+            guards = row[to_state]
+            # Guards and the recorded transition get a real dict they may write to
+            ctx = context if context is not None else {}
+            if guards:
+                for condition, message in guards:
+                    if not condition(ctx):
+                        logger.warning(
+                            "guard_failed",
+                            entity=self.entity_id,
+                            guard=message,
+                            context=context
+                        )
+                        return False
             
             # Perform transition
             from_state = self.current_state
+            from_state_str = self._current_state_str
             self.current_state = to_state
+            self._current_state_str = self._state_strs[to_state]
+            self._transitions_for_current = self._transitions.get(to_state, _EMPTY_MAPPING)
             
             # Record transition
             transition = StateTransition(
                 from_state=from_state,
                 to_state=to_state,
                 reason=reason,
-                context=context or {}
+                context=ctx
             )
+            if self._history_sink is not None and len(self._history) == self._history.maxlen:
+                self._history_sink(self._history[0])
             self._history.append(transition)
             
             logger.info(
                 "state_transition",
                 entity=self.entity_id,
-                from_state=str(from_state),
-                to_state=str(to_state),
+                from_state=from_state_str,
+                to_state=self._current_state_str,
                 reason=reason
             )
             
+            if guards is None:
+                return True
+            
+            # Callbacks only need the new state to be stable, not exclusive access;
+            # they may read the machine even while another transition waits
+            read_token = await self._rwlock.downgrade()
+            
             # Execute callbacks
-            if key in self._callbacks:
-                for callback in self._callbacks[key]:
-                    try:
-                        await callback(transition)
-                    except Exception as e:
-                        logger.error(
-                            "transition_callback_error",
-                            entity=self.entity_id,
-                            error=str(e)
-                        )
+            callbacks = self._callbacks.get(from_state, _EMPTY_MAPPING).get(to_state)
+            if callbacks:
+                sequential, concurrent = callbacks
+                for callback in sequential:
+                    await self._run_callback(callback, transition)
+                if concurrent:
+                    async with asyncio.TaskGroup() as tg:
+                        for callback in concurrent:
+                            tg.create_task(self._run_callback(callback, transition))
             
             return True
+        finally:
+            if read_token is not None:
+                await self._rwlock.release_read(read_token)
+            else:
+                await self._rwlock.release_write()
     
-    def get_history(self, limit: Optional[int] = None) -> list[StateTransition]:
+    async def _run_callback(
+        self,
+        callback: Callable[[StateTransition], Coroutine[Any, Any, Any]],
+        transition: StateTransition
+    ) -> None:
+        """Run one callback; failures are logged so they never affect siblings."""
+        try:
+            await asyncio.wait_for(callback(transition), timeout=self.CALLBACK_TIMEOUT_SEC)
+        except Exception as e:
+            logger.error(
+                "transition_callback_error",
+                entity=self.entity_id,
+                error=str(e) or type(e).__name__
+            )
+    
+    async def get_state(self) -> Any:
+        """Get current state under a shared lock."""
+        async with self._rwlock.read:
+            return self.current_state
+    
+    async def get_history(self, limit: Optional[int] = None) -> list[StateTransition]:
         """Get state transition history."""
-        if limit:
-            return self._history[-limit:]
-        return self._history.copy()
+        async with self._rwlock.read:
+            if limit:
+                start = max(0, len(self._history) - limit)
+                return list(itertools.islice(self._history, start, None))
+            return list(self._history)
     
-    def can_transition_to(self, to_state: Any) -> bool:
+    async def can_transition_to(self, to_state: Any) -> bool:
         """Check if transition is possible without executing it."""
-        return (self.current_state, to_state) in self._transitions
+        async with self._rwlock.read:
+            return to_state in self._transitions_for_current
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # WORKFLOW ORCHESTRATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowStep:
-    """Single step in a workflow."""
+    """Single step in a workflow (immutable, so playbooks can share steps)."""
     id: str
     name: str
     agent_role: str
@@ -223,21 +435,46 @@ class WorkflowStep:
     timeout: float = 30.0
     retries: int = 3
     rollback_action: Optional[str] = None
-    dependencies: list[str] = field(default_factory=list)
-    metadata: dict[str, Any] = field(default_factory=dict)
+    dependencies: tuple[str, ...] = field(default_factory=tuple)
+    metadata: MappingProxyType = field(default_factory=lambda: _EMPTY_MAPPING)
+    
+    def __post_init__(self):
+        if not isinstance(self.dependencies, tuple):
+            object.__setattr__(self, "dependencies", tuple(self.dependencies))
+        if not isinstance(self.metadata, MappingProxyType):
+            object.__setattr__(self, "metadata", MappingProxyType(dict(self.metadata)))
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowExecution:
     """Execution context for a workflow."""
     workflow_id: str
     execution_id: str
-    steps: list[WorkflowStep]
+    steps: tuple[WorkflowStep, ...]
     state_machine: StateMachine
-    start_time: datetime = field(default_factory=lambda: datetime.now(UTC))
-    end_time: Optional[datetime] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
     results: dict[str, Any] = field(default_factory=dict)
     failed_steps: list[str] = field(default_factory=list)
+    
+    def __post_init__(self):
+        self.steps = tuple(self.steps)
+    
+    @property
+    def start_time(self) -> datetime:
+        return datetime.fromtimestamp(self.start_ns / 1e9, UTC)
+    
+    @property
+    def end_time(self) -> Optional[datetime]:
+        if self.end_ns is None:
+            return None
+        return datetime.fromtimestamp(self.end_ns / 1e9, UTC)
+    
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
 
 
 class OrchestrationEngine:
@@ -246,45 +483,86 @@ class OrchestrationEngine:
     Implements FORTRESS threat response patterns.
     """
     
-    def __init__(self):
+    # Upper bound on the retry backoff between step attempts (seconds)
+    MAX_BACKOFF_SEC = 30
+    # Executions kept for inspection; beyond this the oldest finished ones
+    # are evicted first (running executions are never evicted)
+    MAX_WORKFLOWS = 1_000
+    # Incidents expire after INCIDENT_TTL seconds or beyond MAX_INCIDENTS
+    MAX_INCIDENTS = 10_000
+    INCIDENT_TTL = 3600.0
+    # Cached step results kept, least recently used evicted first; expired
+    # ones are also swept every STEP_CACHE_SWEEP_INTERVAL seconds
+    MAX_CACHED_STEPS = 4_096
+    STEP_CACHE_SWEEP_INTERVAL = 60.0
+    
+    def __init__(self, emit_per_step_logs: bool = False):
         self._workflows: dict[str, WorkflowExecution] = {}
+        # Ids of finished executions in completion order, for eviction
+        self._finished_workflows: deque[str] = deque()
         self._step_handlers: dict[str, Callable[[WorkflowStep, dict[str, Any]], Coroutine[Any, Any, Any]]] = {}
         self._threat_level = ThreatLevel.NONE
-        self._active_incidents: dict[str, dict[str, Any]] = {}
+        self._threat_level_value = ThreatLevel.NONE.value
+        # threat_id -> incident, ordered by expiry so purging pops from the front
+        self._active_incidents: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._incidents_seen: Counter[str] = Counter()
+        
+        # Idempotent step results keyed by fingerprint: fp -> (expires_at, result),
+        # least recently used first
+        self._step_cache: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._next_cache_sweep = time.monotonic() + self.STEP_CACHE_SWEEP_INTERVAL
+        # step type -> (ttl, context keys its handler reads)
+        self._cacheable_steps: dict[str, tuple[float, tuple[str, ...]]] = {}
+        
+        # When False, step completions and rollbacks are logged once per workflow
+        self.emit_per_step_logs = emit_per_step_logs
         
         logger.info("orchestration_engine_initialized")
     
     def register_step_handler(
         self,
         step_type: str,
-        handler: Callable[[WorkflowStep, dict[str, Any]], Coroutine[Any, Any, Any]]
+        handler: Callable[[WorkflowStep, dict[str, Any]], Coroutine[Any, Any, Any]],
+        cacheable: bool = False,
+        ttl: float = 60.0,
+        cache_keys: Sequence[str] = ()
     ) -> None:
-        """Register handler for specific workflow step type."""
+        """
+        Register handler for specific workflow step type.
+        Cacheable handlers must be idempotent and list the context keys they
+        read in cache_keys: a step whose name, action, metadata and those
+        context values are unchanged reuses the previous result for ttl seconds.
+        """
         self._step_handlers[step_type] = handler
+        if cacheable:
+            self._cacheable_steps[step_type] = (ttl, tuple(cache_keys))
+        else:
+            self._cacheable_steps.pop(step_type, None)
         logger.debug("step_handler_registered", step_type=step_type)
     
     async def execute_workflow(
         self,
         workflow_id: str,
-        steps: list[WorkflowStep],
+        steps: Sequence[WorkflowStep],
         context: Optional[dict[str, Any]] = None
     ) -> WorkflowExecution:
         """
         Execute workflow with state machine tracking and automatic rollback.
         """
-        execution_id = f"{workflow_id}_{datetime.now(UTC).timestamp()}"
+        execution_id = f"{workflow_id}_{time.monotonic_ns()}"
         
         # Create state machine
         sm = StateMachine(WorkflowState.CREATED, entity_id=workflow_id)
         
         # Register transitions
-        sm.register_transition(WorkflowState.CREATED, WorkflowState.QUEUED)
-        sm.register_transition(WorkflowState.QUEUED, WorkflowState.RUNNING)
-        sm.register_transition(WorkflowState.RUNNING, WorkflowState.COMPLETED)
-        sm.register_transition(WorkflowState.RUNNING, WorkflowState.FAILED)
-        sm.register_transition(WorkflowState.RUNNING, WorkflowState.PAUSED)
-        sm.register_transition(WorkflowState.PAUSED, WorkflowState.RUNNING)
-        sm.register_transition(WorkflowState.FAILED, WorkflowState.ROLLED_BACK)
+        sm.register_transition(WorkflowState.CREATED, WorkflowState.QUEUED, fastpath=True)
+        sm.register_transition(WorkflowState.QUEUED, WorkflowState.RUNNING, fastpath=True)
+        sm.register_transition(WorkflowState.QUEUED, WorkflowState.FAILED, fastpath=True)
+        sm.register_transition(WorkflowState.RUNNING, WorkflowState.COMPLETED, fastpath=True)
+        sm.register_transition(WorkflowState.RUNNING, WorkflowState.FAILED, fastpath=True)
+        sm.register_transition(WorkflowState.RUNNING, WorkflowState.PAUSED, fastpath=True)
+        sm.register_transition(WorkflowState.PAUSED, WorkflowState.RUNNING, fastpath=True)
+        sm.register_transition(WorkflowState.FAILED, WorkflowState.ROLLED_BACK, fastpath=True)
         
         # Create execution context
         execution = WorkflowExecution(
@@ -300,23 +578,84 @@ class OrchestrationEngine:
             # Transition to queued
             await sm.transition(WorkflowState.QUEUED, reason="Workflow enqueued")
             
+            # Bind handlers up front so a misconfigured playbook fails before running
+            handlers = self._step_handlers
+            missing = [step.id for step in steps if step.name not in handlers]
+            if missing:
+                execution.failed_steps.extend(missing)
+                logger.error("workflow_missing_step_handlers", workflow=workflow_id, steps=missing)
+                await sm.transition(
+                    WorkflowState.FAILED,
+                    reason=f"No handler registered for steps: {', '.join(missing)}"
+                )
+                self._finish_execution(execution)
+                return execution
+            resolved = {step.id: handlers[step.name] for step in steps}
+            
             # Transition to running
             await sm.transition(WorkflowState.RUNNING, reason="Workflow started")
             
-            # Execute steps in order
+            # Execute steps in dependency waves; independent steps run concurrently
+            steps_by_id = {step.id: step for step in steps}
+            in_degree: dict[str, int] = {}
+            dependents: dict[str, list[str]] = {}
             for step in steps:
-                try:
-                    result = await self._execute_step(step, context or {})
+                deps = [dep for dep in step.dependencies if dep in steps_by_id]
+                in_degree[step.id] = len(deps)
+                for dep in deps:
+                    dependents.setdefault(dep, []).append(step.id)
+            
+            # One writable context per workflow, shared by its step handlers
+            step_context = context if context is not None else {}
+            ready = [step for step in steps if in_degree[step.id] == 0]
+            completed_count = 0
+            step_log: list[dict[str, Any]] = []
+            
+            while ready:
+                tasks = {
+                    asyncio.create_task(self._execute_step(step, resolved[step.id], step_context)): step
+                    for step in ready
+                }
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+                
+                # A failure cancels the rest of the wave before rolling back
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                
+                failed = [task for task in done if task.exception() is not None]
+                
+                next_ready = []
+                for task in done:
+                    if task in failed:
+                        continue
+                    step = tasks[task]
+                    result = task.result()
                     execution.results[step.id] = result
+                    completed_count += 1
                     
-                    logger.info(
-                        "workflow_step_completed",
-                        workflow=workflow_id,
-                        step=step.id,
-                        result_keys=list(result.keys())
-                    )
+                    if self.emit_per_step_logs:
+                        logger.info(
+                            "workflow_step_completed",
+                            workflow=workflow_id,
+                            step=step.id,
+                            result_keys=list(result.keys())
+                        )
+                    else:
+                        step_log.append({"step": step.id, "result_keys": list(result.keys())})
                     
-                except Exception as e:
+                    for dependent_id in dependents.get(step.id, ()):
+                        in_degree[dependent_id] -= 1
+                        if in_degree[dependent_id] == 0:
+                            next_ready.append(steps_by_id[dependent_id])
+                
+                if failed:
+                    if step_log:
+                        logger.info("workflow_steps_completed", workflow=workflow_id, steps=step_log)
+                    
+                    step = tasks[failed[0]]
+                    e = failed[0].exception()
                     logger.error(
                         "workflow_step_failed",
                         workflow=workflow_id,
@@ -324,24 +663,32 @@ class OrchestrationEngine:
                         error=str(e)
                     )
                     
-                    execution.failed_steps.append(step.id)
+                    execution.failed_steps.extend(tasks[task].id for task in failed)
                     
                     # Attempt rollback
                     await self._rollback_workflow(execution)
                     await sm.transition(WorkflowState.FAILED, reason=f"Step {step.id} failed: {str(e)}")
                     
-                    execution.end_time = datetime.now(UTC)
+                    self._finish_execution(execution)
                     return execution
+                
+                ready = next_ready
+            
+            if completed_count < len(steps_by_id):
+                raise ValueError("Workflow step dependencies contain a cycle")
+            
+            if step_log:
+                logger.info("workflow_steps_completed", workflow=workflow_id, steps=step_log)
             
             # Mark as completed
             await sm.transition(WorkflowState.COMPLETED, reason="All steps completed successfully")
-            execution.end_time = datetime.now(UTC)
+            self._finish_execution(execution)
             
             logger.info(
                 "workflow_completed",
                 workflow=workflow_id,
                 execution=execution_id,
-                duration_seconds=(execution.end_time - execution.start_time).total_seconds()
+                duration_seconds=execution.duration_seconds
             )
             
         except Exception as e:
@@ -353,29 +700,61 @@ class OrchestrationEngine:
             
             await sm.transition(WorkflowState.FAILED, reason=f"Execution error: {str(e)}")
             await self._rollback_workflow(execution)
-            execution.end_time = datetime.now(UTC)
+            self._finish_execution(execution)
         
         return execution
     
+    def _finish_execution(self, execution: WorkflowExecution) -> None:
+        """Stamp the end time and evict the oldest finished executions over MAX_WORKFLOWS."""
+        if execution.end_ns is not None:
+            return
+        execution.end_ns = time.time_ns()
+        finished = self._finished_workflows
+        finished.append(execution.execution_id)
+        while len(self._workflows) > self.MAX_WORKFLOWS and finished:
+            del self._workflows[finished.popleft()]
+    
     async def _execute_step(
         self,
         step: WorkflowStep,
+        handler: Callable[[WorkflowStep, dict[str, Any]], Coroutine[Any, Any, Any]],
         context: dict[str, Any]
     ) -> dict[str, Any]:
         """Execute single workflow step with retry logic."""
-        handler = self._step_handlers.get(step.name)
-        
-        if not handler:
-            raise ValueError(f"No handler registered for step: {step.name}")
+        cache_policy = self._cacheable_steps.get(step.name)
+        fingerprint = None
+        if cache_policy is not None:
+            ttl, cache_keys = cache_policy
+            now = time.monotonic()
+            if now >= self._next_cache_sweep:
+                self._sweep_step_cache(now)
+            
+            fingerprint = self._step_fingerprint(step, context, cache_keys)
+            cached = self._step_cache.get(fingerprint)
+            if cached is not None:
+                if cached[0] > now:
+                    self._step_cache.move_to_end(fingerprint)
+                    logger.debug("step_cache_hit", step=step.id)
+                    # Every hit gets its own copy, so callers can't alter what later hits see
+                    return copy.deepcopy(cached[1])
+                del self._step_cache[fingerprint]
         
         last_error = None
         
         for attempt in range(step.retries):
+            # The handler runs as its own task so a timeout or cancellation of
+            # this step always cancels it and waits for it to unwind
+            task = asyncio.ensure_future(handler(step, context))
             try:
-                result = await asyncio.wait_for(
-                    handler(step, context),
-                    timeout=step.timeout
-                )
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(task), timeout=step.timeout)
+                except BaseException:
+                    if not task.done():
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+                    raise
+                if fingerprint is not None:
+                    self._cache_step_result(fingerprint, time.monotonic() + ttl, result)
                 return result
                 
             except asyncio.TimeoutError:
@@ -396,12 +775,44 @@ class OrchestrationEngine:
                     error=str(e)
                 )
             
-            # Backoff before retry
+            # Capped, jittered backoff before retry
             if attempt < step.retries - 1:
-                await asyncio.sleep(2 ** attempt)
+                await asyncio.sleep(min(2 ** attempt, self.MAX_BACKOFF_SEC) + random.random() * 0.25)
         
         raise RuntimeError(f"Step {step.id} failed after {step.retries} attempts: {last_error}")
     
+    def _cache_step_result(self, fingerprint: bytes, expires_at: float, result: dict[str, Any]) -> None:
+        self._step_cache[fingerprint] = (expires_at, copy.deepcopy(result))
+        self._step_cache.move_to_end(fingerprint)
+        if len(self._step_cache) > self.MAX_CACHED_STEPS:
+            self._step_cache.popitem(last=False)
+    
+    def _sweep_step_cache(self, now: float) -> None:
+        """Drop every expired step result (TTLs vary by step, so scan them all)."""
+        expired = [fp for fp, (expires_at, _) in self._step_cache.items() if expires_at <= now]
+        for fingerprint in expired:
+            del self._step_cache[fingerprint]
+        self._next_cache_sweep = now + self.STEP_CACHE_SWEEP_INTERVAL
+    
+    @staticmethod
+    def _step_fingerprint(
+        step: WorkflowStep,
+        context: Mapping[str, Any],
+        cache_keys: tuple[str, ...]
+    ) -> bytes:
+        """Stable digest of the inputs a cacheable step reads."""
+        payload = json.dumps(
+            {
+                "name": step.name,
+                "action": step.action,
+                "meta": dict(step.metadata),
+                "ctx": {key: context[key] for key in cache_keys if key in context}
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+    
     async def _rollback_workflow(self, execution: WorkflowExecution) -> None:
         """Rollback workflow on failure."""
         logger.warning(
@@ -410,15 +821,20 @@ class OrchestrationEngine:
             failed_steps=execution.failed_steps
         )
         
+        rollback_log: list[dict[str, Any]] = []
+        
         # Rollback in reverse order
         for step in reversed(execution.steps):
             if step.id in execution.results and step.rollback_action:
                 try:
-                    logger.info(
-                        "step_rollback",
-                        step=step.id,
-                        action=step.rollback_action
-                    )
+                    if self.emit_per_step_logs:
+                        logger.info(
+                            "step_rollback",
+                            step=step.id,
+                            action=step.rollback_action
+                        )
+                    else:
+                        rollback_log.append({"step": step.id, "action": step.rollback_action})
                     # TODO: Execute rollback action
                     
                 except Exception as e:
@@ -427,6 +843,9 @@ class OrchestrationEngine:
                         step=step.id,
                         error=str(e)
                     )
+        
+        if rollback_log:
+            logger.info("steps_rolled_back", workflow=execution.workflow_id, steps=rollback_log)
     
     async def record_threat(
         self,
@@ -436,16 +855,26 @@ class OrchestrationEngine:
         context: Optional[dict[str, Any]] = None
     ) -> None:
         """Record detected threat and escalate if necessary."""
+        self._purge_expired_incidents()
+        
         self._active_incidents[threat_id] = {
             "level": level,
             "description": description,
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp_ns": time.time_ns(),
+            "expires_at": time.monotonic() + self.INCIDENT_TTL,
             "context": context or {}
         }
+        self._active_incidents.move_to_end(threat_id)
+        if len(self._active_incidents) > self.MAX_INCIDENTS:
+            self._active_incidents.popitem(last=False)
+        self._incidents_seen[level.name] += 1
         
-        # Update threat level
-        if level.value > self._threat_level.value:
+        # Update threat level; no await between compare and swap, so this is
+        # atomic with respect to other handle_threat tasks
+        level_value = level.value
+        if level_value > self._threat_level_value:
             self._threat_level = level
+            self._threat_level_value = level_value
             logger.critical(
                 "threat_level_escalated",
                 threat_id=threat_id,
@@ -453,12 +882,31 @@ class OrchestrationEngine:
                 description=description
             )
     
+    def _purge_expired_incidents(self) -> None:
+        """Drop incidents whose TTL has elapsed."""
+        now = time.monotonic()
+        incidents = self._active_incidents
+        while incidents and next(iter(incidents.values()))["expires_at"] <= now:
+            incidents.popitem(last=False)
+    
     def get_threat_status(self) -> dict[str, Any]:
         """Get current threat status and active incidents."""
+        self._purge_expired_incidents()
+        
         return {
             "threat_level": self._threat_level.name,
             "active_incidents": len(self._active_incidents),
-            "incidents": self._active_incidents
+            "total_incidents_seen": self._incidents_seen.total(),
+            "incidents_by_level": dict(self._incidents_seen),
+            "incidents": {
+                threat_id: {
+                    "level": incident["level"],
+                    "description": incident["description"],
+                    "timestamp": datetime.fromtimestamp(incident["timestamp_ns"] / 1e9, UTC).isoformat(),
+                    "context": incident["context"]
+                }
+                for threat_id, incident in self._active_incidents.items()
+            }
         }
 
 
@@ -466,35 +914,201 @@ class OrchestrationEngine:
 # THREAT RESPONSE PATTERNS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _is_number(value: Any) -> bool:
+    """int or float, excluding bool: the only values threshold operators compare."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Comparison operators accepted inside a threat signature, e.g. {"$gte": 5};
+# thresholds never match (rather than raise) when either side is not a number
+_SIGNATURE_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "$gte": lambda v, n: _is_number(v) and _is_number(n) and v >= n,
+    "$gt": lambda v, n: _is_number(v) and _is_number(n) and v > n,
+    "$lte": lambda v, n: _is_number(v) and _is_number(n) and v <= n,
+    "$lt": lambda v, n: _is_number(v) and _is_number(n) and v < n,
+    "$ne": lambda v, n: v != n,
+    "$in": lambda v, n: v in n,
+}
+
+
+# Numeric threshold operators evaluated by the JIT kernel, by opcode
+_NUMERIC_OPCODES: dict[str, int] = {"$gte": 0, "$gt": 1, "$lte": 2, "$lt": 3}
+
+# Below this many patterns in a bucket JIT dispatch costs more than Python matching
+NUMBA_MIN_PATTERNS = 64
+
+
+def _freeze_signature(signature: Mapping[str, Any]) -> MappingProxyType:
+    """Read-only copy of a signature; nested mappings and $in operands are frozen too."""
+    frozen: dict[str, Any] = {}
+    for key, expected in signature.items():
+        if isinstance(expected, Mapping):
+            expected = _freeze_signature(expected)
+        elif key == "$in" and isinstance(expected, (list, set)):
+            expected = tuple(expected) if isinstance(expected, list) else frozenset(expected)
+        frozen[key] = expected
+    return MappingProxyType(frozen)
+
+
+def _compile_signature(
+    signature: Mapping[str, Any],
+    prefix: tuple[str, ...] = ()
+) -> list[tuple[tuple[str, ...], Callable[[Any], bool], int, Any]]:
+    """
+    Flatten a threat signature into (path, predicate, opcode, operand) checks.
+    opcode is -1 unless the check is a numeric threshold the kernel can evaluate.
+    """
+    checks: list[tuple[tuple[str, ...], Callable[[Any], bool], int, Any]] = []
+    for key, expected in signature.items():
+        path = prefix + (key,)
+        if isinstance(expected, Mapping) and expected and all(k in _SIGNATURE_OPERATORS for k in expected):
+            for op, operand in expected.items():
+                opcode = _NUMERIC_OPCODES.get(op, -1) if _is_number(operand) else -1
+                checks.append((path, lambda v, f=_SIGNATURE_OPERATORS[op], n=operand: f(v, n), opcode, operand))
+        elif isinstance(expected, Mapping):
+            checks.extend(_compile_signature(expected, path))
+        else:
+            checks.append((path, lambda v, e=expected: v == e, -1, expected))
+    return checks
+
+
+def _resolve_path(data: Any, path: tuple[str, ...]) -> Any:
+    for key in path:
+        data = data.get(key) if isinstance(data, dict) else None
+    return data
+
+
+def _numeric_match_kernel(
+    values: np.ndarray,
+    check_pattern: np.ndarray,
+    check_field: np.ndarray,
+    check_op: np.ndarray,
+    check_operand: np.ndarray,
+    n_patterns: int
+) -> np.ndarray:
+    """Per-pattern flag: every numeric threshold check passes (NaN = missing field)."""
+    ok = np.ones(n_patterns, dtype=np.bool_)
+    for i in range(check_pattern.shape[0]):
+        p = check_pattern[i]
+        if not ok[p]:
+            continue
+        v = values[check_field[i]]
+        n = check_operand[i]
+        op = check_op[i]
+        if np.isnan(v):
+            ok[p] = False
+        elif op == 0:
+            ok[p] = v >= n
+        elif op == 1:
+            ok[p] = v > n
+        elif op == 2:
+            ok[p] = v <= n
+        else:
+            ok[p] = v < n
+    return ok
+
+
+if njit is not None:
+    _numeric_match_nb = njit(cache=True)(_numeric_match_kernel)
+else:
+    _numeric_match_nb = None
+
+
+_MAX_SEVERITY = max(level.value for level in ThreatLevel)
+
+
 class ThreatResponsePattern:
     """Automated threat response pattern definition."""
     
     def __init__(
         self,
         pattern_id: str,
-        threat_signature: dict[str, Any],
-        response_workflow: list[WorkflowStep],
+        threat_signature: Mapping[str, Any],
+        response_workflow: Sequence[WorkflowStep],
         escalation_level: ThreatLevel
     ):
         self.pattern_id = pattern_id
-        self.threat_signature = threat_signature
-        self.response_workflow = response_workflow
+        # Read-only, like the steps, so cached playbooks can be shared safely
+        self.threat_signature = _freeze_signature(threat_signature)
+        self.response_workflow = tuple(response_workflow)
         self.escalation_level = escalation_level
+        self._sev_value = escalation_level.value
+        
+        # Compiled once so matching is a flat loop over the checks; numeric
+        # thresholds are also kept apart for the batched JIT path
+        compiled = _compile_signature(threat_signature)
+        self._checks = [(path, predicate) for path, predicate, _, _ in compiled]
+        self._numeric_checks = [
+            (path, opcode, float(operand))
+            for path, _, opcode, operand in compiled if opcode >= 0
+        ]
+        self._residual_checks = [
+            (path, predicate)
+            for path, predicate, opcode, _ in compiled if opcode < 0
+        ]
+    
+    @property
+    def event_type(self) -> Optional[str]:
+        """Exact event_type this pattern requires, if any (used for dispatch)."""
+        event_type = self.threat_signature.get("event_type")
+        return event_type if isinstance(event_type, str) else None
     
     def matches(self, threat_data: dict[str, Any]) -> bool:
         """Check if threat matches this pattern."""
-        for key, expected_value in self.threat_signature.items():
-            actual_value = threat_data.get(key)
-            
-            if isinstance(expected_value, dict) and isinstance(actual_value, dict):
-                # Recursive matching
-                for sub_key, sub_value in expected_value.items():
-                    if actual_value.get(sub_key) != sub_value:
-                        return False
-            elif actual_value != expected_value:
+        for path, predicate in self._checks:
+            value: Any = threat_data
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if not predicate(value):
                 return False
         
         return True
+    
+    def matches_residual(self, threat_data: dict[str, Any]) -> bool:
+        """Check only the non-numeric checks (numeric ones already passed the kernel)."""
+        for path, predicate in self._residual_checks:
+            if not predicate(_resolve_path(threat_data, path)):
+                return False
+        
+        return True
+
+
+class _NumericPatternTable:
+    """A bucket's numeric threshold checks packed into arrays for the JIT kernel."""
+    
+    def __init__(self, patterns: Sequence[ThreatResponsePattern]):
+        self.patterns = tuple(patterns)
+        field_ids: dict[tuple[str, ...], int] = {}
+        check_pattern: list[int] = []
+        check_field: list[int] = []
+        check_op: list[int] = []
+        check_operand: list[float] = []
+        for index, pattern in enumerate(self.patterns):
+            for path, opcode, operand in pattern._numeric_checks:
+                check_pattern.append(index)
+                check_field.append(field_ids.setdefault(path, len(field_ids)))
+                check_op.append(opcode)
+                check_operand.append(operand)
+        
+        self.fields = tuple(field_ids)
+        self.check_pattern = np.array(check_pattern, dtype=np.int32)
+        self.check_field = np.array(check_field, dtype=np.int32)
+        self.check_op = np.array(check_op, dtype=np.int8)
+        self.check_operand = np.array(check_operand, dtype=np.float64)
+    
+    def prefilter(self, threat_data: dict[str, Any]) -> list[ThreatResponsePattern]:
+        """Patterns whose numeric checks all pass, in registration order."""
+        values = np.full(len(self.fields), np.nan)
+        for j, path in enumerate(self.fields):
+            value = _resolve_path(threat_data, path)
+            if _is_number(value):
+                values[j] = value
+        
+        passed = _numeric_match_nb(
+            values, self.check_pattern, self.check_field,
+            self.check_op, self.check_operand, len(self.patterns)
+        )
+        return [self.patterns[i] for i in np.flatnonzero(passed)]
 
 
 class ThreatResponseEngine:
@@ -503,35 +1117,74 @@ class ThreatResponseEngine:
     def __init__(self, orchestration_engine: OrchestrationEngine):
         self.orchestration = orchestration_engine
         self.patterns: dict[str, ThreatResponsePattern] = {}
+        # event_type -> {pattern_id: pattern}; None holds patterns matching any event_type
+        self._patterns_by_event_type: dict[Optional[str], dict[str, ThreatResponsePattern]] = {}
+        # Packed kernel inputs for large buckets, rebuilt lazily after registration
+        self._numeric_tables: dict[Optional[str], _NumericPatternTable] = {}
         self._incident_handlers: dict[str, Callable[[dict[str, Any]], Coroutine[Any, Any, Any]]] = {}
         
         logger.info("threat_response_engine_initialized")
     
     def register_pattern(self, pattern: ThreatResponsePattern) -> None:
         """Register threat response pattern."""
+        previous = self.patterns.get(pattern.pattern_id)
+        if previous is not None:
+            self._patterns_by_event_type.get(previous.event_type, {}).pop(previous.pattern_id, None)
+            self._numeric_tables.pop(previous.event_type, None)
+        
+        self._numeric_tables.pop(pattern.event_type, None)
         self.patterns[pattern.pattern_id] = pattern
+        self._patterns_by_event_type.setdefault(pattern.event_type, {})[pattern.pattern_id] = pattern
         logger.debug("threat_pattern_registered", pattern=pattern.pattern_id)
     
+    def register_patterns(self, patterns: Iterable[ThreatResponsePattern]) -> None:
+        """Register several patterns at once, e.g. ALL_PLAYBOOKS."""
+        for pattern in patterns:
+            self.register_pattern(pattern)
+    
+    def _select_pattern(self, threat_data: dict[str, Any]) -> Optional[ThreatResponsePattern]:
+        """Highest-severity pattern matching the threat, scanning only its event_type."""
+        event_type = threat_data.get("event_type")
+        keys = (None, event_type) if isinstance(event_type, str) else (None,)
+        
+        best: Optional[ThreatResponsePattern] = None
+        best_level = 0
+        for key in keys:
+            bucket = self._patterns_by_event_type.get(key)
+            if not bucket:
+                continue
+            
+            if _numeric_match_nb is not None and len(bucket) >= NUMBA_MIN_PATTERNS:
+                table = self._numeric_tables.get(key)
+                if table is None:
+                    table = self._numeric_tables[key] = _NumericPatternTable(list(bucket.values()))
+                candidates = table.prefilter(threat_data)
+                check = ThreatResponsePattern.matches_residual
+            else:
+                candidates = bucket.values()
+                check = ThreatResponsePattern.matches
+            
+            for candidate in candidates:
+                if candidate._sev_value > best_level and check(candidate, threat_data):
+                    best = candidate
+                    best_level = candidate._sev_value
+                    if best_level == _MAX_SEVERITY:
+                        return best
+        
+        return best
+    
     async def handle_threat(self, threat_data: dict[str, Any]) -> bool:
         """
         Detect threat and execute automated response.
         Returns True if threat was handled, False if no matching pattern.
         """
-        threat_id = threat_data.get("id", f"threat_{datetime.now(UTC).timestamp()}")
+        threat_id = threat_data.get("id", f"threat_{time.time_ns()}")
         
-        # Find matching patterns
-        matching_patterns = [
-            p for p in self.patterns.values()
-            if p.matches(threat_data)
-        ]
-        
-        if not matching_patterns:
+        pattern = self._select_pattern(threat_data)
+        if pattern is None:
             logger.warning("no_matching_threat_pattern", threat_id=threat_id)
             return False
         
-        # Execute response for highest severity pattern
-        pattern = max(matching_patterns, key=lambda p: p.escalation_level.value)
-        
         logger.critical(
             "executing_threat_response",
             threat_id=threat_id,
@@ -539,20 +1192,20 @@ class ThreatResponseEngine:
             level=pattern.escalation_level.name
         )
         
-        # Record threat
-        await self.orchestration.record_threat(
-            threat_id,
-            pattern.escalation_level,
-            f"Matched pattern: {pattern.pattern_id}",
-            context=threat_data
-        )
-        
-        # Execute response workflow
-        execution = await self.orchestration.execute_workflow(
-            f"response_{threat_id}",
-            pattern.response_workflow,
-            context=threat_data
-        )
+        # Recording and the response workflow are independent; run them together
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.orchestration.record_threat(
+                threat_id,
+                pattern.escalation_level,
+                f"Matched pattern: {pattern.pattern_id}",
+                context=threat_data
+            ))
+            execution_task = tg.create_task(self.orchestration.execute_workflow(
+                f"response_{threat_id}",
+                pattern.response_workflow,
+                context=threat_data
+            ))
+        execution = execution_task.result()
         
         return execution.state_machine.current_state == WorkflowState.COMPLETED
 
@@ -561,6 +1214,7 @@ class ThreatResponseEngine:
 # INCIDENT PLAYBOOKS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@functools.cache
 def create_port_scan_playbook() -> ThreatResponsePattern:
     """Playbook for port scanning detection and response."""
     return ThreatResponsePattern(
@@ -594,6 +1248,7 @@ def create_port_scan_playbook() -> ThreatResponsePattern:
     )
 
 
+@functools.cache
 def create_brute_force_playbook() -> ThreatResponsePattern:
     """Playbook for brute force attack detection and response."""
     return ThreatResponsePattern(
@@ -628,6 +1283,7 @@ def create_brute_force_playbook() -> ThreatResponsePattern:
     )
 
 
+@functools.cache
 def create_anomalous_traffic_playbook() -> ThreatResponsePattern:
     """Playbook for anomalous network traffic detection."""
     return ThreatResponsePattern(
@@ -661,3 +1317,27 @@ def create_anomalous_traffic_playbook() -> ThreatResponsePattern:
         ],
         escalation_level=ThreatLevel.CRITICAL
     )
+
+
+def _build_all_playbooks() -> tuple[ThreatResponsePattern, ...]:
+    return (
+        create_port_scan_playbook(),
+        create_brute_force_playbook(),
+        create_anomalous_traffic_playbook(),
+    )
+
+
+def reset_playbook_cache() -> None:
+    """
+    Drop memoized playbooks and rebuild ALL_PLAYBOOKS from fresh ones.
+    Code that imported ALL_PLAYBOOKS by name keeps the previous tuple.
+    """
+    global ALL_PLAYBOOKS
+    create_port_scan_playbook.cache_clear()
+    create_brute_force_playbook.cache_clear()
+    create_anomalous_traffic_playbook.cache_clear()
+    ALL_PLAYBOOKS = _build_all_playbooks()
+
+
+# Built-in playbooks for one-shot registration; rebuilt by reset_playbook_cache()
+ALL_PLAYBOOKS: tuple[ThreatResponsePattern, ...] = _build_all_playbooks()
@@ -10,44 +10,171 @@ Copyright © 2025 Stephen Bilodeau. All rights reserved.
 
 from __future__ import annotations
 
+import array
 import asyncio
+import contextlib
+import itertools
+import math
 import time
-import statistics
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Sequence
 from collections import defaultdict
-import json
+from types import SimpleNamespace
 
+import numpy as np
+import orjson
+import psutil
 import structlog
 
-logger = structlog.get_logger(__name__)
+# Initial values keep the proxy lazy, so configure_logging() still applies
+logger = structlog.get_logger(__name__, component="bench")
+
+# Stand-in for BenchmarkRunner(quiet=True); nothing is rendered at all
+_QUIET_LOGGER = SimpleNamespace(info=lambda *args, **kwargs: None)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PERFORMANCE METRICS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
+def _percentile_index(n: int, percentile: float) -> int:
+    """Nearest-rank index of percentile within n ordered samples."""
+    return min(int(n * percentile / 100), n - 1)
+
+
+def _select_percentiles(data: np.ndarray, percentiles: Sequence[float]) -> list[float]:
+    """Nearest-rank percentiles via one quickselect (np.partition) instead of a sort."""
+    kth = [_percentile_index(data.size, p) for p in percentiles]
+    part = np.partition(data, sorted(set(kth)))
+    return [float(part[k]) for k in kth]
+
+
+def _compute_stats(durations: np.ndarray) -> tuple[float, float, float, float, float, float, float]:
+    """
+    min, max, mean, median, p95, p99 and sample stddev of a non-empty array.
+    Order statistics come from one np.partition (quickselect) rather than a sort.
+    """
+    n = durations.size
+    mid = n // 2
+    k95 = _percentile_index(n, 95)
+    k99 = _percentile_index(n, 99)
+    kth = {mid, k95, k99}
+    if n % 2 == 0:
+        kth.add(mid - 1)
+    part = np.partition(durations, sorted(kth))
+    median = part[mid] if n % 2 else (part[mid - 1] + part[mid]) / 2
+    return (
+        float(durations.min()),
+        float(durations.max()),
+        float(durations.mean()),
+        float(median),
+        float(part[k95]),
+        float(part[k99]),
+        float(durations.std(ddof=1)) if n > 1 else 0.0,
+    )
+
+
+# Log-bucketed latency histogram (HdrHistogram-style): bucket i covers
+# [LOW * GROWTH**i, LOW * GROWTH**(i+1)) ms, i.e. ~1% relative precision
+_HIST_LOW_MS = 1e-3
+_HIST_GROWTH = 1.01
+_HIST_LOG_GROWTH = math.log(_HIST_GROWTH)
+_HIST_BUCKETS = 2200  # up to ~1.4e6 ms (23 min); larger values share the top bucket
+
+
+class RunningStats:
+    """
+    O(1)-memory running statistics for one operation: count, sum, Welford
+    mean and squared-deviation sum, min, max, successes and a log-bucketed
+    histogram for percentiles.
+    """
+    
+    __slots__ = ("count", "sum_d", "mean_d", "m2_d", "min_d", "max_d", "successes", "_buckets")
+    
+    def __init__(self):
+        self.count = 0
+        self.sum_d = 0.0
+        self.mean_d = 0.0
+        self.m2_d = 0.0
+        self.min_d = math.inf
+        self.max_d = -math.inf
+        self.successes = 0
+        self._buckets = [0] * _HIST_BUCKETS
+    
+    def add(self, duration_ms: float, success: bool) -> None:
+        """Fold one sample in."""
+        self.count += 1
+        self.sum_d += duration_ms
+        # Welford update: no sum-of-squares cancellation on long runs
+        delta = duration_ms - self.mean_d
+        self.mean_d += delta / self.count
+        self.m2_d += delta * (duration_ms - self.mean_d)
+        if duration_ms < self.min_d:
+            self.min_d = duration_ms
+        if duration_ms > self.max_d:
+            self.max_d = duration_ms
+        if success:
+            self.successes += 1
+        
+        if duration_ms > _HIST_LOW_MS:
+            i = min(int(math.log(duration_ms / _HIST_LOW_MS) / _HIST_LOG_GROWTH), _HIST_BUCKETS - 1)
+        else:
+            i = 0
+        self._buckets[i] += 1
+    
+    def percentiles(self, percentiles: Sequence[float]) -> list[float]:
+        """Nearest-rank percentiles, accurate to the bucket width (~1%)."""
+        if not self.count:
+            return [0.0 for _ in percentiles]
+        
+        cumulative = np.cumsum(self._buckets)
+        ranks = [_percentile_index(self.count, p) for p in percentiles]
+        idx = np.searchsorted(cumulative, np.asarray(ranks) + 1)
+        # Bucket midpoint (geometric), clamped to the observed range
+        values = _HIST_LOW_MS * _HIST_GROWTH ** (idx + 0.5)
+        return [float(v) for v in np.clip(values, self.min_d, self.max_d)]
+    
+    def summary(self) -> tuple[float, float, float, float, float, float, float]:
+        """Same fields as _compute_stats, from the running state (count > 0)."""
+        n = self.count
+        stddev = math.sqrt(self.m2_d / (n - 1)) if n > 1 else 0.0
+        median, p95, p99 = self.percentiles((50, 95, 99))
+        return (self.min_d, self.max_d, self.mean_d, median, p95, p99, stddev)
+
+
+_BYTES_PER_MB = 1024 * 1024
+
+# Wall-clock anchor for monotonic metric timestamps, captured once at import
+_WALL_EPOCH = time.time()
+_MONO_EPOCH = time.monotonic()
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics for an operation."""
     operation: str
     duration_ms: float
     success: bool
-    timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
+    timestamp: float = field(default_factory=time.monotonic)  # monotonic seconds
     metadata: dict[str, Any] = field(default_factory=dict)
     
+    @property
+    def recorded_at(self) -> datetime:
+        """Wall-clock time of the metric, materialized on demand."""
+        return datetime.fromtimestamp(_WALL_EPOCH + (self.timestamp - _MONO_EPOCH), UTC)
+    
     def to_dict(self) -> dict[str, Any]:
         return {
             "operation": self.operation,
             "duration_ms": round(self.duration_ms, 2),
             "success": self.success,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.recorded_at.isoformat(),
             "metadata": self.metadata
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BenchmarkResults:
     """Aggregated benchmark results."""
     benchmark_name: str
@@ -75,7 +202,19 @@ class BenchmarkResults:
     success_rate: float
     timestamp: datetime = field(default_factory=lambda: datetime.now(UTC))
     
+    # Summed operation time per wall-clock second, i.e. mean operations in
+    # flight; well below the intended concurrency points at scheduling overhead
+    busy_ratio: float = 0.0
+    
+    # Rendered to_dict(); results are not modified once compiled
+    _cached_dict: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    
     def to_dict(self) -> dict[str, Any]:
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        return self._cached_dict
+    
+    def _build_dict(self) -> dict[str, Any]:
         return {
             "benchmark_name": self.benchmark_name,
             "total_operations": self.total_operations,
@@ -96,6 +235,7 @@ class BenchmarkResults:
                 "average": round(self.average_memory_mb, 2)
             },
             "success_rate": round(self.success_rate, 4),
+            "busy_ratio": round(self.busy_ratio, 4),
             "timestamp": self.timestamp.isoformat()
         }
 
@@ -103,44 +243,311 @@ class BenchmarkResults:
 class PerformanceMonitor:
     """Monitor and aggregate performance metrics."""
     
-    def __init__(self):
+    def __init__(self, fast: bool = False, keep_raw: bool = True):
         self.metrics: list[PerformanceMetrics] = []
-        self._lock = asyncio.Lock()
+        # operation -> metrics, maintained on record() so lookups skip the full scan
+        self._by_op: dict[str, list[PerformanceMetrics]] = defaultdict(list)
+        
+        # Fast mode keeps only durations and outcomes per operation (no
+        # PerformanceMetrics objects, timestamps or metadata)
+        self.fast = fast
+        self._dur: dict[str, list[float]] = defaultdict(list)
+        self._ok: dict[str, list[bool]] = defaultdict(list)
+        
+        # Without raw samples only per-operation RunningStats are kept:
+        # constant memory, approximate (~1%) percentiles
+        self.keep_raw = keep_raw
+        self._stats: dict[str, RunningStats] = defaultdict(RunningStats)
+        
+        # (operation, percentile) -> (sample count when computed, value); samples
+        # are append-only, so an unchanged count means the value is still valid
+        self._pct_cache: dict[tuple[str, float], tuple[int, float]] = {}
+    
+    def record(self, metric: PerformanceMetrics) -> None:
+        """
+        Record performance metric.
+        Synchronous and lock-free: nothing here awaits, so the event loop
+        already serializes concurrent recorders.
+        """
+        if not self.keep_raw:
+            self._stats[metric.operation].add(metric.duration_ms, metric.success)
+            return
+        self.metrics.append(metric)
+        self._by_op[metric.operation].append(metric)
+    
+    def record_fast(self, operation: str, duration_ms: float, success: bool) -> None:
+        """Record just duration and outcome (fast mode)."""
+        if not self.keep_raw:
+            self._stats[operation].add(duration_ms, success)
+            return
+        self._dur[operation].append(duration_ms)
+        self._ok[operation].append(success)
     
-    async def record(self, metric: PerformanceMetrics) -> None:
-        """Record performance metric."""
-        async with self._lock:
-            self.metrics.append(metric)
+    def fast_recorder(self, operation: str) -> Callable[[float, bool], None] | None:
+        """
+        (duration_ms, success) record callable for operation with its storage
+        already resolved, or None when full PerformanceMetrics are kept.
+        """
+        if not self.keep_raw:
+            return self._stats[operation].add
+        if not self.fast:
+            return None
+        
+        append_duration = self._dur[operation].append
+        append_outcome = self._ok[operation].append
+        
+        def record(duration_ms: float, success: bool) -> None:
+            append_duration(duration_ms)
+            append_outcome(success)
+        
+        return record
     
     def get_metrics_by_operation(self, operation: str) -> list[PerformanceMetrics]:
-        """Get all metrics for specific operation."""
-        return [m for m in self.metrics if m.operation == operation]
+        """Get all metrics for specific operation (empty without raw samples)."""
+        return self._by_op.get(operation, [])
+    
+    def get_durations(self, operation: str) -> tuple[np.ndarray, int]:
+        """Durations (ms) as a float64 array plus the success count, in either raw mode."""
+        if self.fast:
+            durations = self._dur.get(operation, ())
+            return np.asarray(durations, dtype=np.float64), sum(self._ok.get(operation, ()))
+        
+        metrics = self._by_op.get(operation, ())
+        durations = np.fromiter((m.duration_ms for m in metrics), dtype=np.float64, count=len(metrics))
+        return durations, sum(1 for m in metrics if m.success)
+    
+    def summarize(
+        self,
+        operation: str
+    ) -> tuple[int, int, tuple[float, float, float, float, float, float, float] | None]:
+        """
+        Sample count, success count and (min, max, mean, median, p95, p99,
+        stddev) for operation; the stats are None when nothing was recorded.
+        Exact from raw samples, otherwise read from the running stats.
+        """
+        if not self.keep_raw:
+            stats = self._stats.get(operation)
+            if stats is None or not stats.count:
+                return 0, 0, None
+            return stats.count, stats.successes, stats.summary()
+        
+        durations, successes = self.get_durations(operation)
+        if not durations.size:
+            return 0, 0, None
+        return durations.size, successes, _compute_stats(durations)
+    
+    def _sample_count(self, operation: str) -> int:
+        """Samples recorded for operation so far, in any mode."""
+        if not self.keep_raw:
+            stats = self._stats.get(operation)
+            return stats.count if stats is not None else 0
+        if self.fast:
+            return len(self._dur.get(operation, ()))
+        return len(self._by_op.get(operation, ()))
     
     def calculate_percentile(
         self,
         operation: str,
-        percentile: float
-    ) -> float:
-        """Calculate percentile latency for operation."""
-        metrics = self.get_metrics_by_operation(operation)
-        if not metrics:
-            return 0.0
-        
-        durations = sorted([m.duration_ms for m in metrics])
-        index = int(len(durations) * percentile / 100)
-        return durations[min(index, len(durations) - 1)]
+        percentiles: Sequence[float]
+    ) -> dict[float, float]:
+        """
+        Calculate several percentile latencies for operation with one partition.
+        Values are cached until more samples for operation are recorded.
+        """
+        n = self._sample_count(operation)
+        if not n:
+            return {p: 0.0 for p in percentiles}
+        
+        cache = self._pct_cache
+        result: dict[float, float] = {}
+        missing: list[float] = []
+        for p in percentiles:
+            cached = cache.get((operation, p))
+            if cached is not None and cached[0] == n:
+                result[p] = cached[1]
+            else:
+                missing.append(p)
+        
+        if missing:
+            if self.keep_raw:
+                durations, _ = self.get_durations(operation)
+                values = _select_percentiles(durations, missing)
+            else:
+                values = self._stats[operation].percentiles(missing)
+            for p, value in zip(missing, values):
+                cache[(operation, p)] = (n, value)
+                result[p] = value
+        
+        return {p: result[p] for p in percentiles}
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ORCHESTRATION BENCHMARKS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+async def _run_bounded(
+    n: int,
+    coro_factory: Callable[[int], Coroutine[Any, Any, Any]],
+    concurrency: int = 256
+) -> None:
+    """
+    Run coro_factory(0..n-1) on at most `concurrency` worker tasks.
+    Workers pull indices from a shared counter, so only the workers need
+    Futures (not one per operation) and no result list is built.
+    """
+    counter = itertools.count()
+    
+    async def worker() -> None:
+        while (i := next(counter)) < n:
+            await coro_factory(i)
+    
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(min(n, concurrency)):
+            tg.create_task(worker())
+
+
+class _TimedOperation:
+    """One operation timed by an _OperationTimer."""
+    
+    __slots__ = ("_timer", "_op_id", "start", "elapsed_ms")
+    
+    def __init__(self, timer: _OperationTimer, op_id: int):
+        self._timer = timer
+        self._op_id = op_id
+        self.elapsed_ms = 0.0
+    
+    def __enter__(self) -> _TimedOperation:
+        self.start = self._timer.clock()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        timer = self._timer
+        end = timer.clock()
+        self.elapsed_ms = (end - self.start) * 1000
+        if exc is None:
+            timer.record_success(self.elapsed_ms, end)
+            return False
+        if not isinstance(exc, Exception):
+            return False  # cancellation and interrupts propagate
+        timer.record_failure(
+            self.elapsed_ms, end, error=str(exc), **{timer.id_key: self._op_id}, **timer.metadata
+        )
+        return True
+
+
+class _OperationTimer:
+    """
+    Per-benchmark timing factory: `with timer(op_id) as t:` times one
+    operation on the loop clock and records it on exit. An Exception is
+    recorded as a failure (error, op id and the benchmark's constant
+    metadata) and suppressed; successes take the metadata-free path.
+    """
+    
+    __slots__ = ("clock", "record_success", "record_failure", "id_key", "metadata")
+    
+    def __init__(
+        self,
+        clock: Callable[[], float],
+        recorders: tuple[Callable[[float, float], None], Callable[..., None]],
+        id_key: str,
+        metadata: dict[str, Any]
+    ):
+        self.clock = clock
+        self.record_success, self.record_failure = recorders
+        self.id_key = id_key
+        self.metadata = metadata
+    
+    def __call__(self, op_id: int) -> _TimedOperation:
+        return _TimedOperation(self, op_id)
+
+
 class OrchestrationBenchmark:
     """Benchmark suite for orchestration performance."""
     
-    def __init__(self, monitor: PerformanceMonitor):
+    # Process RSS sampling period while a benchmark runs (100 Hz)
+    MEMORY_SAMPLE_INTERVAL = 0.01
+    
+    def __init__(self, monitor: PerformanceMonitor, log: Any = None):
         self.monitor = monitor
-        self.memory_samples: list[float] = []
+        self._log = log or logger
+    
+    @contextlib.asynccontextmanager
+    async def _sampling_memory(self):
+        """
+        Sample process RSS (MB) while the body runs, into a buffer of raw
+        doubles (not one float object each) owned by that one benchmark, so
+        benchmarks running concurrently never mix their samples.
+        """
+        samples = array.array("d")
+        memory_info = psutil.Process().memory_info
+        interval = self.MEMORY_SAMPLE_INTERVAL
+        
+        async def sample() -> None:
+            while True:
+                samples.append(memory_info().rss / _BYTES_PER_MB)
+                await asyncio.sleep(interval)
+        
+        sampler = asyncio.create_task(sample())
+        try:
+            yield samples
+        finally:
+            sampler.cancel()
+            # Always at least one sample, taken after the workload ran
+            samples.append(memory_info().rss / _BYTES_PER_MB)
+    
+    def _record(
+        self,
+        operation: str,
+        duration_ms: float,
+        success: bool,
+        timestamp: float,
+        **metadata: Any
+    ) -> None:
+        """
+        Record one operation, skipping the metric object entirely in fast mode.
+        timestamp is the loop.time() reading that ended the operation, reused
+        as the metric's monotonic stamp. Runs once per operation: keep it free
+        of logging.
+        """
+        if self.monitor.fast:
+            self.monitor.record_fast(operation, duration_ms, success)
+        else:
+            self.monitor.record(PerformanceMetrics(
+                operation=operation,
+                duration_ms=duration_ms,
+                success=success,
+                timestamp=timestamp,
+                metadata=metadata
+            ))
+    
+    def _recorders(self, operation: str) -> tuple[Callable[[float, float], None], Callable[..., None]]:
+        """
+        record_success(duration_ms, timestamp) and
+        record_failure(duration_ms, timestamp, **metadata) for one benchmark.
+        Storage is resolved once up front. Successes carry no metadata, so the
+        happy path allocates no dict; failures keep the full metric record.
+        """
+        fast = self.monitor.fast_recorder(operation)
+        if fast is None:
+            monitor = self.monitor
+            
+            def record_success(duration_ms: float, timestamp: float) -> None:
+                monitor.record(PerformanceMetrics(operation, duration_ms, True, timestamp))
+            
+            def record_failure(duration_ms: float, timestamp: float, **metadata: Any) -> None:
+                self._record(operation, duration_ms, False, timestamp, **metadata)
+        else:
+            def record_success(duration_ms: float, timestamp: float) -> None:
+                fast(duration_ms, True)
+            
+            def record_failure(duration_ms: float, timestamp: float, **metadata: Any) -> None:
+                fast(duration_ms, False)
+        
+        return record_success, record_failure
+    
+    def _op_timer(self, operation: str, id_key: str, **metadata: Any) -> _OperationTimer:
+        """Timing context factory for one benchmark (see _OperationTimer)."""
+        return _OperationTimer(asyncio.get_running_loop().time, self._recorders(operation), id_key, metadata)
     
     async def benchmark_workflow_execution(
         self,
@@ -156,68 +563,38 @@ class OrchestrationBenchmark:
         - State transitions
         - Resource allocation
         """
-        logger.info(
+        self._log.info(
             "benchmark_workflow_execution_start",
             num_workflows=num_workflows,
             steps_per_workflow=steps_per_workflow
         )
         
-        start_time = time.time()
+        timed = self._op_timer("workflow_execution", "workflow_id", steps=steps_per_workflow)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         # Simulate workflow execution
         async def execute_workflow(workflow_id: int) -> float:
-            workflow_start = time.time()
-            
-            try:
-                # Simulate workflow execution
-                for step_id in range(steps_per_workflow):
-                    # Simulate step processing
-                    await asyncio.sleep(0.01)  # 10ms per step
-                
-                elapsed = (time.time() - workflow_start) * 1000  # ms
-                
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="workflow_execution",
-                        duration_ms=elapsed,
-                        success=True,
-                        metadata={
-                            "workflow_id": workflow_id,
-                            "steps": steps_per_workflow
-                        }
-                    )
-                )
-                
-                return elapsed
-                
-            except Exception as e:
-                elapsed = (time.time() - workflow_start) * 1000
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="workflow_execution",
-                        duration_ms=elapsed,
-                        success=False,
-                        metadata={"error": str(e)}
-                    )
-                )
-                return elapsed
+            with timed(workflow_id) as t:
+                # Simulate step processing: 10ms per step, as one timer
+                await asyncio.sleep(0.01 * steps_per_workflow)
+            return t.elapsed_ms
         
         # Run workflows concurrently
-        tasks = [
-            execute_workflow(i)
-            for i in range(num_workflows)
-        ]
-        
-        await asyncio.gather(*tasks)
+        async with self._sampling_memory() as memory:
+            await _run_bounded(num_workflows, execute_workflow)
         
-        total_time = time.time() - start_time
-        metrics = self.monitor.get_metrics_by_operation("workflow_execution")
+        total_time = loop.time() - start_time
+        count, successful, stats = self.monitor.summarize("workflow_execution")
         
         return self._compile_results(
             "workflow_execution",
-            metrics,
+            count,
+            successful,
+            stats,
             total_time,
-            num_workflows
+            num_workflows,
+            memory
         )
     
     async def benchmark_state_transitions(
@@ -234,68 +611,41 @@ class OrchestrationBenchmark:
         - Callback execution
         - History maintenance
         """
-        logger.info(
+        self._log.info(
             "benchmark_state_transitions_start",
             num_transitions=num_transitions,
             guard_complexity=guard_complexity
         )
         
-        start_time = time.time()
+        timed = self._op_timer("state_transition", "transition_id", complexity=guard_complexity)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        
+        # Guard evaluation cost: 0.1ms simple, 1ms complex
+        guard_s = {"simple": 0.0001, "complex": 0.001}.get(guard_complexity, 0.0)
         
         # Simulate state transitions
         async def perform_transition(transition_id: int) -> float:
-            trans_start = time.time()
-            
-            try:
-                # Simulate guard evaluation
-                if guard_complexity == "simple":
-                    await asyncio.sleep(0.0001)  # 0.1ms
-                elif guard_complexity == "complex":
-                    await asyncio.sleep(0.001)   # 1ms
-                
-                # Simulate callback execution
-                await asyncio.sleep(0.0005)  # 0.5ms
-                
-                elapsed = (time.time() - trans_start) * 1000
-                
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="state_transition",
-                        duration_ms=elapsed,
-                        success=True,
-                        metadata={
-                            "transition_id": transition_id,
-                            "complexity": guard_complexity
-                        }
-                    )
-                )
-                
-                return elapsed
-                
-            except Exception as e:
-                elapsed = (time.time() - trans_start) * 1000
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="state_transition",
-                        duration_ms=elapsed,
-                        success=False,
-                        metadata={"error": str(e)}
-                    )
-                )
-                return elapsed
+            with timed(transition_id) as t:
+                # Simulate guard evaluation plus 0.5ms callback execution
+                await asyncio.sleep(guard_s + 0.0005)
+            return t.elapsed_ms
         
         # Run transitions concurrently
-        tasks = [perform_transition(i) for i in range(num_transitions)]
-        await asyncio.gather(*tasks)
+        async with self._sampling_memory() as memory:
+            await _run_bounded(num_transitions, perform_transition)
         
-        total_time = time.time() - start_time
-        metrics = self.monitor.get_metrics_by_operation("state_transition")
+        total_time = loop.time() - start_time
+        count, successful, stats = self.monitor.summarize("state_transition")
         
         return self._compile_results(
             "state_transitions",
-            metrics,
+            count,
+            successful,
+            stats,
             total_time,
-            num_transitions
+            num_transitions,
+            memory
         )
     
     async def benchmark_threat_detection(
@@ -312,68 +662,41 @@ class OrchestrationBenchmark:
         - Response workflow initiation
         - Incident logging
         """
-        logger.info(
+        self._log.info(
             "benchmark_threat_detection_start",
             num_threats=num_threats,
             pattern_complexity=pattern_complexity
         )
         
-        start_time = time.time()
+        timed = self._op_timer("threat_detection", "threat_id", complexity=pattern_complexity)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        
+        # Pattern matching cost: 1ms simple, 5ms complex
+        pattern_s = {"simple": 0.001, "complex": 0.005}.get(pattern_complexity, 0.0)
         
         # Simulate threat detection
         async def detect_threat(threat_id: int) -> float:
-            detect_start = time.time()
-            
-            try:
-                # Simulate pattern matching
-                if pattern_complexity == "simple":
-                    await asyncio.sleep(0.001)   # 1ms
-                elif pattern_complexity == "complex":
-                    await asyncio.sleep(0.005)   # 5ms
-                
-                # Simulate incident logging
-                await asyncio.sleep(0.0005)  # 0.5ms
-                
-                elapsed = (time.time() - detect_start) * 1000
-                
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="threat_detection",
-                        duration_ms=elapsed,
-                        success=True,
-                        metadata={
-                            "threat_id": threat_id,
-                            "complexity": pattern_complexity
-                        }
-                    )
-                )
-                
-                return elapsed
-                
-            except Exception as e:
-                elapsed = (time.time() - detect_start) * 1000
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="threat_detection",
-                        duration_ms=elapsed,
-                        success=False,
-                        metadata={"error": str(e)}
-                    )
-                )
-                return elapsed
+            with timed(threat_id) as t:
+                # Simulate pattern matching plus 0.5ms incident logging
+                await asyncio.sleep(pattern_s + 0.0005)
+            return t.elapsed_ms
         
         # Run threat detection
-        tasks = [detect_threat(i) for i in range(num_threats)]
-        await asyncio.gather(*tasks)
+        async with self._sampling_memory() as memory:
+            await _run_bounded(num_threats, detect_threat)
         
-        total_time = time.time() - start_time
-        metrics = self.monitor.get_metrics_by_operation("threat_detection")
+        total_time = loop.time() - start_time
+        count, successful, stats = self.monitor.summarize("threat_detection")
         
         return self._compile_results(
             "threat_detection",
-            metrics,
+            count,
+            successful,
+            stats,
             total_time,
-            num_threats
+            num_threats,
+            memory
         )
     
     async def benchmark_concurrent_orchestration(
@@ -390,47 +713,22 @@ class OrchestrationBenchmark:
         - Resource contention
         - Scaling characteristics
         """
-        logger.info(
+        self._log.info(
             "benchmark_concurrent_orchestration_start",
             num_agents=num_concurrent_agents,
             ops_per_agent=operations_per_agent
         )
         
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         # Simulate concurrent agent operations
         async def agent_operations(agent_id: int) -> None:
+            timed = self._op_timer("concurrent_operation", "operation_id", agent_id=agent_id)
             for op_id in range(operations_per_agent):
-                op_start = time.time()
-                
-                try:
+                with timed(op_id):
                     # Simulate agent processing with contention
                     await asyncio.sleep(0.001)  # 1ms operation
-                    
-                    elapsed = (time.time() - op_start) * 1000
-                    
-                    await self.monitor.record(
-                        PerformanceMetrics(
-                            operation="concurrent_operation",
-                            duration_ms=elapsed,
-                            success=True,
-                            metadata={
-                                "agent_id": agent_id,
-                                "operation_id": op_id
-                            }
-                        )
-                    )
-                    
-                except Exception as e:
-                    elapsed = (time.time() - op_start) * 1000
-                    await self.monitor.record(
-                        PerformanceMetrics(
-                            operation="concurrent_operation",
-                            duration_ms=elapsed,
-                            success=False,
-                            metadata={"error": str(e)}
-                        )
-                    )
         
         # Run concurrent agents
         tasks = [
@@ -438,17 +736,21 @@ class OrchestrationBenchmark:
             for i in range(num_concurrent_agents)
         ]
         
-        await asyncio.gather(*tasks)
+        async with self._sampling_memory() as memory:
+            await asyncio.gather(*tasks)
         
-        total_time = time.time() - start_time
+        total_time = loop.time() - start_time
         total_ops = num_concurrent_agents * operations_per_agent
-        metrics = self.monitor.get_metrics_by_operation("concurrent_operation")
+        count, successful, stats = self.monitor.summarize("concurrent_operation")
         
         return self._compile_results(
             "concurrent_orchestration",
-            metrics,
+            count,
+            successful,
+            stats,
             total_time,
-            total_ops
+            total_ops,
+            memory
         )
     
     async def benchmark_rollback_performance(
@@ -465,74 +767,52 @@ class OrchestrationBenchmark:
         - Cleanup operations
         - Error recovery
         """
-        logger.info(
+        self._log.info(
             "benchmark_rollback_performance_start",
             num_rollbacks=num_rollbacks,
             workflow_depth=workflow_depth
         )
         
-        start_time = time.time()
+        timed = self._op_timer("rollback", "rollback_id", steps=workflow_depth)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         # Simulate rollback operations
         async def perform_rollback(rollback_id: int) -> float:
-            rollback_start = time.time()
-            
-            try:
-                # Simulate rolling back multiple steps
-                for step in range(workflow_depth):
-                    await asyncio.sleep(0.002)  # 2ms per rollback step
-                
-                elapsed = (time.time() - rollback_start) * 1000
-                
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="rollback",
-                        duration_ms=elapsed,
-                        success=True,
-                        metadata={
-                            "rollback_id": rollback_id,
-                            "steps": workflow_depth
-                        }
-                    )
-                )
-                
-                return elapsed
-                
-            except Exception as e:
-                elapsed = (time.time() - rollback_start) * 1000
-                await self.monitor.record(
-                    PerformanceMetrics(
-                        operation="rollback",
-                        duration_ms=elapsed,
-                        success=False,
-                        metadata={"error": str(e)}
-                    )
-                )
-                return elapsed
+            with timed(rollback_id) as t:
+                # Simulate rolling back multiple steps: 2ms each, as one timer
+                await asyncio.sleep(0.002 * workflow_depth)
+            return t.elapsed_ms
         
         # Run rollbacks
-        tasks = [perform_rollback(i) for i in range(num_rollbacks)]
-        await asyncio.gather(*tasks)
+        async with self._sampling_memory() as memory:
+            await _run_bounded(num_rollbacks, perform_rollback)
         
-        total_time = time.time() - start_time
-        metrics = self.monitor.get_metrics_by_operation("rollback")
+        total_time = loop.time() - start_time
+        count, successful, stats = self.monitor.summarize("rollback")
         
         return self._compile_results(
             "rollback_performance",
-            metrics,
+            count,
+            successful,
+            stats,
             total_time,
-            num_rollbacks
+            num_rollbacks,
+            memory
         )
     
     def _compile_results(
         self,
         benchmark_name: str,
-        metrics: list[PerformanceMetrics],
+        count: int,
+        successful: int,
+        stats: tuple[float, float, float, float, float, float, float] | None,
         total_time: float,
-        num_operations: int
+        num_operations: int,
+        memory_samples: Sequence[float]
     ) -> BenchmarkResults:
-        """Compile benchmark results from metrics."""
-        if not metrics:
+        """Compile benchmark results from PerformanceMonitor.summarize() output and its memory samples."""
+        if stats is None:
             return BenchmarkResults(
                 benchmark_name=benchmark_name,
                 total_operations=num_operations,
@@ -551,26 +831,26 @@ class OrchestrationBenchmark:
                 success_rate=0
             )
         
-        durations = [m.duration_ms for m in metrics]
-        successful = sum(1 for m in metrics if m.success)
-        failed = len(metrics) - successful
+        failed = count - successful
+        min_ms, max_ms, mean_ms, median_ms, p95_ms, p99_ms, stdev_ms = stats
         
         return BenchmarkResults(
             benchmark_name=benchmark_name,
             total_operations=num_operations,
             successful_operations=successful,
             failed_operations=failed,
-            min_latency_ms=min(durations),
-            max_latency_ms=max(durations),
-            mean_latency_ms=statistics.mean(durations),
-            median_latency_ms=statistics.median(durations),
-            p95_latency_ms=self._percentile(durations, 95),
-            p99_latency_ms=self._percentile(durations, 99),
-            stddev_latency_ms=statistics.stdev(durations) if len(durations) > 1 else 0,
+            min_latency_ms=min_ms,
+            max_latency_ms=max_ms,
+            mean_latency_ms=mean_ms,
+            median_latency_ms=median_ms,
+            p95_latency_ms=p95_ms,
+            p99_latency_ms=p99_ms,
+            stddev_latency_ms=stdev_ms,
             operations_per_second=num_operations / total_time,
-            peak_memory_mb=0,  # TODO: Implement memory tracking
-            average_memory_mb=0,  # TODO: Implement memory tracking
-            success_rate=successful / num_operations if num_operations > 0 else 0
+            peak_memory_mb=max(memory_samples) if memory_samples else 0,
+            average_memory_mb=sum(memory_samples) / len(memory_samples) if memory_samples else 0,
+            success_rate=successful / num_operations if num_operations > 0 else 0,
+            busy_ratio=mean_ms * count / 1000 / total_time if total_time > 0 else 0
         )
     
     @staticmethod
@@ -578,9 +858,7 @@ class OrchestrationBenchmark:
         """Calculate percentile value."""
         if not data:
             return 0.0
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
+        return _select_percentiles(np.asarray(data, dtype=np.float64), (percentile,))[0]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -590,66 +868,72 @@ class OrchestrationBenchmark:
 class BenchmarkRunner:
     """Execute full benchmark suite and generate report."""
     
-    def __init__(self):
+    def __init__(self, quiet: bool = False):
+        self._log = _QUIET_LOGGER if quiet else logger
         self.monitor = PerformanceMonitor()
-        self.benchmark = OrchestrationBenchmark(self.monitor)
+        self.benchmark = OrchestrationBenchmark(self.monitor, self._log)
         self.results: list[BenchmarkResults] = []
     
-    async def run_full_suite(self) -> list[BenchmarkResults]:
-        """Run complete benchmark suite."""
-        logger.info("benchmark_suite_start")
-        
-        start_time = datetime.now(UTC)
-        
-        # Run all benchmarks
-        results = []
-        
-        logger.info("running_workflow_execution_benchmark")
-        results.append(
-            await self.benchmark.benchmark_workflow_execution(
-                num_workflows=100,
-                steps_per_workflow=5
-            )
-        )
+    async def run_full_suite(self, parallel: bool = True) -> list[BenchmarkResults]:
+        """
+        Run complete benchmark suite.
         
-        logger.info("running_state_transitions_benchmark")
-        results.append(
-            await self.benchmark.benchmark_state_transitions(
-                num_transitions=1000,
-                guard_complexity="simple"
-            )
-        )
+        The benchmarks share nothing but the monitor, where each reads only
+        its own operation, so by default they run concurrently and the suite
+        takes max(t_i) rather than sum(t_i). Pass parallel=False to give each
+        benchmark the event loop to itself.
+        """
+        self._log.info("benchmark_suite_start", parallel=parallel)
         
-        logger.info("running_threat_detection_benchmark")
-        results.append(
-            await self.benchmark.benchmark_threat_detection(
-                num_threats=500,
-                pattern_complexity="simple"
-            )
-        )
+        start_time = datetime.now(UTC)
         
-        logger.info("running_concurrent_orchestration_benchmark")
-        results.append(
-            await self.benchmark.benchmark_concurrent_orchestration(
-                num_concurrent_agents=10,
-                operations_per_agent=100
-            )
-        )
+        # Coroutines only start when awaited, so the sequential path still
+        # runs one benchmark at a time
+        benchmarks = [
+            ("running_workflow_execution_benchmark",
+             self.benchmark.benchmark_workflow_execution(
+                 num_workflows=100,
+                 steps_per_workflow=5
+             )),
+            ("running_state_transitions_benchmark",
+             self.benchmark.benchmark_state_transitions(
+                 num_transitions=1000,
+                 guard_complexity="simple"
+             )),
+            ("running_threat_detection_benchmark",
+             self.benchmark.benchmark_threat_detection(
+                 num_threats=500,
+                 pattern_complexity="simple"
+             )),
+            ("running_concurrent_orchestration_benchmark",
+             self.benchmark.benchmark_concurrent_orchestration(
+                 num_concurrent_agents=10,
+                 operations_per_agent=100
+             )),
+            ("running_rollback_performance_benchmark",
+             self.benchmark.benchmark_rollback_performance(
+                 num_rollbacks=100,
+                 workflow_depth=10
+             )),
+        ]
         
-        logger.info("running_rollback_performance_benchmark")
-        results.append(
-            await self.benchmark.benchmark_rollback_performance(
-                num_rollbacks=100,
-                workflow_depth=10
-            )
-        )
+        # Run all benchmarks
+        if parallel:
+            for event, _ in benchmarks:
+                self._log.info(event)
+            results = list(await asyncio.gather(*(coro for _, coro in benchmarks)))
+        else:
+            results = []
+            for event, coro in benchmarks:
+                self._log.info(event)
+                results.append(await coro)
         
         self.results = results
         
         end_time = datetime.now(UTC)
         duration = (end_time - start_time).total_seconds()
         
-        logger.info(
+        self._log.info(
             "benchmark_suite_complete",
             num_benchmarks=len(results),
             total_duration_seconds=duration
@@ -659,19 +943,26 @@ class BenchmarkRunner:
     
     def generate_report(self) -> dict[str, Any]:
         """Generate benchmark report."""
+        # Summary means: exact float sums, no statistics-module dispatch
+        n = len(self.results)
+        throughput = math.fsum(r.operations_per_second for r in self.results)
+        latency = math.fsum(r.mean_latency_ms for r in self.results)
+        success = math.fsum(r.success_rate for r in self.results)
+        
         return {
             "timestamp": datetime.now(UTC).isoformat(),
-            "total_benchmarks": len(self.results),
+            "total_benchmarks": n,
             "benchmarks": [r.to_dict() for r in self.results],
             "summary": {
-                "avg_throughput_ops_per_sec": statistics.mean(
-                    r.operations_per_second for r in self.results
-                ) if self.results else 0,
-                "avg_latency_ms": statistics.mean(
-                    r.mean_latency_ms for r in self.results
-                ) if self.results else 0,
-                "overall_success_rate": statistics.mean(
-                    r.success_rate for r in self.results
-                ) if self.results else 0
+                "avg_throughput_ops_per_sec": throughput / n if n else 0,
+                "avg_latency_ms": latency / n if n else 0,
+                "overall_success_rate": success / n if n else 0
             }
         }
+    
+    def report_bytes(self) -> bytes:
+        """Benchmark report serialized as JSON bytes (via orjson)."""
+        return orjson.dumps(
+            self.generate_report(),
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
@@ -11,14 +11,21 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import heapq
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from enum import Enum, auto
-from functools import lru_cache
-from typing import Any, TypeVar, Generic
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Final, Mapping, TypeVar, Generic
 
+import aiohttp
+import orjson
+import psutil
 import structlog
 
 # Configure structured logging
@@ -27,19 +34,21 @@ import yaml
 import os
 
 from .discovery import get_discovery_service
-from .metrics import get_metrics_exporter
+from .log_utils import logger_enabled_for
+from .metrics import AgentMetrics, AgentType, SwarmMetrics, get_metrics_exporter
+
+# libyaml's C loader when PyYAML was built with it (same safe subset)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 # Load logging configuration
 log_config_path = "/etc/prometheus/logging.yml"
 if os.path.exists(log_config_path):
-    with open(log_config_path, 'r') as f:
-        log_config = yaml.safe_load(f)
+    with open(log_config_path, 'rb') as f:
+        log_config = yaml.load(f, Loader=_YAML_LOADER)
         logging.config.dictConfig(log_config)
 
 logger = structlog.get_logger(__name__)
 
-logger = structlog.get_logger(__name__)
-
 # ═══════════════════════════════════════════════════════════════════════════════
 # MNEMONIC CACHE — O(1) Recall System
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -51,40 +60,80 @@ class MnemonicCache:
     """
 
     def __init__(self, max_size: int = 10_000):
-        self._cache: dict[str, tuple[Any, float, int]] = {}  # key -> (value, timestamp, priority)
+        # key -> (value, monotonic timestamp, priority), least recently touched first
+        self._cache: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        # priority -> keys in that priority, least recently touched first;
+        # empty buckets are dropped so eviction only looks at live priorities
+        self._buckets: dict[int, OrderedDict[str, None]] = {}
+        # min-heap of priorities that have had a bucket; a priority whose bucket
+        # has since emptied is discarded lazily when it reaches the top
+        self._priority_heap: list[int] = []
+        self._heaped: set[int] = set()
         self._max_size = max_size
-        self._access_log: list[str] = []
+        # Key digests for debug events are only computed when they would be emitted
+        self._log_debug = logger_enabled_for(logger, logging.DEBUG)
 
     def store(self, key: str, value: Any, priority: int = 1) -> None:
         """Store with O(1) insertion, automatic eviction on overflow."""
-        if len(self._cache) >= self._max_size:
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._unindex(key, entry[2])
+        elif len(self._cache) >= self._max_size:
             self._evict_lowest_priority()
 
-        self._cache[key] = (value, datetime.now(UTC).timestamp(), priority)
-        logger.debug("mnemonic_store", key=self._hash_key(key), priority=priority)
+        self._cache[key] = (value, time.monotonic(), priority)
+        self._cache.move_to_end(key)
+        self._index(key, priority)
+        if self._log_debug:
+            logger.debug("mnemonic_store", key=self._hash_key(key), priority=priority)
 
     def recall(self, key: str) -> Any | None:
         """O(1) recall with priority boost on access."""
-        if key in self._cache:
-            value, ts, priority = self._cache[key]
-            # Boost priority on recall (reinforcement learning signal)
-            self._cache[key] = (value, datetime.now(UTC).timestamp(), min(priority + 1, 10))
-            self._access_log.append(key)
-            return value
-        return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        value, ts, priority = entry
+        # Boost priority on recall (reinforcement learning signal)
+        boosted = min(priority + 1, 10)
+        self._unindex(key, priority)
+        self._index(key, boosted)
+        self._cache[key] = (value, time.monotonic(), boosted)
+        self._cache.move_to_end(key)
+        return value
+
+    def _index(self, key: str, priority: int) -> None:
+        """Append key to the most-recent end of its priority bucket."""
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = OrderedDict()
+            if priority not in self._heaped:
+                self._heaped.add(priority)
+                heapq.heappush(self._priority_heap, priority)
+        bucket[key] = None
+
+    def _unindex(self, key: str, priority: int) -> None:
+        bucket = self._buckets[priority]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[priority]
 
     def _evict_lowest_priority(self) -> None:
-        """Evict oldest low-priority entries."""
-        if not self._cache:
+        """Evict the oldest entry of the lowest priority."""
+        if not self._buckets:
             return
 
-        # Find lowest priority, oldest entry
-        evict_key = min(
-            self._cache.keys(),
-            key=lambda k: (self._cache[k][2], -self._cache[k][1])  # (priority, -timestamp)
-        )
+        heap = self._priority_heap
+        while heap[0] not in self._buckets:
+            self._heaped.discard(heapq.heappop(heap))
+        priority = heap[0]
+        bucket = self._buckets[priority]
+        evict_key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[priority]
         del self._cache[evict_key]
-        logger.debug("mnemonic_evict", key=self._hash_key(evict_key))
+        if self._log_debug:
+            logger.debug("mnemonic_evict", key=self._hash_key(evict_key))
 
     @staticmethod
     def _hash_key(key: str) -> str:
@@ -108,16 +157,29 @@ class AgentRole(Enum):
     STREAM = auto()      # Traffic analysis & flow control
     OMNISCIENT = auto()  # Global awareness & monitoring
 
+    lname: str  # lower-cased name, set once below
+
+
+# Lower-cased names (agent ids, metric labels, discovery types) computed once
+for _role in AgentRole:
+    _role.lname = _role.name.lower()
+del _role
+
 
 @dataclass
 class AgentState:
     """Immutable agent state snapshot."""
     role: AgentRole
     active: bool = True
-    task_queue: list[str] = field(default_factory=list)
+    task_queue: asyncio.Queue[str] = field(default_factory=asyncio.Queue)
     last_action: datetime = field(default_factory=lambda: datetime.now(UTC))
     performance_score: float = 1.0
     mnemonic_keys: list[str] = field(default_factory=list)
+    # Counters read by the orchestrator's metrics loop
+    current_task: str | None = None
+    tasks_completed: int = 0
+    tasks_failed: int = 0
+    active_since: float = field(default_factory=time.monotonic)
 
 
 class EliteAgent(ABC):
@@ -138,6 +200,10 @@ class EliteAgent(ABC):
         self.state = AgentState(role=role)
         self._running = False
         self._task_handlers: dict[str, Callable[..., Coroutine[Any, Any, Any]]] = {}
+        # Metric labels, fixed for the agent's lifetime
+        self._metric_label = f"agent-{role.lname}"
+        self._metric_type = AgentType(role.lname)
+        self._log_debug = logger_enabled_for(logger, logging.DEBUG)
 
         logger.info("agent_initialized", role=role.name)
 
@@ -153,13 +219,13 @@ class EliteAgent(ABC):
 
         while self._running:
             try:
-                # Check for pending tasks
-                if self.state.task_queue:
-                    task = self.state.task_queue.pop(0)
-                    await self._process_task(task)
-
-                # Autonomous scanning interval
-                await asyncio.sleep(0.1)
+                # Sleep until a task arrives; the timeout only bounds how long
+                # a stop() or state reset goes unnoticed
+                try:
+                    task = await asyncio.wait_for(self.state.task_queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                await self._process_task(task)
 
             except Exception as e:
                 logger.error("agent_loop_error", role=self.role.name, error=str(e))
@@ -169,14 +235,24 @@ class EliteAgent(ABC):
         """Process queued task with mnemonic recall."""
         # Check mnemonic for similar past tasks
         cached_result = self.mnemonic.recall(f"{self.role.name}:{task}")
-        if cached_result:
+        if cached_result and self._log_debug:
             logger.debug("mnemonic_hit", role=self.role.name, task=task[:50])
 
-        result = await self.execute_mission(task, {"cached": cached_result})
+        self.state.current_task = task
+        try:
+            result = await self.execute_mission(task, {"cached": cached_result})
+        except Exception:
+            self.state.tasks_failed += 1
+            raise
+        finally:
+            self.state.current_task = None
 
         # Store successful patterns
         if result.get("success"):
+            self.state.tasks_completed += 1
             self.mnemonic.store(f"{self.role.name}:{task}", result, priority=2)
+        else:
+            self.state.tasks_failed += 1
 
         self.state.last_action = datetime.now(UTC)
 
@@ -205,14 +281,39 @@ class PhantomOrchestrator:
     Implements ΣLANG directive parsing and ΣVault integration.
     """
 
+    # Event type -> handling agent, built once rather than per event
+    EVENT_ROUTES: Final[Mapping[str, AgentRole]] = MappingProxyType({
+        "threat_detected": AgentRole.FORTRESS,
+        "route_optimization": AgentRole.VELOCITY,
+        "crypto_rotation": AgentRole.CIPHER,
+        "cloak_request": AgentRole.PHANTOM,
+        "deploy_request": AgentRole.NEXUS,
+        "scan_request": AgentRole.AEGIS,
+        "evolution_trigger": AgentRole.GENESIS,
+        "traffic_analysis": AgentRole.STREAM,
+        "global_status": AgentRole.OMNISCIENT,
+        "strategic_decision": AgentRole.APEX,
+    })
+
+    # Put on the event bus by shutdown() to release process_events; matched
+    # by identity, so no broadcast event can stop the processor
+    _SHUTDOWN_EVENT: Final[dict[str, Any]] = {"type": "__shutdown__"}
+
     def __init__(self):
         self.mnemonic = MnemonicCache(max_size=10_000)
         self.agents: dict[AgentRole, EliteAgent] = {}
+        # role -> dispatcher bound to that role's agent, built by spawn_swarm()
+        self._dispatch: dict[AgentRole, Callable[[str, int], None]] = {}
         self.event_bus: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
         self._running = False
         self.metrics_exporter = get_metrics_exporter()
         self._metrics_task: asyncio.Task | None = None
+        # Own-process handle, reused by every metrics tick
+        self._proc = psutil.Process()
         self.discovery_service = get_discovery_service()
+        # Shared by all discovery calls; opened on first use, closed in shutdown()
+        self._http_session: aiohttp.ClientSession | None = None
+        self._log_debug = logger_enabled_for(logger, logging.DEBUG)
 
         logger.info("orchestrator_initialized")
 
@@ -238,44 +339,53 @@ class PhantomOrchestrator:
         }
 
         for role, cls in agent_classes.items():
-            self.agents[role] = cls(role, self, self.mnemonic)
+            agent = self.agents[role] = cls(role, self, self.mnemonic)
+            self._dispatch[role] = partial(self._dispatch_to, agent, f"directive:{role.name}:")
+            logger.info("agent_spawned", role=role.name)
 
-            # Register agent with discovery service
-            agent_id = f"phantom-{role.name.lower()}"
-            await self._register_agent_with_discovery(agent_id, role.name.lower())
+        # Register all agents with the discovery service concurrently over
+        # the shared session: swarm start waits for the slowest, not the sum
+        await asyncio.gather(
+            *(
+                self._register_agent_with_discovery(f"phantom-{role.lname}", role.lname)
+                for role in agent_classes
+            ),
+            return_exceptions=True
+        )
 
-            logger.info("agent_spawned", role=role.name)
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session (one connector, DNS cache and pool) for discovery calls."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        return self._http_session
 
     async def _register_agent_with_discovery(self, agent_id: str, agent_type: str) -> None:
         """Register agent with the discovery service."""
         try:
-            import aiohttp
-
             # Get the metrics server port (assuming it's running on the same host)
             metrics_port = 8000  # Same as the agent swarm metrics port
 
-            async with aiohttp.ClientSession() as session:
-                registration_data = {
-                    "agent_id": agent_id,
-                    "agent_type": agent_type,
-                    "host": "agent-swarm",  # Docker service name
-                    "port": metrics_port
-                }
-
-                # Register with discovery service
-                async with session.post(
-                    "http://discovery:8081/register",
-                    json=registration_data,
-                    timeout=5
-                ) as response:
-                    if response.status == 200:
-                        logger.info("agent_registered_with_discovery",
-                                   agent_id=agent_id,
-                                   agent_type=agent_type)
-                    else:
-                        logger.warning("agent_registration_failed",
-                                     agent_id=agent_id,
-                                     status=response.status)
+            session = self._get_http_session()
+            registration_data = {
+                "agent_id": agent_id,
+                "agent_type": agent_type,
+                "host": "agent-swarm",  # Docker service name
+                "port": metrics_port
+            }
+
+            # Register with discovery service
+            async with session.post(
+                "http://discovery:8081/register",
+                json=registration_data
+            ) as response:
+                if response.status == 200:
+                    logger.info("agent_registered_with_discovery",
+                               agent_id=agent_id,
+                               agent_type=agent_type)
+                else:
+                    logger.warning("agent_registration_failed",
+                                 agent_id=agent_id,
+                                 status=response.status)
 
         except Exception as e:
             logger.error("discovery_registration_error",
@@ -289,23 +399,28 @@ class PhantomOrchestrator:
         priority: int = 1
     ) -> None:
         """Dispatch directive to specific agent."""
-        if target_role in self.agents:
-            agent = self.agents[target_role]
-            agent.state.task_queue.append(directive)
-
-            # Store in mnemonic for pattern learning
-            self.mnemonic.store(
-                f"directive:{target_role.name}:{directive[:50]}",
-                {"timestamp": datetime.now(UTC).isoformat(), "priority": priority},
-                priority=priority
-            )
+        dispatch = self._dispatch.get(target_role)
+        if dispatch is not None:
+            dispatch(directive, priority)
+
+    def _dispatch_to(self, agent: EliteAgent, key_prefix: str, directive: str, priority: int) -> None:
+        """Queue directive on agent; agent and mnemonic key prefix are bound per role."""
+        agent.state.task_queue.put_nowait(directive)
+
+        # Store in mnemonic for pattern learning
+        self.mnemonic.store(
+            key_prefix + directive,
+            {"timestamp": datetime.now(UTC).isoformat(), "priority": priority},
+            priority=priority
+        )
 
-            logger.info("directive_dispatched", target=target_role.name, directive=directive[:100])
+        logger.info("directive_dispatched", target=agent.role.name, directive=directive[:100])
 
     async def broadcast(self, event: dict[str, Any]) -> None:
         """Broadcast event to all agents via event bus."""
         await self.event_bus.put(event)
-        logger.debug("event_broadcast", event_type=event.get("type"))
+        if self._log_debug:
+            logger.debug("event_broadcast", event_type=event.get("type"))
 
     async def request_agent_reset(self, agent: EliteAgent) -> None:
         """Handle agent reset request from degraded agent."""
@@ -315,55 +430,58 @@ class PhantomOrchestrator:
 
     async def _collect_metrics_loop(self) -> None:
         """Periodically collect and update swarm metrics."""
-        import psutil
-        import time
-
         while self._running:
             try:
-                # Collect agent metrics
+                now = time.time()
+                mono_now = time.monotonic()
+
+                # Collect swarm totals and per-agent metrics in one pass
                 total_agents = len(self.agents)
-                active_agents = sum(1 for agent in self.agents.values() if agent.state.is_active)
+                active_agents = tasks_queued = tasks_processing = 0
+                performance_sum = 0.0
+                agent_updates: list[tuple[str, AgentType, AgentMetrics]] = []
+                for agent in self.agents.values():
+                    state = agent.state
+                    if state.active:
+                        active_agents += 1
+                    if state.current_task is not None:
+                        tasks_processing += 1
+                    tasks_queued += state.task_queue.qsize()
+                    performance_sum += state.performance_score
+
+                    agent_updates.append((
+                        agent._metric_label,
+                        agent._metric_type,
+                        AgentMetrics(
+                            tasks_completed=state.tasks_completed,
+                            tasks_failed=state.tasks_failed,
+                            active_time=mono_now - state.active_since if state.active else 0.0,
+                            last_heartbeat=now
+                        )
+                    ))
 
                 # Calculate swarm efficiency (simplified)
-                avg_performance = sum(agent.state.performance_score for agent in self.agents.values()) / max(total_agents, 1)
-                swarm_efficiency = min(avg_performance, 1.0)
+                swarm_efficiency = min(performance_sum / max(total_agents, 1), 1.0)
 
                 # Get memory usage
-                process = psutil.Process()
-                memory_used = process.memory_info().rss
+                memory_used = self._proc.memory_info().rss
                 memory_limit = 2 * 1024 * 1024 * 1024  # 2GB limit (example)
 
                 # Update swarm metrics
                 swarm_metrics = SwarmMetrics(
                     total_agents=total_agents,
                     active_agents=active_agents,
-                    tasks_queued=sum(len(agent.state.task_queue) for agent in self.agents.values()),
-                    tasks_processing=sum(1 for agent in self.agents.values() if agent.state.current_task),
+                    tasks_queued=tasks_queued,
+                    tasks_processing=tasks_processing,
                     memory_used=memory_used,
                     memory_limit=memory_limit,
                     swarm_efficiency=swarm_efficiency,
-                    last_coordination=time.time()
+                    last_coordination=now
                 )
-                self.metrics_exporter.update_swarm_metrics(swarm_metrics)
+                self.metrics_exporter.update_swarm_metrics(swarm_metrics, now)
 
                 # Update individual agent metrics
-                for agent in self.agents.values():
-                    agent_metrics = AgentMetrics(
-                        tasks_completed=agent.state.tasks_completed,
-                        tasks_failed=agent.state.tasks_failed,
-                        memory_usage=agent.state.memory_usage,
-                        cpu_usage=agent.state.cpu_usage,
-                        active_time=agent.state.active_time,
-                        last_heartbeat=time.time()
-                    )
-
-                    # Convert AgentRole to AgentType
-                    agent_type = AgentType(agent.role.name.lower())
-                    self.metrics_exporter.update_agent_metrics(
-                        f"agent-{agent.role.name.lower()}",
-                        agent_type,
-                        agent_metrics
-                    )
+                self.metrics_exporter.update_agent_metrics_batch(agent_updates, now)
 
                 await asyncio.sleep(30)  # Update every 30 seconds
 
@@ -387,12 +505,11 @@ class PhantomOrchestrator:
 
         # Event bus processor
         async def process_events():
-            while self._running:
-                try:
-                    event = await asyncio.wait_for(self.event_bus.get(), timeout=1.0)
-                    await self._handle_event(event)
-                except asyncio.TimeoutError:
-                    continue
+            while True:
+                event = await self.event_bus.get()
+                if event is self._SHUTDOWN_EVENT:
+                    break
+                await self._handle_event(event)
 
         tasks.append(asyncio.create_task(process_events()))
 
@@ -403,28 +520,22 @@ class PhantomOrchestrator:
         """Route events to appropriate agents."""
         event_type = event.get("type", "unknown")
 
-        routing_table = {
-            "threat_detected": AgentRole.FORTRESS,
-            "route_optimization": AgentRole.VELOCITY,
-            "crypto_rotation": AgentRole.CIPHER,
-            "cloak_request": AgentRole.PHANTOM,
-            "deploy_request": AgentRole.NEXUS,
-            "scan_request": AgentRole.AEGIS,
-            "evolution_trigger": AgentRole.GENESIS,
-            "traffic_analysis": AgentRole.STREAM,
-            "global_status": AgentRole.OMNISCIENT,
-            "strategic_decision": AgentRole.APEX,
-        }
-
-        target_role = routing_table.get(event_type)
+        target_role = self.EVENT_ROUTES.get(event_type)
         if target_role and target_role in self.agents:
-            await self.dispatch_directive(target_role, str(event))
+            # One orjson pass instead of dict repr; sorted keys give equal
+            # events the same directive text (and mnemonic key)
+            directive = orjson.dumps(event, default=str, option=orjson.OPT_SORT_KEYS).decode()
+            await self.dispatch_directive(target_role, directive)
 
-    def shutdown(self) -> None:
+    async def shutdown(self) -> None:
         """Graceful swarm shutdown."""
         self._running = False
+        self.event_bus.put_nowait(self._SHUTDOWN_EVENT)
         for agent in self.agents.values():
             agent.stop()
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
         logger.info("orchestrator_shutdown")
 
 
@@ -432,8 +543,25 @@ class PhantomOrchestrator:
 # ENTRY POINT
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def configure_logging(level: int = logging.INFO) -> None:
+    """Render structlog events as JSON through orjson, dropping records below level."""
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=orjson.dumps),
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        logger_factory=structlog.BytesLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
 async def main() -> None:
     """Bootstrap the PhantomMesh Agent Swarm."""
+    configure_logging()
     orchestrator = PhantomOrchestrator()
 
     try:
@@ -441,7 +569,7 @@ async def main() -> None:
     except KeyboardInterrupt:
         logger.info("shutdown_signal_received")
     finally:
-        orchestrator.shutdown()
+        await orchestrator.shutdown()
 
 
 if __name__ == "__main__":
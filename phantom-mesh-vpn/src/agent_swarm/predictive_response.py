@@ -11,19 +11,69 @@ Copyright © 2025 Stephen Bilodeau. All rights reserved.
 
 from __future__ import annotations
 
-import asyncio
 import numpy as np
 from dataclasses import dataclass, field
 from datetime import datetime, UTC, timedelta
 from enum import Enum, auto
 from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict, deque
+from collections import Counter, defaultdict
 import json
 
 import structlog
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional (the "accel" extra)
+    njit = None
+
 logger = structlog.get_logger(__name__)
 
+# Number of recent threat events kept for trend/seasonality analysis
+_HISTORY_SIZE = 10_000
+
+# Seasonality factor keys, indexed by hour of day
+_HOUR_KEYS = tuple(f"hour_{h}" for h in range(24))
+
+# Severities the trend slope is fitted over
+_TREND_WINDOW = 100
+
+
+def _forecast_kernel(
+    severities: np.ndarray,
+    hour_counts: np.ndarray,
+    count: int,
+    current_hour: int,
+    current: float,
+    horizon_hours: float
+) -> Tuple[float, float]:
+    """Trend slope and clipped threat probability (same model as the numpy path)."""
+    n = severities.shape[0]
+    trend = 0.0
+    if n >= 2:
+        mean_y = 0.0
+        for i in range(n):
+            mean_y += severities[i]
+        mean_y /= n
+        
+        mean_x = (n - 1) / 2.0
+        num = 0.0
+        for i in range(n):
+            num += (i - mean_x) * (severities[i] - mean_y)
+        trend = num / (n * (n * n - 1) / 12.0)
+    
+    seasonal_factor = 0.5
+    if count >= 24 and hour_counts[current_hour] > 0:
+        seasonal_factor = hour_counts[current_hour] / count
+    
+    forecast = current + trend * horizon_hours + (seasonal_factor - 0.5) * 0.1
+    return trend, min(max(forecast, 0.0), 1.0)
+
+
+if njit is not None:
+    _forecast_nb = njit(cache=True)(_forecast_kernel)
+else:
+    _forecast_nb = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # THREAT FORECAST TYPES
@@ -127,13 +177,19 @@ class ThreatForecaster:
     """
     
     def __init__(self):
-        self._threat_history: deque[ThreatEvent] = deque(maxlen=10000)
-        self._historical_patterns: Dict[str, List[ThreatEvent]] = defaultdict(list)
-        self._seasonality_factors: Dict[str, float] = {}
+        # Rolling threat history as parallel ring buffers, one slot per event
+        self._sev_buf = np.empty(_HISTORY_SIZE, dtype=np.float64)
+        self._hour_buf = np.empty(_HISTORY_SIZE, dtype=np.int8)
+        self._hour_counts = np.zeros(24, dtype=np.int64)  # histogram of _hour_buf
+        self._cursor = 0  # next slot to write
+        self._count = 0   # filled slots, capped at _HISTORY_SIZE
+        # Running event count per threat type and the current most frequent type
+        self._type_counts: Counter[str] = Counter()
+        self._top_type: Optional[str] = None
         
         logger.info("threat_forecaster_initialized")
     
-    async def forecast_threats(
+    def forecast_threats(
         self,
         historical_events: List[ThreatEvent],
         current_threat_level: float,
@@ -151,19 +207,31 @@ class ThreatForecaster:
         """
         
         # Add events to history
+        self._record_history(historical_events)
+        type_counts = self._type_counts
         for event in historical_events:
-            self._threat_history.append(event)
-            self._historical_patterns[event.threat_type].append(event)
+            threat_type = event.threat_type
+            type_counts[threat_type] += 1
+            if self._top_type is None or type_counts[threat_type] > type_counts[self._top_type]:
+                self._top_type = threat_type
         
-        # Extract components
-        trend = self._compute_trend()
-        seasonality = self._detect_seasonality()
+        # Extract components and forecast threat probability
         current_momentum = current_threat_level
-        
-        # Forecast threat probability
-        forecast_prob = self._forecast_probability(
-            trend, seasonality, current_momentum, time_horizon
-        )
+        if _forecast_nb is not None:
+            _, forecast_prob = _forecast_nb(
+                self._recent_severities(),
+                self._hour_counts,
+                self._count,
+                datetime.now(UTC).hour,
+                float(current_momentum),
+                time_horizon.total_seconds() / 3600
+            )
+        else:
+            trend = self._compute_trend()
+            seasonality = self._detect_seasonality()
+            forecast_prob = self._forecast_probability(
+                trend, seasonality, current_momentum, time_horizon
+            )
         
         # Identify critical windows
         critical_windows = self._identify_critical_windows(
@@ -195,7 +263,7 @@ class ThreatForecaster:
             recommended_actions=recommendations
         )
     
-    async def identify_critical_windows(
+    def identify_critical_windows(
         self,
         forecast: ThreatForecast
     ) -> List[CriticalTimeWindow]:
@@ -225,44 +293,68 @@ class ThreatForecaster:
         
         return critical
     
+    def _record_history(self, events: List[ThreatEvent]) -> None:
+        """Write events into the history ring buffers, overwriting the oldest."""
+        n = len(events)
+        if not n:
+            return
+        
+        severities = np.fromiter((e.severity for e in events), dtype=np.float64, count=n)
+        hours = np.fromiter((e.timestamp.hour for e in events), dtype=np.int8, count=n)
+        if n > _HISTORY_SIZE:
+            severities, hours = severities[-_HISTORY_SIZE:], hours[-_HISTORY_SIZE:]
+            n = _HISTORY_SIZE
+        
+        slots = np.arange(self._cursor, self._cursor + n)
+        # Slots past the unfilled tail land on the oldest events; drop those
+        # from the hour histogram before they are overwritten
+        overwritten = self._count + n - _HISTORY_SIZE
+        if overwritten > 0:
+            evicted = self._hour_buf.take(slots[-overwritten:], mode="wrap")
+            self._hour_counts -= np.bincount(evicted, minlength=24)
+        self._hour_counts += np.bincount(hours, minlength=24)
+        self._sev_buf.put(slots, severities, mode="wrap")
+        self._hour_buf.put(slots, hours, mode="wrap")
+        self._cursor = (self._cursor + n) % _HISTORY_SIZE
+        self._count = min(self._count + n, _HISTORY_SIZE)
+    
+    def _recent_severities(self) -> np.ndarray:
+        """Severities of the last _TREND_WINDOW events, oldest first."""
+        n = min(_TREND_WINDOW, self._count)
+        return self._sev_buf.take(np.arange(self._cursor - n, self._cursor), mode="wrap")
+    
     def _compute_trend(self) -> float:
         """Compute trend component from historical data."""
-        if len(self._threat_history) < 2:
+        if self._count < 2:
             return 0.0
         
         # Look at recent trend
-        recent_events = list(self._threat_history)[-100:]
-        severities = [e.severity for e in recent_events]
+        severities = self._recent_severities()
+        n = severities.size
         
-        if len(severities) < 2:
-            return 0.0
-        
-        # Simple linear trend
-        x = np.arange(len(severities))
-        coefficients = np.polyfit(x, severities, 1)
-        trend = coefficients[0]  # Slope
+        # Least-squares slope against x = 0..n-1 in closed form:
+        # sum((x - mean_x) * (y - mean_y)) / sum((x - mean_x) ** 2)
+        x_centered = np.arange(n) - (n - 1) / 2
+        trend = np.dot(x_centered, severities - severities.mean()) / (n * (n * n - 1) / 12.0)
         
         return float(trend)
     
     def _detect_seasonality(self) -> Dict[str, float]:
         """Detect cyclical patterns (daily, weekly, monthly)."""
-        if len(self._threat_history) < 24:
+        if self._count < 24:
             return {}
         
-        # Group by hour of day
-        hourly_counts = defaultdict(int)
-        for event in self._threat_history:
-            hour = event.timestamp.hour
-            hourly_counts[hour] += 1
-        
-        # Compute seasonality
-        total = sum(hourly_counts.values())
-        seasonality = {
-            f"hour_{h}": count / total
-            for h, count in hourly_counts.items()
-        }
+        # Group by hour of day (kept up to date as events are recorded)
+        hourly_counts = self._hour_counts
+        
+        # Compute seasonality over the hours that saw events
+        hours = np.flatnonzero(hourly_counts)
+        shares = hourly_counts[hours] / self._count
+        seasonality = dict(zip(
+            [_HOUR_KEYS[h] for h in hours.tolist()],
+            shares.tolist()
+        ))
         
-        self._seasonality_factors = seasonality
         return seasonality
     
     def _forecast_probability(
@@ -282,7 +374,7 @@ class ThreatForecaster:
         
         # Add seasonal component
         current_hour = datetime.now(UTC).hour
-        seasonal_factor = seasonality.get(f"hour_{current_hour}", 0.5)
+        seasonal_factor = seasonality.get(_HOUR_KEYS[current_hour], 0.5)
         
         # Combine components
         forecast = base_prob + trend_component + (seasonal_factor - 0.5) * 0.1
@@ -315,16 +407,8 @@ class ThreatForecaster:
     def _forecast_threat_type(self) -> str:
         """Forecast most likely threat type."""
         
-        if not self._historical_patterns:
-            return "unknown"
-        
-        # Return most frequent threat type
-        threat_counts = {
-            threat_type: len(events)
-            for threat_type, events in self._historical_patterns.items()
-        }
-        
-        return max(threat_counts, key=threat_counts.get)
+        # Most frequent threat type, tracked as events are recorded
+        return self._top_type or "unknown"
     
     def _estimate_resource_requirements(
         self,
@@ -379,11 +463,11 @@ class ThreatForecaster:
         """Compute confidence in forecast."""
         
         # Confidence depends on data availability
-        if len(self._threat_history) < 10:
+        if self._count < 10:
             return 0.3
-        elif len(self._threat_history) < 100:
+        elif self._count < 100:
             return 0.5
-        elif len(self._threat_history) < 1000:
+        elif self._count < 1000:
             return 0.7
         else:
             return 0.9
@@ -393,6 +477,23 @@ class ThreatForecaster:
 # RESPONSE OPTIMIZER
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Primary response action by threat type
+_PRIMARY_ACTIONS: Dict[str, str] = {
+    "port_scan": "block_source_ip",
+    "brute_force": "lock_account",
+    "dos_attack": "enable_rate_limiting",
+    "malware": "isolate_host"
+}
+
+# Estimated response duration in minutes by action
+_ACTION_DURATIONS: Dict[str, float] = {
+    "block_source_ip": 0.5,
+    "lock_account": 2.0,
+    "enable_rate_limiting": 1.0,
+    "isolate_host": 5.0,
+    "generic_investigation": 15.0
+}
+
 class ResponseOptimizer:
     """
     Optimizes threat response strategies using historical outcomes
@@ -401,12 +502,14 @@ class ResponseOptimizer:
     
     def __init__(self):
         self._response_history: Dict[str, List[ResponseOutcome]] = defaultdict(list)
+        # threat type -> [successes, total] over _response_history
+        self._outcome_counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
         self._success_rates: Dict[str, float] = {}
         self._resource_efficiency: Dict[str, float] = {}
         
         logger.info("response_optimizer_initialized")
     
-    async def optimize_response(
+    def optimize_response(
         self,
         threat: Dict[str, Any],
         available_resources: ResourceSnapshot,
@@ -422,12 +525,9 @@ class ResponseOptimizer:
         4. Time constraints
         """
         
-        # Store outcomes
+        # Store outcomes and update success rates
         for outcome in historical_outcomes:
-            self._response_history[outcome.threat_type].append(outcome)
-        
-        # Compute success rates
-        self._update_success_rates()
+            self._record_outcome(outcome)
         
         threat_type = threat.get("type", "unknown")
         severity = threat.get("severity", 0.5)
@@ -460,15 +560,14 @@ class ResponseOptimizer:
             cost_estimate=self._estimate_cost(resource_allocation)
         )
     
-    async def learn_from_outcome(
+    def learn_from_outcome(
         self,
         response: OptimizedResponse,
         outcome: ResponseOutcome
     ):
         """Learn from response execution to improve future optimization."""
         
-        self._response_history[outcome.threat_type].append(outcome)
-        self._update_success_rates()
+        self._record_outcome(outcome)
         
         logger.info(
             "response_outcome_recorded",
@@ -484,16 +583,7 @@ class ResponseOptimizer:
     ) -> str:
         """Select primary response action."""
         
-        if threat_type == "port_scan":
-            return "block_source_ip"
-        elif threat_type == "brute_force":
-            return "lock_account"
-        elif threat_type == "dos_attack":
-            return "enable_rate_limiting"
-        elif threat_type == "malware":
-            return "isolate_host"
-        else:
-            return "generic_investigation"
+        return _PRIMARY_ACTIONS.get(threat_type, "generic_investigation")
     
     def _select_secondary_actions(
         self,
@@ -550,28 +640,13 @@ class ResponseOptimizer:
     ) -> float:
         """Estimate success probability from historical data."""
         
-        if threat_type not in self._response_history:
-            return 0.7  # Default estimate
-        
-        outcomes = self._response_history[threat_type]
-        if not outcomes:
-            return 0.7
-        
-        successes = sum(1 for o in outcomes if o.success)
-        return successes / len(outcomes)
+        # Default estimate until outcomes for this type are recorded
+        return self._success_rates.get(threat_type, 0.7)
     
     def _estimate_duration(self, action: str) -> float:
         """Estimate response duration in minutes."""
         
-        durations = {
-            "block_source_ip": 0.5,
-            "lock_account": 2.0,
-            "enable_rate_limiting": 1.0,
-            "isolate_host": 5.0,
-            "generic_investigation": 15.0
-        }
-        
-        return durations.get(action, 10.0)
+        return _ACTION_DURATIONS.get(action, 10.0)
     
     def _estimate_cost(self, resources: Dict[str, float]) -> float:
         """Estimate operational cost of response."""
@@ -585,23 +660,29 @@ class ResponseOptimizer:
         
         return cost
     
-    def _update_success_rates(self):
-        """Update success rates from response history."""
-        
-        for threat_type, outcomes in self._response_history.items():
-            if not outcomes:
-                self._success_rates[threat_type] = 0.7
-                continue
-            
-            successes = sum(1 for o in outcomes if o.success)
-            rate = successes / len(outcomes)
-            self._success_rates[threat_type] = rate
+    def _record_outcome(self, outcome: ResponseOutcome):
+        """Add outcome to response history and update its type's success rate."""
+        
+        threat_type = outcome.threat_type
+        self._response_history[threat_type].append(outcome)
+        counts = self._outcome_counts[threat_type]
+        counts[0] += outcome.success
+        counts[1] += 1
+        self._success_rates[threat_type] = counts[0] / counts[1]
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PLAYBOOK SELECTOR
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Playbook id by threat type
+_PLAYBOOK_MAPPING: Dict[str, str] = {
+    "port_scan": "port_scan_response",
+    "brute_force": "brute_force_response",
+    "ssh_brute_force": "brute_force_response",
+    "dos_attack": "dos_mitigation"
+}
+
 @dataclass
 class SelectedPlaybook:
     """Selected incident playbook."""
@@ -655,7 +736,7 @@ class PlaybookSelector:
         
         self._success_history: Dict[str, List[bool]] = defaultdict(list)
     
-    async def select_playbook(
+    def select_playbook(
         self,
         threat: Dict[str, Any],
         context: Dict[str, Any],
@@ -666,14 +747,7 @@ class PlaybookSelector:
         threat_type = threat.get("type", "unknown")
         
         # Map threat to playbook
-        playbook_mapping = {
-            "port_scan": "port_scan_response",
-            "brute_force": "brute_force_response",
-            "ssh_brute_force": "brute_force_response",
-            "dos_attack": "dos_mitigation"
-        }
-        
-        playbook_id = playbook_mapping.get(threat_type, "generic_response")
+        playbook_id = _PLAYBOOK_MAPPING.get(threat_type, "generic_response")
         
         if playbook_id not in self.playbooks:
             playbook_id = "generic_response"
@@ -690,7 +764,7 @@ class PlaybookSelector:
             success_rate=success_rate
         )
     
-    async def record_execution(
+    def record_execution(
         self,
         playbook_id: str,
         success: bool
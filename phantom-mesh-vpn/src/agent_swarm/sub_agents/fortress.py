@@ -6,7 +6,8 @@ Elite agent for threat detection and intrusion prevention.
 Copyright © 2025 Stephen Bilodeau. All rights reserved.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Optional
+from collections import deque
 import asyncio
 import structlog
 import numpy as np
@@ -36,8 +37,9 @@ class AnomalyDetector:
     def __init__(self, window_size: int = 1000, threshold: float = 3.0):
         self.window_size = window_size
         self.threshold = threshold
-        self.packet_sizes: List[int] = []
-        self.timestamps: List[datetime] = []
+        # Bounded windows: appending past window_size drops the oldest in O(1)
+        self.packet_sizes: Deque[int] = deque(maxlen=window_size)
+        self.timestamps: Deque[datetime] = deque(maxlen=window_size)
 
     def add_packet(self, size: int) -> None:
         """Add packet to analysis window."""
@@ -45,11 +47,6 @@ class AnomalyDetector:
         self.packet_sizes.append(size)
         self.timestamps.append(now)
 
-        # Maintain window size
-        if len(self.packet_sizes) > self.window_size:
-            self.packet_sizes.pop(0)
-            self.timestamps.pop(0)
-
     def detect_anomaly(self, size: int) -> Optional[Dict[str, Any]]:
         """Detect if packet size is anomalous."""
         if len(self.packet_sizes) < 10:  # Need minimum samples
@@ -0,0 +1,420 @@
+"""
+Unit tests for multi-region state replication
+"""
+
+import asyncio
+import os
+import random
+import threading
+import pytest
+from collections import deque
+from datetime import datetime, UTC, timedelta
+import sys
+
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from agent_swarm import multi_region_orchestrator
+from agent_swarm.multi_region_orchestrator import (
+    NUMBA_MIN_REGIONS,
+    DistributedState,
+    DottedClock,
+    GlobalLoadBalancer,
+    RegionConfig,
+    RegionMetrics,
+    RegionStatus,
+    StateChange,
+    StateChangeLog,
+    TieredPendingQueue,
+)
+
+
+def _change(n, region_id="us-east"):
+    return StateChange(
+        change_id=f"c{n}",
+        timestamp=datetime.now(UTC),
+        region_id=region_id,
+        workload_id="w1",
+        old_state={},
+        new_state={"n": n},
+        version=n + 1
+    )
+
+
+def _regions(count=2):
+    return [
+        RegionConfig(
+            region_id=f"r{i}",
+            name=f"Region {i}",
+            primary_datacenter=f"dc{i}",
+            backup_datacenters=[],
+            latency_budget_ms=50,
+            coordinate=(0.0, float(i))
+        )
+        for i in range(count)
+    ]
+
+
+def _random_events(rng, regions=("r0", "r1", "r2"), count=20):
+    return {(rng.choice(regions), rng.randint(1, 12)) for _ in range(count)}
+
+
+def _clock_of(events):
+    clock = DottedClock()
+    for region_id, counter in events:
+        clock.add(region_id, counter)
+    clock.compact()
+    return clock
+
+
+class TestDottedClock:
+    """Tests for the dotted version vector causal context."""
+    
+    def test_compact_folds_contiguous_dots_into_base(self):
+        clock = DottedClock()
+        for counter in (3, 1, 2, 5):
+            clock.add("r0", counter)
+        clock.compact()
+        assert clock.base == {"r0": 3}
+        assert clock.dots == {("r0", 5)}
+        
+        # Events at or below base are already covered and never become dots
+        clock.add("r0", 2)
+        assert clock.dots == {("r0", 5)}
+        clock.add("r0", 4)
+        clock.compact()
+        assert clock.base == {"r0": 5} and not clock.dots
+    
+    def test_contains_matches_event_set(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            events = _random_events(rng)
+            clock = _clock_of(events)
+            for region_id in ("r0", "r1", "r2", "r3"):
+                for counter in range(1, 14):
+                    assert clock.contains(region_id, counter) == ((region_id, counter) in events)
+            # Compacted: no dot could still extend its region's base
+            assert all(counter > clock.base.get(r, 0) + 1 for r, counter in clock.dots)
+    
+    def test_copy_is_independent(self):
+        clock = _clock_of({("r0", 1), ("r0", 3)})
+        copy = clock.copy()
+        copy.add("r0", 2)
+        copy.compact()
+        assert copy.base == {"r0": 3}
+        assert clock.base == {"r0": 1} and clock.dots == {("r0", 3)}
+    
+    def test_change_concurrency_uses_dotted_contexts(self):
+        first = _change(1, region_id="r0")
+        first.version = 1
+        observer = _change(2, region_id="r1")
+        observer.version = 1
+        observer.context = _clock_of({("r0", 1)})
+        rival = _change(3, region_id="r2")
+        rival.version = 1
+        
+        assert not observer.concurrent_with(first)
+        assert observer.supersedes(first) and not first.supersedes(observer)
+        assert rival.concurrent_with(first)
+        # Concurrent changes are ordered by dot, the same way in every region
+        assert rival.supersedes(first) != first.supersedes(rival)
+
+
+class TestStateChangeLog:
+    """Tests for the struct-of-arrays replication log."""
+    
+    def test_matches_bounded_deque(self):
+        rng = random.Random(9)
+        regions = {"r0": 0, "r1": 1, "r2": 2}
+        log = StateChangeLog(regions, capacity=64)
+        reference = deque(maxlen=64)
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        
+        for n in range(300):
+            change = StateChange(
+                change_id=f"c{n}",
+                timestamp=start + timedelta(microseconds=rng.randrange(10**9)),
+                region_id=rng.choice(list(regions)),
+                workload_id=f"w{rng.randrange(5)}",
+                old_state={"n": n - 1},
+                new_state={"n": n},
+                version=n + 1,
+                context=_clock_of({("r0", n)})
+            )
+            log.append(change)
+            reference.append(change)
+            assert len(log) == len(reference)
+            assert log.last_timestamp() == reference[-1].timestamp
+            
+            if n % 37 == 0 or n == 299:
+                assert list(log) == list(reference)
+                assert log[0] == reference[0] and log[-1] == reference[-1]
+    
+    def test_index_out_of_range(self):
+        log = StateChangeLog({"us-east": 0}, capacity=2)
+        assert log.last_timestamp() is None
+        with pytest.raises(IndexError):
+            log[0]
+        log.append(_change(0))
+        assert log[-1].change_id == "c0"
+        with pytest.raises(IndexError):
+            log[1]
+
+
+class TestTieredPendingQueue:
+    """Tests for the pending replication queue and its spill file."""
+    
+    def test_overflow_spills_oldest_and_drain_returns_all_in_order(self, tmp_path):
+        async def scenario():
+            queue = TieredPendingQueue(in_mem_cap=4, spill_path=str(tmp_path / "spill.log"))
+            for n in range(5):
+                await queue.append(_change(n))
+            
+            assert os.path.exists(queue.spill_path)
+            assert len(queue._memory) == 3
+            assert len(queue) == 5
+            
+            drained = await queue.drain()
+            assert [c.change_id for c in drained] == [f"c{n}" for n in range(5)]
+            assert drained[0].new_state == {"n": 0}
+            assert len(queue) == 0
+            assert not os.path.exists(queue.spill_path)
+        
+        asyncio.run(scenario())
+    
+    def test_acknowledged_changes_leave_queue_and_spill_file(self):
+        async def scenario():
+            queue = TieredPendingQueue(in_mem_cap=4)
+            for n in range(5):
+                await queue.append(_change(n))
+            path = queue.spill_path
+            assert path is not None and os.path.exists(path)
+            
+            # c0 and c1 were spilled; the file goes once both are acknowledged
+            await queue.acknowledge("c0")
+            assert os.path.exists(path)
+            await queue.acknowledge("c1")
+            assert not os.path.exists(path)
+            assert queue.spill_path is None
+            
+            await queue.acknowledge("c3")
+            await queue.acknowledge("unknown")
+            assert len(queue) == 2
+            assert [c.change_id for c in await queue.drain()] == ["c2", "c4"]
+        
+        asyncio.run(scenario())
+    
+    def test_drain_skips_acknowledged_spilled_changes(self):
+        async def scenario():
+            queue = TieredPendingQueue(in_mem_cap=4)
+            for n in range(5):
+                await queue.append(_change(n))
+            path = queue.spill_path
+            await queue.acknowledge("c0")
+            
+            assert [c.change_id for c in await queue.drain()] == ["c1", "c2", "c3", "c4"]
+            assert not os.path.exists(path)
+        
+        asyncio.run(scenario())
+    
+    def test_close_deletes_spill_file(self):
+        async def scenario():
+            queue = TieredPendingQueue(in_mem_cap=2)
+            for n in range(3):
+                await queue.append(_change(n))
+            path = queue.spill_path
+            assert os.path.exists(path)
+            
+            await queue.close()
+            assert not os.path.exists(path)
+            assert len(queue) == 0
+        
+        asyncio.run(scenario())
+    
+    def test_existing_spill_file_is_truncated_not_deleted(self, tmp_path):
+        path = tmp_path / "spill.log"
+        path.write_bytes(b"caller data")
+        
+        async def scenario():
+            queue = TieredPendingQueue(in_mem_cap=2, spill_path=str(path))
+            for n in range(3):
+                await queue.append(_change(n))
+            assert path.stat().st_size > len(b"caller data")
+            
+            assert [c.change_id for c in await queue.drain()] == ["c0", "c1", "c2"]
+            assert path.read_bytes() == b"caller data"
+            
+            for n in range(3, 6):
+                await queue.append(_change(n))
+            await queue.close()
+            assert path.read_bytes() == b"caller data"
+        
+        asyncio.run(scenario())
+    
+    def test_spill_io_runs_off_the_event_loop_thread(self, monkeypatch):
+        threads = []
+        write_records = TieredPendingQueue._write_records.__func__
+        
+        def recording_write(cls, path, changes):
+            threads.append(threading.current_thread())
+            return write_records(cls, path, changes)
+        
+        monkeypatch.setattr(TieredPendingQueue, "_write_records", classmethod(recording_write))
+        
+        async def scenario():
+            queue = TieredPendingQueue(in_mem_cap=2)
+            for n in range(3):
+                await queue.append(_change(n))
+            await queue.close()
+        
+        asyncio.run(scenario())
+        assert threads and threading.main_thread() not in threads
+
+
+class TestDistributedState:
+    """Tests for replication bookkeeping."""
+    
+    def test_delivered_changes_are_not_left_pending(self):
+        async def scenario():
+            state = DistributedState(_regions())
+            for n in range(3):
+                await state.replicate_state({"workload_id": "w1", "new_state": {"n": n}})
+            assert state.get_replication_status()["pending_replications"] == 0
+            await state.close()
+        
+        asyncio.run(scenario())
+    
+    def test_undelivered_changes_stay_pending(self):
+        async def scenario():
+            state = DistributedState(_regions())
+            
+            async def unreachable(region, changes):
+                return False
+            
+            state._replicator._send_batch = unreachable
+            status = await state.replicate_state({"workload_id": "w1", "new_state": {"n": 1}})
+            assert status == {"r0": False, "r1": False}
+            assert state.get_replication_status()["pending_replications"] == 2
+            await state.close()
+            assert state.get_replication_status()["pending_replications"] == 0
+        
+        asyncio.run(scenario())
+    
+    def test_backlog_is_resent_once_a_region_recovers(self):
+        sent = []
+        reachable = {"r0": True, "r1": False}
+        
+        async def send(region, changes):
+            if reachable[region.region_id]:
+                sent.extend((region.region_id, c.new_state["n"]) for c in changes)
+            return reachable[region.region_id]
+        
+        async def scenario():
+            state = DistributedState(_regions())
+            state._replicator._send_batch = send
+            for n in range(2):
+                await state.replicate_state({"workload_id": "w1", "new_state": {"n": n}})
+            assert state.get_replication_status()["pending_replications"] == 2
+            assert await state.retry_pending_replications() == {"r0": 0, "r1": 2}
+            
+            reachable["r1"] = True
+            status = await state.replicate_state({"workload_id": "w1", "new_state": {"n": 2}})
+            assert status == {"r0": True, "r1": True}
+            assert state.get_replication_status()["pending_replications"] == 0
+            await state.close()
+        
+        asyncio.run(scenario())
+        assert [n for region, n in sent if region == "r1"] == [2, 0, 1]
+    
+    def test_explicit_retry_delivers_the_backlog(self):
+        reachable = {"r0": False, "r1": False}
+        
+        async def send(region, changes):
+            return reachable[region.region_id]
+        
+        async def scenario():
+            state = DistributedState(_regions())
+            state._replicator._send_batch = send
+            await state.replicate_state({"workload_id": "w1", "new_state": {"n": 1}})
+            reachable["r0"] = True
+            assert await state.retry_pending_replications() == {"r0": 0, "r1": 1}
+            await state.close()
+        
+        asyncio.run(scenario())
+    
+    def test_conflict_index_is_bounded(self):
+        async def scenario():
+            state = DistributedState(_regions())
+            state.MAX_INDEXED_WORKLOADS = 2
+            for workload_id in ("w1", "w2", "w1", "w3"):
+                await state.replicate_state({"workload_id": workload_id, "new_state": {"n": 1}})
+            await state.close()
+            return state
+        
+        state = asyncio.run(scenario())
+        # w2 was least recently changed, so it left the index
+        assert list(state._by_workload) == ["w1", "w3"]
+        # The second w1 batch observed the first, which is no longer live
+        assert [c.version for c in state._by_workload["w1"]] == [3, 3]
+
+
+class TestLoadBalancerKernels:
+    """The numba load-balancer kernels agree with the numpy path."""
+    
+    @staticmethod
+    def _metrics(rng, count):
+        return {
+            f"r{i}": RegionMetrics(
+                region_id=f"r{i}",
+                status=RegionStatus.HEALTHY,
+                latency_ms=rng.uniform(5, 200),
+                throughput_rps=1000.0,
+                error_rate=0.0,
+                cpu_usage_percent=rng.uniform(0, 95),
+                memory_usage_percent=50.0,
+                replicated_workloads=0
+            )
+            for i in range(count)
+        }
+    
+    def test_kernels_match_numpy(self):
+        rng = np.random.default_rng(1)
+        cpu = rng.uniform(0, 84, 100)
+        latency = rng.uniform(5, 200, 100)
+        
+        weights, avg_latency, utilization = multi_region_orchestrator._capacity_kernel(cpu, latency)
+        capacity = 100.0 - cpu
+        expected = capacity / capacity.sum()
+        np.testing.assert_allclose(weights, expected, rtol=1e-12)
+        assert avg_latency == pytest.approx(float(expected @ latency), rel=1e-12)
+        assert utilization == pytest.approx(float(expected @ cpu) / 100, rel=1e-12)
+        assert multi_region_orchestrator._balance_score_kernel(weights) == pytest.approx(
+            max(0.0, 1.0 - float(weights.var())), rel=1e-12
+        )
+    
+    def test_distribution_is_the_same_with_and_without_kernels(self, monkeypatch):
+        metrics = self._metrics(random.Random(2), NUMBA_MIN_REGIONS * 2)
+        balancer = GlobalLoadBalancer()
+        
+        # Kernels run as plain Python when numba is not installed
+        for name in ("capacity", "balance_score"):
+            if getattr(multi_region_orchestrator, f"_{name}_nb") is None:
+                monkeypatch.setattr(
+                    multi_region_orchestrator, f"_{name}_nb",
+                    getattr(multi_region_orchestrator, f"_{name}_kernel")
+                )
+        via_kernel = asyncio.run(balancer.distribute_load([], metrics))
+        
+        monkeypatch.setattr(multi_region_orchestrator, "_capacity_nb", None)
+        monkeypatch.setattr(multi_region_orchestrator, "_balance_score_nb", None)
+        via_numpy = asyncio.run(balancer.distribute_load([], metrics))
+        
+        assert via_kernel.region_allocations.keys() == via_numpy.region_allocations.keys()
+        for region_id, share in via_numpy.region_allocations.items():
+            assert via_kernel.region_allocations[region_id] == pytest.approx(share, rel=1e-12)
+        assert via_kernel.estimated_latency_ms == pytest.approx(via_numpy.estimated_latency_ms, rel=1e-12)
+        assert via_kernel.total_capacity_utilization == pytest.approx(
+            via_numpy.total_capacity_utilization, rel=1e-12
+        )
+        assert via_kernel.balanced_score == pytest.approx(via_numpy.balanced_score, rel=1e-12)
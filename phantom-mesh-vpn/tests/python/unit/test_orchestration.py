@@ -0,0 +1,365 @@
+"""
+Unit tests for the workflow orchestration and threat response engine
+"""
+
+import asyncio
+import random
+import pytest
+import sys
+
+sys.path.insert(0, 'src')
+
+from agent_swarm import orchestration
+from agent_swarm.orchestration import (
+    ALL_PLAYBOOKS,
+    NUMBA_MIN_PATTERNS,
+    OrchestrationEngine,
+    StateGuard,
+    StateMachine,
+    ThreatLevel,
+    ThreatResponseEngine,
+    ThreatResponsePattern,
+    WorkflowStep,
+    _NumericPatternTable,
+)
+
+
+@pytest.fixture
+def numeric_kernel(monkeypatch):
+    """Run the prefilter kernel as plain Python when numba is not installed."""
+    if orchestration._numeric_match_nb is None:
+        monkeypatch.setattr(orchestration, "_numeric_match_nb", orchestration._numeric_match_kernel)
+
+
+def _pattern(pattern_id="p", **signature):
+    return ThreatResponsePattern(pattern_id, signature, [], ThreatLevel.HIGH)
+
+
+class TestThreatSignatureMatching:
+    """Tests for compiled threat signature checks."""
+    
+    NON_NUMERIC = ("7", None, True, [7], {"count": 7})
+    
+    def test_threshold_matches_numbers(self):
+        pattern = _pattern(failed_attempts={"$gte": 5})
+        assert pattern.matches({"failed_attempts": 5})
+        assert pattern.matches({"failed_attempts": 7.5})
+        assert not pattern.matches({"failed_attempts": 4})
+        assert not pattern.matches({})
+    
+    @pytest.mark.parametrize("value", NON_NUMERIC)
+    def test_threshold_rejects_non_numeric_field(self, value):
+        for op in ("$gte", "$gt", "$lte", "$lt"):
+            assert not _pattern(failed_attempts={op: 5}).matches({"failed_attempts": value})
+    
+    def test_threshold_rejects_non_numeric_operand(self):
+        assert not _pattern(failed_attempts={"$gte": "5"}).matches({"failed_attempts": 7})
+    
+    @pytest.mark.parametrize("value", NON_NUMERIC)
+    def test_handle_threat_with_non_numeric_field_is_unmatched(self, value):
+        engine = ThreatResponseEngine(OrchestrationEngine())
+        engine.register_patterns(ALL_PLAYBOOKS)
+        threat = {"id": "t1", "event_type": "failed_auth", "failed_attempts": value}
+        assert asyncio.run(engine.handle_threat(threat)) is False
+    
+    @pytest.mark.parametrize("value", (7, 5, 4, 7.5, float("nan"), *NON_NUMERIC))
+    def test_prefilter_agrees_with_python_matching(self, numeric_kernel, value):
+        pattern = _pattern(event_type="failed_auth", failed_attempts={"$gte": 5})
+        table = _NumericPatternTable([pattern])
+        threat = {"event_type": "failed_auth", "failed_attempts": value}
+        via_kernel = pattern in table.prefilter(threat) and pattern.matches_residual(threat)
+        assert via_kernel == pattern.matches(threat)
+    
+    @staticmethod
+    def _random_signature(rng):
+        signature = {}
+        for field in rng.sample(("failed_attempts", "rate", "bytes"), rng.randint(0, 3)):
+            op = rng.choice(("$gte", "$gt", "$lte", "$lt"))
+            signature[field] = {op: rng.randint(0, 100)}
+        if rng.random() < 0.3:
+            signature["net"] = {"pps": {"$gt": rng.randint(0, 100)}}
+        if rng.random() < 0.3:
+            signature["proto"] = rng.choice(("tcp", "udp"))
+        return signature
+    
+    @staticmethod
+    def _random_threat(rng):
+        threat = {"event_type": "scan"}
+        for field in ("failed_attempts", "rate", "bytes"):
+            if rng.random() < 0.9:
+                threat[field] = rng.choice((rng.randint(0, 100), rng.uniform(0, 100), "12", None))
+        threat["net"] = {"pps": rng.randint(0, 100)}
+        threat["proto"] = rng.choice(("tcp", "udp"))
+        return threat
+    
+    def test_selection_matches_linear_scan(self, monkeypatch, numeric_kernel):
+        rng = random.Random(13)
+        levels = [level for level in ThreatLevel if level is not ThreatLevel.NONE]
+        # Any-event-type patterns first, so registration order is the scan order
+        patterns = [
+            ThreatResponsePattern(f"any{n}", self._random_signature(rng), [], rng.choice(levels))
+            for n in range(8)
+        ] + [
+            ThreatResponsePattern(
+                f"scan{n}",
+                {"event_type": "scan", **self._random_signature(rng)},
+                [],
+                rng.choice(levels)
+            )
+            for n in range(NUMBA_MIN_PATTERNS * 2)
+        ]
+        engine = ThreatResponseEngine(OrchestrationEngine())
+        engine.register_patterns(patterns)
+        
+        for _ in range(500):
+            threat = self._random_threat(rng)
+            matching = [p for p in patterns if p.matches(threat)]
+            expected = max(matching, key=lambda p: p.escalation_level.value) if matching else None
+            
+            assert engine._select_pattern(threat) is expected
+            with monkeypatch.context() as m:
+                m.setattr(orchestration, "_numeric_match_nb", None)
+                assert engine._select_pattern(threat) is expected
+
+
+class TestPlaybooks:
+    """Tests for the memoized built-in playbooks."""
+    
+    def test_signatures_are_read_only(self):
+        pattern = _pattern(event_type="scan", score={"$gte": 0.5}, port={"$in": [22, 23]})
+        with pytest.raises(TypeError):
+            pattern.threat_signature["event_type"] = "other"
+        with pytest.raises(TypeError):
+            pattern.threat_signature["score"]["$gte"] = 0.0
+        assert pattern.threat_signature["port"]["$in"] == (22, 23)
+        assert pattern.matches({"event_type": "scan", "score": 0.7, "port": 22})
+        
+        playbook = orchestration.create_brute_force_playbook()
+        with pytest.raises(TypeError):
+            playbook.threat_signature["failed_attempts"]["$gte"] = 0
+    
+    def test_reset_rebuilds_all_playbooks(self):
+        previous = orchestration.ALL_PLAYBOOKS
+        orchestration.reset_playbook_cache()
+        
+        rebuilt = orchestration.ALL_PLAYBOOKS
+        assert rebuilt is not previous
+        assert [p.pattern_id for p in rebuilt] == [p.pattern_id for p in previous]
+        assert rebuilt[0] is orchestration.create_port_scan_playbook()
+        assert rebuilt[0] is not previous[0]
+
+
+class TestStepResultCache:
+    """Tests for the idempotent step result cache."""
+    
+    @staticmethod
+    def _engine(calls, **options):
+        engine = OrchestrationEngine()
+        
+        async def block_ip(step, context):
+            calls.append(context["source_ip"])
+            return {"blocked": context["source_ip"]}
+        
+        engine.register_step_handler("block_ip", block_ip, cacheable=True, **options)
+        return engine
+    
+    @staticmethod
+    def _run(engine, *contexts):
+        step = WorkflowStep(id="block", name="block_ip", agent_role="FORTRESS", action="block")
+        
+        async def scenario():
+            for n, context in enumerate(contexts):
+                await engine.execute_workflow(f"wf{n}", [step], context)
+        
+        asyncio.run(scenario())
+    
+    def test_fingerprint_ignores_context_the_step_does_not_read(self):
+        calls = []
+        engine = self._engine(calls, cache_keys=("source_ip",))
+        pattern = ThreatResponsePattern(
+            "scan",
+            {"event_type": "port_scan"},
+            [WorkflowStep(id="block", name="block_ip", agent_role="FORTRESS", action="block")],
+            ThreatLevel.HIGH
+        )
+        responder = ThreatResponseEngine(engine)
+        responder.register_pattern(pattern)
+        
+        async def scenario():
+            for n in range(101):
+                threat = {"id": f"t{n}", "event_type": "port_scan", "source_ip": "10.0.0.1"}
+                assert await responder.handle_threat(threat)
+            await responder.handle_threat({"id": "t", "event_type": "port_scan", "source_ip": "10.0.0.2"})
+        
+        asyncio.run(scenario())
+        assert calls == ["10.0.0.1", "10.0.0.2"]
+        assert len(engine._step_cache) == 2
+    
+    def test_cache_is_bounded_lru(self):
+        calls = []
+        engine = self._engine(calls, cache_keys=("source_ip",))
+        engine.MAX_CACHED_STEPS = 2
+        self._run(engine, *({"source_ip": ip} for ip in ("a", "b", "a", "c")))
+        assert len(engine._step_cache) == 2
+        
+        # "b" was least recently used, so it was evicted; "a" is still cached
+        self._run(engine, {"source_ip": "a"}, {"source_ip": "b"})
+        assert calls == ["a", "b", "c", "b"]
+    
+    def test_sweep_drops_expired_results(self):
+        calls = []
+        engine = self._engine(calls, cache_keys=("source_ip",), ttl=0.0)
+        self._run(engine, *({"source_ip": ip} for ip in ("a", "b", "c")))
+        assert len(engine._step_cache) == 3
+        
+        engine._next_cache_sweep = 0.0
+        self._run(engine, {"source_ip": "d"})
+        assert list(engine._step_cache) == [engine._step_fingerprint(
+            WorkflowStep(id="block", name="block_ip", agent_role="FORTRESS", action="block"),
+            {"source_ip": "d"},
+            ("source_ip",)
+        )]
+    
+    def test_hits_are_isolated_from_caller_mutation(self):
+        calls = []
+        engine = self._engine(calls, cache_keys=("source_ip",))
+        step = WorkflowStep(id="block", name="block_ip", agent_role="FORTRESS", action="block")
+        
+        async def scenario():
+            results = []
+            for n in range(3):
+                execution = await engine.execute_workflow(f"wf{n}", [step], {"source_ip": "a"})
+                result = execution.results["block"]
+                results.append(dict(result))
+                result["blocked"] = "tampered"
+            return results
+        
+        assert asyncio.run(scenario()) == [{"blocked": "a"}] * 3
+        assert calls == ["a"]
+
+
+class TestDefaultContext:
+    """Tests for the context handed out when the caller passes none."""
+    
+    def test_handlers_can_write_to_the_default_context(self):
+        engine = OrchestrationEngine()
+        
+        async def tag(step, context):
+            context[step.id] = True
+            return {"seen": sorted(context)}
+        
+        engine.register_step_handler("tag", tag)
+        first = WorkflowStep(id="a", name="tag", agent_role="FORTRESS", action="tag")
+        second = WorkflowStep(id="b", name="tag", agent_role="FORTRESS", action="tag", dependencies=["a"])
+        
+        async def scenario():
+            return await engine.execute_workflow("wf", [first, second])
+        
+        execution = asyncio.run(scenario())
+        assert execution.results == {"a": {"seen": ["a"]}, "b": {"seen": ["a", "b"]}}
+    
+    def test_guards_can_write_to_the_default_context(self):
+        machine = StateMachine("idle")
+        
+        def mark(context):
+            context["checked"] = True
+            return True
+        
+        machine.register_transition("idle", "active", [StateGuard(mark, "mark")])
+        
+        assert asyncio.run(machine.transition("active"))
+        assert machine._history[-1].context == {"checked": True}
+
+
+class TestWorkflowRetention:
+    """Tests for the bounded record of workflow executions."""
+    
+    def test_running_executions_are_never_evicted(self):
+        engine = OrchestrationEngine()
+        engine.MAX_WORKFLOWS = 2
+        release = asyncio.Event()
+        
+        async def wait(step, context):
+            await release.wait()
+            return {}
+        
+        async def done(step, context):
+            return {}
+        
+        engine.register_step_handler("wait", wait)
+        engine.register_step_handler("done", done)
+        slow = WorkflowStep(id="s", name="wait", agent_role="FORTRESS", action="wait")
+        fast = WorkflowStep(id="f", name="done", agent_role="FORTRESS", action="done")
+        
+        async def scenario():
+            running = asyncio.create_task(engine.execute_workflow("slow", [slow]))
+            await asyncio.sleep(0)
+            finished = [await engine.execute_workflow(f"fast{n}", [fast]) for n in range(3)]
+            
+            # The oldest finished executions made room; the running one stayed
+            ids = list(engine._workflows)
+            assert len(ids) == 2
+            assert ids[0].startswith("slow_")
+            assert ids[1] == finished[-1].execution_id
+            
+            release.set()
+            execution = await running
+            assert execution.end_ns is not None
+            assert list(engine._workflows) == ids
+            
+            # Eviction follows completion order: fast2 finished before slow
+            fast3 = await engine.execute_workflow("fast3", [fast])
+            assert list(engine._workflows) == [execution.execution_id, fast3.execution_id]
+            fast4 = await engine.execute_workflow("fast4", [fast])
+            assert list(engine._workflows) == [fast3.execution_id, fast4.execution_id]
+        
+        asyncio.run(scenario())
+
+
+class TestStateMachineLocking:
+    """Tests for reader/writer locking around transitions."""
+    
+    @pytest.mark.parametrize("parallel", (False, True))
+    def test_callback_reads_while_writer_waits(self, parallel):
+        machine = StateMachine("idle", entity_id="m1")
+        machine.register_transition("idle", "active")
+        machine.register_transition("active", "done")
+        writer_queued = asyncio.Event()
+        seen = []
+        
+        async def observe(transition):
+            await writer_queued.wait()
+            assert machine._rwlock._waiting_writers == 1
+            seen.append(await machine.get_state())
+            seen.append(len(await machine.get_history()))
+            seen.append(await machine.can_transition_to("done"))
+        
+        machine.on_transition("idle", "active", observe, parallel=parallel)
+        
+        async def scenario():
+            first = asyncio.create_task(machine.transition("active"))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(machine.transition("done"))
+            await asyncio.sleep(0)
+            writer_queued.set()
+            return await asyncio.wait_for(asyncio.gather(first, second), timeout=1.0)
+        
+        assert asyncio.run(scenario()) == [True, True]
+        assert seen == ["active", 1, True]
+        assert machine.current_state == "done"
+    
+    def test_reentrant_reads_end_with_the_transition(self):
+        machine = StateMachine("idle")
+        machine.register_transition("idle", "active")
+        
+        async def noop(transition):
+            pass
+        
+        machine.on_transition("idle", "active", noop)
+        
+        async def scenario():
+            assert await machine.transition("active")
+            assert not orchestration._held_read_locks.get()
+            assert machine._rwlock._readers == 0
+        
+        asyncio.run(scenario())
@@ -2,21 +2,125 @@
 Unit tests for PhantomMesh Agent Swarm Orchestrator
 """
 
+import asyncio
+import itertools
+import random
 import pytest
 from unittest.mock import Mock, AsyncMock
 import sys
 
 sys.path.insert(0, 'src')
 
-# Test imports will work when sub-agents are implemented
+from agent_swarm.metrics import PhantomMetricsExporter
+from agent_swarm.phantom_orchestrator import AgentRole, EliteAgent, MnemonicCache, PhantomOrchestrator
+
+
+class _StubAgent(EliteAgent):
+    """Minimal concrete agent for orchestrator tests."""
+    
+    async def execute_mission(self, directive, context):
+        return {"success": True}
+
+
+class _LinearScanCache:
+    """Reference model: the linear min() eviction scan the bucket index replaced."""
+    
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = {}  # key -> (value, touch order, priority)
+        self._clock = itertools.count()
+    
+    def store(self, key, value, priority=1):
+        if key not in self.entries and len(self.entries) >= self.max_size:
+            # Lowest priority first, least recently touched within it
+            evict = min(self.entries, key=lambda k: (self.entries[k][2], self.entries[k][1]))
+            del self.entries[evict]
+        self.entries[key] = (value, next(self._clock), priority)
+    
+    def recall(self, key):
+        if key not in self.entries:
+            return None
+        value, _, priority = self.entries[key]
+        self.entries[key] = (value, next(self._clock), min(priority + 1, 10))
+        return value
 
 
 class TestMnemonicCache:
     """Tests for MNEMONIC cache system."""
     
-    def test_placeholder(self):
-        # TODO: Implement after MNEMONIC cache is accessible
-        assert True
+    @staticmethod
+    def _contents(cache):
+        return {key: (value, priority) for key, (value, _, priority) in cache._cache.items()}
+    
+    def test_matches_linear_scan_reference(self):
+        rng = random.Random(7)
+        cache = MnemonicCache(max_size=16)
+        reference = _LinearScanCache(max_size=16)
+        
+        for n in range(5_000):
+            key = f"k{rng.randrange(40)}"
+            if rng.random() < 0.6:
+                priority = rng.randint(1, 5)
+                cache.store(key, n, priority)
+                reference.store(key, n, priority)
+            else:
+                assert cache.recall(key) == reference.recall(key)
+            assert self._contents(cache) == {
+                key: (value, priority) for key, (value, _, priority) in reference.entries.items()
+            }
+    
+    def test_evicts_lowest_priority_then_least_recent(self):
+        cache = MnemonicCache(max_size=3)
+        cache.store("old", 1, priority=1)
+        cache.store("high", 2, priority=5)
+        cache.store("new", 3, priority=1)
+        
+        cache.store("extra", 4, priority=1)
+        assert list(cache._cache) == ["high", "new", "extra"]
+        
+        # Recall boosts "new" out of the lowest bucket, so "extra" goes next
+        cache.recall("new")
+        cache.store("last", 5, priority=3)
+        assert set(cache._cache) == {"high", "new", "last"}
+    
+    def test_update_does_not_evict(self):
+        cache = MnemonicCache(max_size=2)
+        cache.store("a", 1)
+        cache.store("b", 2)
+        cache.store("a", 3, priority=4)
+        assert self._contents(cache) == {"b": (2, 1), "a": (3, 4)}
+        assert cache._buckets == {1: {"b": None}, 4: {"a": None}}
+    
+    def test_recall_boost_is_capped(self):
+        cache = MnemonicCache()
+        cache.store("k", "v", priority=9)
+        for _ in range(3):
+            assert cache.recall("k") == "v"
+        assert cache._cache["k"][2] == 10
+        assert list(cache._buckets) == [10]
+        assert cache.recall("missing") is None
+    
+    def test_emptied_priorities_leave_heap_lazily(self):
+        cache = MnemonicCache(max_size=2)
+        cache.store("a", 1, priority=1)
+        cache.store("b", 2, priority=3)
+        
+        # Priority 1 empties on recall but stays heaped until eviction reaches it
+        cache.recall("a")
+        assert 1 not in cache._buckets
+        assert cache._priority_heap[0] == 1
+        
+        # Eviction pops the stale priority 1, then takes "a" from priority 2,
+        # whose now-empty bucket is left for the next eviction to discard
+        cache.store("c", 3, priority=5)
+        assert set(cache._cache) == {"b", "c"}
+        assert 1 not in cache._heaped
+        assert cache._priority_heap[0] == 2
+        
+        cache.store("d", 4, priority=5)
+        assert set(cache._cache) == {"c", "d"}
+        assert list(cache._buckets) == [5]
+        assert sorted(cache._priority_heap) == sorted(cache._heaped) == [3, 5]
 
 
 class TestAgentState:
@@ -30,6 +134,41 @@ class TestAgentState:
 class TestPhantomOrchestrator:
     """Tests for main orchestrator."""
     
-    def test_placeholder(self):
-        # TODO: Implement after PhantomOrchestrator is accessible
-        assert True
+    @staticmethod
+    def _tasks_completed(exporter, agent):
+        return exporter.registry.get_sample_value(
+            "phantom_agent_tasks_completed_total",
+            {"agent_type": agent._metric_type.value, "agent_id": agent._metric_label}
+        )
+    
+    def test_metrics_loop_exports_task_deltas(self):
+        orch = PhantomOrchestrator()
+        orch.metrics_exporter = exporter = PhantomMetricsExporter()
+        agent = orch.agents[AgentRole.FORTRESS] = _StubAgent(AgentRole.FORTRESS, orch, orch.mnemonic)
+        
+        async def tick():
+            # The first iteration runs before the loop's first sleep
+            orch._running = True
+            task = asyncio.create_task(orch._collect_metrics_loop())
+            await asyncio.sleep(0)
+            orch._running = False
+            task.cancel()
+        
+        agent.state.tasks_completed = 3
+        agent.state.tasks_failed = 1
+        asyncio.run(tick())
+        assert self._tasks_completed(exporter, agent) == 3
+        assert exporter.registry.get_sample_value(
+            "phantom_agent_tasks_failed_total",
+            {"agent_type": "fortress", "agent_id": "agent-fortress", "failure_reason": "unknown"}
+        ) == 1
+        
+        # Running totals are not re-added on the next tick, only the change
+        agent.state.tasks_completed = 5
+        asyncio.run(tick())
+        assert self._tasks_completed(exporter, agent) == 5
+        
+        # A reset agent starts its totals over; its new total counts in full
+        agent.state.tasks_completed = 2
+        asyncio.run(tick())
+        assert self._tasks_completed(exporter, agent) == 7
@@ -0,0 +1,165 @@
+"""
+Unit tests for benchmark statistics
+"""
+
+import asyncio
+import statistics
+import pytest
+import sys
+
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from agent_swarm.performance_testing import (
+    BenchmarkRunner,
+    OrchestrationBenchmark,
+    PerformanceMonitor,
+    RunningStats,
+    _compute_stats,
+)
+
+
+def _reference_stats(durations):
+    """The statistics-module computation the numpy and running paths replaced."""
+    ordered = sorted(durations)
+    
+    def percentile(p):
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+    
+    return (
+        min(durations),
+        max(durations),
+        statistics.mean(durations),
+        statistics.median(durations),
+        percentile(95),
+        percentile(99),
+        statistics.stdev(durations) if len(durations) > 1 else 0,
+    )
+
+
+def _samples(n, seed=0):
+    return np.random.default_rng(seed).lognormal(mean=1.0, sigma=0.8, size=n)
+
+
+def _capture_memory_samples(monkeypatch):
+    """Record the memory samples each benchmark compiles its results from."""
+    captured = []
+    compile_results = OrchestrationBenchmark._compile_results
+    
+    def recording(self, benchmark_name, *args):
+        memory_samples = args[-1]
+        captured.append((benchmark_name, memory_samples, len(memory_samples)))
+        return compile_results(self, benchmark_name, *args)
+    
+    monkeypatch.setattr(OrchestrationBenchmark, "_compile_results", recording)
+    return captured
+
+
+class TestComputeStats:
+    """Tests for exact statistics over raw samples."""
+    
+    @pytest.mark.parametrize("n", (1, 2, 7, 1_000, 1_001))
+    def test_matches_statistics_module(self, n):
+        durations = _samples(n)
+        assert _compute_stats(durations) == pytest.approx(_reference_stats(durations.tolist()), rel=1e-9)
+
+
+class TestRunningStats:
+    """Tests for constant-memory running statistics."""
+    
+    def test_summary_tracks_exact_stats(self):
+        durations = _samples(20_000, seed=1)
+        stats = RunningStats()
+        for n, duration in enumerate(durations.tolist()):
+            stats.add(duration, n % 10 != 0)
+        
+        min_d, max_d, mean, median, p95, p99, stddev = _reference_stats(durations.tolist())
+        assert stats.count == 20_000
+        assert stats.successes == 18_000
+        assert stats.sum_d == pytest.approx(durations.sum(), rel=1e-12)
+        
+        summary = stats.summary()
+        # Moments are exact; percentiles come from ~1%-wide histogram buckets
+        assert summary[:3] == (min_d, max_d, pytest.approx(mean, rel=1e-9))
+        assert summary[6] == pytest.approx(stddev, rel=1e-9)
+        assert summary[3:6] == pytest.approx((median, p95, p99), rel=0.01)
+    
+    def test_percentiles_are_clamped_to_observed_range(self):
+        stats = RunningStats()
+        for _ in range(10):
+            stats.add(3.25, True)
+        assert stats.percentiles((0, 50, 100)) == [3.25, 3.25, 3.25]
+        assert stats.summary() == (3.25, 3.25, 3.25, 3.25, 3.25, 3.25, 0.0)
+        
+        # Durations outside the histogram range share its end buckets; min and
+        # max stay exact
+        stats.add(1e-6, True)
+        stats.add(1e9, True)
+        low, high = stats.percentiles((0, 100))
+        assert low == pytest.approx(1e-3, rel=0.01)
+        assert 1e6 < high <= 1e9
+        assert stats.summary()[:2] == (1e-6, 1e9)
+    
+    def test_empty_percentiles(self):
+        assert RunningStats().percentiles((50, 99)) == [0.0, 0.0]
+
+
+class TestPerformanceMonitor:
+    """Tests for summaries across recording modes."""
+    
+    def test_summaries_agree_across_modes(self):
+        durations = _samples(5_000, seed=2).tolist()
+        raw = PerformanceMonitor(fast=True)
+        running = PerformanceMonitor(keep_raw=False)
+        for n, duration in enumerate(durations):
+            raw.record_fast("op", duration, n % 4 != 0)
+            running.fast_recorder("op")(duration, n % 4 != 0)
+        
+        raw_count, raw_ok, raw_stats = raw.summarize("op")
+        count, ok, stats = running.summarize("op")
+        assert (count, ok) == (raw_count, raw_ok) == (5_000, 3_750)
+        assert raw_stats == pytest.approx(_reference_stats(durations), rel=1e-9)
+        assert stats == pytest.approx(raw_stats, rel=0.01)
+        
+        assert running.summarize("missing") == (0, 0, None)
+        assert raw.summarize("missing") == (0, 0, None)
+
+
+class TestOrchestrationBenchmark:
+    """Tests for benchmark result compilation."""
+    
+    def test_results_report_sampled_memory(self, monkeypatch):
+        captured = _capture_memory_samples(monkeypatch)
+        benchmark = OrchestrationBenchmark(PerformanceMonitor(fast=True))
+        
+        async def scenario():
+            first = await benchmark.benchmark_workflow_execution(num_workflows=20, steps_per_workflow=5)
+            second = await benchmark.benchmark_threat_detection(num_threats=5)
+            return first, second
+        
+        first, second = asyncio.run(scenario())
+        (_, first_samples, _), (_, second_samples, _) = captured
+        
+        # The 50ms workflow run is sampled at 100 Hz, plus one closing sample
+        assert len(first_samples) >= 3
+        assert first.peak_memory_mb >= first.average_memory_mb > 0
+        
+        # Each benchmark reports its own sampling window
+        assert 1 <= len(second_samples) < len(first_samples)
+        assert second.peak_memory_mb == max(second_samples)
+        assert second.average_memory_mb == pytest.approx(sum(second_samples) / len(second_samples))
+    
+    def test_parallel_suite_keeps_memory_samples_per_benchmark(self, monkeypatch):
+        captured = _capture_memory_samples(monkeypatch)
+        runner = BenchmarkRunner(quiet=True)
+        results = asyncio.run(runner.run_full_suite())
+        
+        assert len(captured) == len(results) == 5
+        assert len({id(samples) for _, samples, _ in captured}) == 5
+        by_name = {result.benchmark_name: result for result in results}
+        for name, samples, count_at_compile in captured:
+            # Benchmarks still running did not append to a finished one's samples
+            assert len(samples) == count_at_compile >= 1
+            assert by_name[name].peak_memory_mb == max(samples)
+            assert by_name[name].average_memory_mb == pytest.approx(sum(samples) / len(samples))
@@ -0,0 +1,158 @@
+"""
+Unit tests for threat forecasting
+"""
+
+import random
+import pytest
+from collections import defaultdict, deque
+from datetime import datetime, UTC, timedelta
+import sys
+
+sys.path.insert(0, 'src')
+
+import numpy as np
+
+from agent_swarm import predictive_response
+from agent_swarm.predictive_response import ThreatEvent, ThreatForecaster
+
+
+def _events(rng, count, start):
+    return [
+        ThreatEvent(
+            timestamp=start + timedelta(minutes=rng.randrange(60 * 24 * 7)),
+            threat_type=rng.choice(("ddos", "scan", "brute_force")),
+            severity=rng.random(),
+            duration_minutes=1.0,
+            agent_response_time_ms=10.0,
+            resources_used={},
+            success=True
+        )
+        for _ in range(count)
+    ]
+
+
+def _replay(batches):
+    """Feed random batches to a forecaster, yielding it with a deque of the same history."""
+    rng = random.Random(sum(batches))
+    start = datetime(2025, 1, 6, tzinfo=UTC)
+    forecaster = ThreatForecaster()
+    history = deque(maxlen=predictive_response._HISTORY_SIZE)
+    for size in batches:
+        events = _events(rng, size, start)
+        forecaster._record_history(events)
+        history.extend(events)
+        yield forecaster, history
+
+
+def _reference_trend(history):
+    """The np.polyfit slope the closed-form trend replaced."""
+    severities = [e.severity for e in list(history)[-100:]]
+    if len(severities) < 2:
+        return 0.0
+    return float(np.polyfit(np.arange(len(severities)), severities, 1)[0])
+
+
+def _reference_seasonality(history):
+    """Per-hour event shares, recounted over the whole history."""
+    if len(history) < 24:
+        return {}
+    hourly_counts = defaultdict(int)
+    for event in history:
+        hourly_counts[event.timestamp.hour] += 1
+    return {f"hour_{h}": count / len(history) for h, count in hourly_counts.items()}
+
+
+def _reference_probability(trend, seasonality, current, horizon_hours, hour):
+    forecast = current + trend * horizon_hours + (seasonality.get(f"hour_{hour}", 0.5) - 0.5) * 0.1
+    return float(np.clip(forecast, 0.0, 1.0))
+
+
+# Batch sizes covering an empty-ish history, a partial fill and several wraps
+_BATCHES = ((1,), (5, 30), (4_000, 4_000, 4_000, 25), (12_000, 3))
+
+
+class TestThreatForecaster:
+    """Tests for threat forecasting over the rolling history."""
+    
+    def test_expected_type_is_the_most_frequent_so_far(self):
+        rng = random.Random(6)
+        start = datetime(2025, 1, 6, tzinfo=UTC)
+        forecaster = ThreatForecaster()
+        seen = []
+        
+        for _ in range(20):
+            events = _events(rng, rng.randint(1, 30), start)
+            seen.extend(e.threat_type for e in events)
+            forecast = forecaster.forecast_threats(events, 0.2)
+            
+            top = max(seen.count(t) for t in set(seen))
+            assert seen.count(forecast.expected_threat_type) == top
+        
+        assert ThreatForecaster()._forecast_threat_type() == "unknown"
+    
+    @pytest.mark.parametrize("batches", _BATCHES)
+    def test_trend_matches_polyfit(self, batches):
+        for forecaster, history in _replay(batches):
+            assert forecaster._compute_trend() == pytest.approx(_reference_trend(history), abs=1e-12)
+    
+    @pytest.mark.parametrize("batches", _BATCHES)
+    def test_ring_buffer_matches_bounded_deque(self, batches):
+        for forecaster, history in _replay(batches):
+            assert forecaster._count == len(history)
+            recent = list(history)[-predictive_response._TREND_WINDOW:]
+            assert forecaster._recent_severities().tolist() == [e.severity for e in recent]
+    
+    @pytest.mark.parametrize("batches", _BATCHES)
+    def test_seasonality_matches_recount(self, batches):
+        for forecaster, history in _replay(batches):
+            hours = [e.timestamp.hour for e in history]
+            assert forecaster._hour_counts.tolist() == [hours.count(h) for h in range(24)]
+            
+            seasonality = forecaster._detect_seasonality()
+            expected = _reference_seasonality(history)
+            assert seasonality.keys() == expected.keys()
+            for key, share in expected.items():
+                assert seasonality[key] == pytest.approx(share, rel=1e-12)
+    
+    def test_kernel_matches_numpy_path(self):
+        rng = random.Random(4)
+        forecaster = ThreatForecaster()
+        events = _events(rng, 500, datetime(2025, 1, 6, tzinfo=UTC))
+        # A rising tail so the trend term is not negligible
+        for n, event in enumerate(events[-100:]):
+            event.severity = n / 200
+        forecaster._record_history(events)
+        
+        trend = forecaster._compute_trend()
+        seasonality = forecaster._detect_seasonality()
+        kernels = [predictive_response._forecast_kernel]
+        if predictive_response._forecast_nb is not None:
+            kernels.append(predictive_response._forecast_nb)
+        
+        for kernel in kernels:
+            for hour in range(24):
+                for current in (0.0, 0.3, 0.9):
+                    kernel_trend, probability = kernel(
+                        forecaster._recent_severities(),
+                        forecaster._hour_counts,
+                        forecaster._count,
+                        hour,
+                        current,
+                        6.0
+                    )
+                    assert kernel_trend == pytest.approx(trend, abs=1e-12)
+                    assert probability == pytest.approx(
+                        _reference_probability(trend, seasonality, current, 6.0, hour), abs=1e-12
+                    )
+    
+    def test_forecast_is_the_same_with_and_without_kernel(self, monkeypatch):
+        events = _events(random.Random(8), 200, datetime(2025, 1, 6, tzinfo=UTC))
+        
+        def forecast(kernel):
+            monkeypatch.setattr(predictive_response, "_forecast_nb", kernel)
+            return ThreatForecaster().forecast_threats(events, 0.4, timedelta(hours=24))
+        
+        via_kernel = forecast(predictive_response._forecast_nb or predictive_response._forecast_kernel)
+        via_numpy = forecast(None)
+        assert via_kernel.threat_probability == pytest.approx(via_numpy.threat_probability, abs=1e-12)
+        assert via_kernel.expected_threat_type == via_numpy.expected_threat_type